@@ -0,0 +1,5 @@
+# benchmarks/__init__.py
+"""
+Benchmarks do catálogo com dados sintéticos em escala (1×, 10×, 100×,
+1000×). Veja benchmarks/run.py.
+"""
@@ -0,0 +1,456 @@
+# benchmarks/load.py
+"""
+Teste de carga das páginas com sessões simuladas concorrentes.
+
+Cada sessão é um usuário que repete um roteiro de cliques (SCENARIOS)
+sobre os scripts reais das páginas, executados sem navegador pelo AppTest
+do Streamlit. As sessões de um processo compartilham os caches do
+catálogo, como as sessões de um worker real; com --workers W, as sessões
+são divididas entre W processos para dimensionar o número de workers.
+
+O AppTest troca globais do Streamlit (Runtime._instance) a cada execução,
+então os reruns de um mesmo processo passam por uma fila (lock). Como o
+GIL já serializa o trabalho Python de um worker real, a latência de cada
+rerun é medida como espera na fila + execução, do clique até a página
+pronta.
+
+Relatório:
+  - latência dos reruns (p50/p90/p95/p99/máx) por página/passo e geral;
+  - vazão (reruns/s e roteiros/s) e erros;
+  - memória por worker (RSS antes e depois das sessões) e crescimento
+    por sessão, além do tamanho do payload enviado ao navegador.
+
+Uso:
+    python -m benchmarks.load [--sessions 20] [--workers 1] [--iterations 5]
+                              [--think 1.0] [--scenarios dashboard job_match]
+                              [--scale 10] [--cold]
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+PERCENTILES = [50, 90, 95, 99]
+
+# Textos usados nos roteiros de busca
+SEARCH_TERMS = ["budget forecasting", "payroll", "supplier negotiation", "software", "quality audit"]
+DESCRIPTIONS = [
+    "Prepares the monthly closing, reconciles accounts and supports the annual budget.",
+    "Leads a team of sales representatives and manages key customer accounts.",
+    "Plans preventive maintenance of production equipment and analyses failures.",
+]
+
+_run_lock = threading.Lock()
+
+
+# =========================================================
+# ROTEIROS (um por tipo de usuário)
+# =========================================================
+# Cada passo recebe o AppTest da página (já executado) e o estado da
+# sessão, altera widgets e devolve True quando um rerun é necessário.
+
+def _pick(session, values):
+    return session["rng"].choice(list(values))
+
+
+def _open(page):
+    def step(at, session):
+        return False  # abrir a página já é o rerun (feito pela sessão)
+    step.page = page
+    step.label = "abrir"
+    return step
+
+
+def _action(page, label):
+    def decorator(func):
+        func.page = page
+        func.label = label
+        return func
+    return decorator
+
+
+@_action("pages/7_Dashboard.py", "filtrar Job Family")
+def _dashboard_family(at, session):
+    at.multiselect(key="facet_Job Family").select(_pick(session, session["families"]))
+    return True
+
+
+@_action("pages/7_Dashboard.py", "filtrar Career Band")
+def _dashboard_band(at, session):
+    at.multiselect(key="facet_Career Band Short").select(_pick(session, session["bands"]))
+    return True
+
+
+@_action("pages/7_Dashboard.py", "limpar filtros")
+def _dashboard_clear(at, session):
+    for widget in at.multiselect:
+        widget.set_value([])
+    return True
+
+
+@_action("pages/3_Job_Profile_Description.py", "buscar")
+def _profile_search(at, session):
+    at.text_input[0].input(_pick(session, SEARCH_TERMS))
+    return True
+
+
+@_action("pages/3_Job_Profile_Description.py", "escolher cargo")
+def _profile_select(at, session):
+    # Sem busca, as opções são as posições de todo o catálogo
+    at.selectbox[0].set_value(session["rng"].randrange(len(session["codes"])))
+    return True
+
+
+@_action("pages/5_Job_Match.py", "fatores GGS")
+def _match_factors(at, session):
+    for name, levels in session["ggs_levels"].items():
+        at.selectbox(key=f"ggs_{name}").set_value(_pick(session, levels))
+    return True
+
+
+@_action("pages/5_Job_Match.py", "Buscar Job Match")
+def _match_click(at, session):
+    next(b for b in at.button if b.label == "Buscar Job Match").click()
+    return True
+
+
+@_action("pages/5_Job_Match.py", "perfis semelhantes")
+def _match_semantic(at, session):
+    at.text_area[0].input(_pick(session, DESCRIPTIONS))
+    next(b for b in at.button if b.label == "Buscar perfis semelhantes").click()
+    return True
+
+
+@_action("pages/4_Job_Maps.py", "cargo de origem")
+def _maps_origin(at, session):
+    at.selectbox[0].set_value(_pick(session, session["codes"]))
+    return True
+
+
+@_action("pages/4_Job_Maps.py", "passos")
+def _maps_steps(at, session):
+    at.slider[0].set_value(session["rng"].randint(1, 6))
+    return True
+
+
+SCENARIOS = {
+    "dashboard": [
+        _open("pages/7_Dashboard.py"), _dashboard_family, _dashboard_band, _dashboard_clear,
+    ],
+    "profile_lookup": [
+        _open("pages/3_Job_Profile_Description.py"), _profile_select, _profile_search,
+    ],
+    "job_match": [
+        _open("pages/5_Job_Match.py"), _match_factors, _match_click, _match_semantic,
+    ],
+    "job_maps": [
+        _open("pages/4_Job_Maps.py"), _maps_origin, _maps_steps,
+    ],
+    "browse": [
+        _open("pages/2_Job_Families.py"), _open("pages/6_Structure_Level.py"), _open("pages/7_Dashboard.py"),
+    ],
+}
+
+
+# =========================================================
+# SESSÕES (dentro de um worker)
+# =========================================================
+
+def _rss_mb():
+    """RSS atual do processo (Linux: /proc; nos demais, o pico)."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _payload_bytes(node):
+    """Bytes dos elementos enviados ao navegador (soma dos protos)."""
+    proto = getattr(node, "proto", None)
+    size = proto.ByteSize() if hasattr(proto, "ByteSize") else 0
+    return size + sum(_payload_bytes(child) for child in getattr(node, "children", {}).values())
+
+
+def _rerun(at, timeout):
+    queued = time.perf_counter()
+    with _run_lock:
+        started = time.perf_counter()
+        at.run(timeout=timeout)
+    finished = time.perf_counter()
+    return (started - queued) * 1000, (finished - started) * 1000
+
+
+def _session(session, scenario, iterations, think, timeout, records, start_at):
+    from streamlit.testing.v1 import AppTest
+
+    def measure(at, page, label, iteration):
+        record = {
+            "session": session["id"],
+            "iteration": iteration,
+            "scenario": scenario,
+            "page": Path(page).stem,
+            "step": label,
+        }
+        try:
+            record["wait_ms"], record["run_ms"] = _rerun(at, timeout)
+            record["error"] = at.exception[0].value if at.exception else None
+            record["payload_kb"] = _payload_bytes(at._tree) / 1024
+        except Exception as exc:  # noqa: BLE001 - conta como erro do rerun
+            record.update(wait_ms=np.nan, run_ms=np.nan, payload_kb=np.nan, error=f"{type(exc).__name__}: {exc}")
+        record["latency_ms"] = record["wait_ms"] + record["run_ms"]
+        records.append(record)
+        if think:
+            time.sleep(session["rng"].expovariate(1 / think))
+        return record["error"] is None
+
+    time.sleep(max(0.0, start_at - time.perf_counter()))
+    for iteration in range(iterations):
+        at, page = None, None
+        for step in SCENARIOS[scenario]:
+            if step.label == "abrir" or step.page != page:
+                at, page = AppTest.from_file(str(ROOT / step.page), default_timeout=timeout), step.page
+                if not measure(at, page, "abrir", iteration):
+                    at = None  # página quebrada: pula as ações sobre ela
+            if at is None or step.label == "abrir":
+                continue
+            try:
+                needs_run = step(at, session)
+            except Exception as exc:  # noqa: BLE001 - widget ausente/alterado
+                records.append({
+                    "session": session["id"], "iteration": iteration, "scenario": scenario,
+                    "page": Path(page).stem, "step": step.label, "wait_ms": np.nan, "run_ms": np.nan,
+                    "latency_ms": np.nan, "payload_kb": np.nan, "error": f"{type(exc).__name__}: {exc}",
+                })
+                continue
+            if needs_run:
+                measure(at, page, step.label, iteration)
+
+
+def _warm_up(timeout):
+    """Um rerun de cada página usada, fora da medição (caches prontos)."""
+    from streamlit.testing.v1 import AppTest
+
+    for page in sorted({step.page for steps in SCENARIOS.values() for step in steps}):
+        AppTest.from_file(str(ROOT / page), default_timeout=timeout).run()
+
+
+def run_worker(worker, sessions, scenarios, iterations, think, ramp_up, cold, seed, timeout):
+    """Roda as sessões deste worker em threads e devolve registros e memória."""
+    from utils import catalog
+
+    # Avisos de "bare mode" do Streamlit fora do AppTest só poluem o log
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").disabled = True
+
+    if not cold:
+        _warm_up(timeout)
+    profiles = catalog.load_job_profiles()
+    families = profiles["Job Family"].dropna().unique().tolist()
+    bands = profiles["Career Band Short"].dropna().unique().tolist()
+    codes = profiles["Full Job Code"].astype(object).tolist()
+    ggs_levels = {name: list(factor["levels"]) for name, factor in catalog.load_ggs_factors().items()}
+
+    rss_start = _rss_mb()
+    records = []
+    threads = []
+    start = time.perf_counter()
+    for i in range(sessions):
+        session = {
+            "id": f"{worker}-{i}",
+            "rng": random.Random(seed * 1000 + worker * 100 + i),
+            "families": families,
+            "bands": bands,
+            "codes": codes,
+            "ggs_levels": ggs_levels,
+        }
+        thread = threading.Thread(
+            target=_session,
+            args=(session, scenarios[i % len(scenarios)], iterations, think, timeout, records,
+                  start + ramp_up * i / max(sessions, 1)),
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+
+    peak = rss_start
+    while any(t.is_alive() for t in threads):
+        peak = max(peak, _rss_mb())
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - start
+    rss_end = _rss_mb()
+
+    return {
+        "worker": worker,
+        "sessions": sessions,
+        "seconds": elapsed,
+        "rss_start_mb": rss_start,
+        "rss_peak_mb": max(peak, rss_end),
+        "rss_end_mb": rss_end,
+        "records": records,
+    }
+
+
+# =========================================================
+# ORQUESTRAÇÃO E RELATÓRIO
+# =========================================================
+
+def _spawn(worker, sessions, args, output):
+    env = dict(os.environ)
+    env.pop("JA_PERF", None)
+    if args.scale:
+        from benchmarks import synthetic
+
+        env["JA_DATA_DIR"] = str(synthetic.generate(args.scale))
+
+    command = [
+        sys.executable, "-m", "benchmarks.load", "--worker", str(worker),
+        "--sessions", str(sessions), "--iterations", str(args.iterations),
+        "--think", str(args.think), "--ramp-up", str(args.ramp_up),
+        "--seed", str(args.seed), "--timeout", str(args.timeout),
+        "--scenarios", *args.scenarios, "--output", str(output),
+    ]
+    if args.cold:
+        command.append("--cold")
+    return subprocess.Popen(command, cwd=ROOT, env=env)
+
+
+def _percentiles(values):
+    values = values.dropna()
+    if values.empty:
+        return {f"p{p}_ms": np.nan for p in PERCENTILES} | {"max_ms": np.nan}
+    stats = {f"p{p}_ms": round(float(np.percentile(values, p)), 1) for p in PERCENTILES}
+    stats["max_ms"] = round(float(values.max()), 1)
+    return stats
+
+
+def summarize(workers):
+    """Resumo geral, tabela por página/passo e memória por worker."""
+    reruns = pd.DataFrame([r for w in workers for r in w["records"]])
+    wall = max(w["seconds"] for w in workers)
+    sessions = sum(w["sessions"] for w in workers)
+
+    by_step = (
+        reruns.groupby(["page", "step"], sort=False)
+        .apply(lambda g: pd.Series({
+            "reruns": len(g),
+            "errors": int(g["error"].notna().sum()),
+            **_percentiles(g["latency_ms"]),
+            "run_p50_ms": round(float(g["run_ms"].median()), 1),
+            "payload_kb": round(float(g["payload_kb"].median()), 1),
+        }), include_groups=False)
+        .reset_index()
+    )
+    completed = reruns.groupby(["session", "iteration"]).ngroups
+
+    memory = pd.DataFrame([
+        {
+            "worker": w["worker"],
+            "sessions": w["sessions"],
+            "rss_start_mb": round(w["rss_start_mb"], 1),
+            "rss_peak_mb": round(w["rss_peak_mb"], 1),
+            "rss_end_mb": round(w["rss_end_mb"], 1),
+            "growth_per_session_mb": round((w["rss_end_mb"] - w["rss_start_mb"]) / max(w["sessions"], 1), 2),
+        }
+        for w in workers
+    ])
+
+    overall = {
+        "sessions": sessions,
+        "workers": len(workers),
+        "reruns": len(reruns),
+        "errors": int(reruns["error"].notna().sum()),
+        "seconds": round(wall, 2),
+        "reruns_per_s": round(len(reruns) / wall, 2),
+        "scenarios_per_s": round(completed / wall, 2),
+        **_percentiles(reruns["latency_ms"]),
+        "wait_p95_ms": round(float(reruns["wait_ms"].quantile(0.95)), 1),
+        "growth_per_session_mb": round(
+            float((memory["rss_end_mb"] - memory["rss_start_mb"]).sum()) / max(sessions, 1), 2
+        ),
+    }
+    errors = reruns.loc[reruns["error"].notna(), "error"].value_counts().head(5).to_dict()
+    return {"overall": overall, "by_step": by_step, "memory": memory, "errors": errors}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga das páginas com sessões concorrentes.")
+    parser.add_argument("--sessions", type=int, default=20, help="sessões simultâneas (total)")
+    parser.add_argument("--workers", type=int, default=1, help="processos entre os quais as sessões são divididas")
+    parser.add_argument("--iterations", type=int, default=5, help="repetições do roteiro por sessão")
+    parser.add_argument("--think", type=float, default=1.0, help="pausa média entre cliques, em segundos")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="segundos para todas as sessões começarem")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--scale", type=int, help="usa o catálogo sintético desta escala (benchmarks.synthetic)")
+    parser.add_argument("--cold", action="store_true", help="não aquece os caches antes das sessões")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=300.0, help="timeout de cada rerun, em segundos")
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR / "load-latest.json")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker is not None:
+        report = run_worker(
+            args.worker, args.sessions, args.scenarios, args.iterations,
+            args.think, args.ramp_up, args.cold, args.seed, args.timeout,
+        )
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, default=float)
+        return 0
+
+    # Sessões distribuídas entre os workers (o roteiro segue o índice global)
+    shares = [len(range(w, args.sessions, args.workers)) for w in range(args.workers)]
+    with tempfile.TemporaryDirectory() as tmp:
+        outputs = [Path(tmp) / f"worker-{w}.json" for w in range(args.workers)]
+        processes = [_spawn(w, n, args, out) for w, (n, out) in enumerate(zip(shares, outputs)) if n]
+        if any(p.wait() != 0 for p in processes):
+            print("Falha em um dos workers.", file=sys.stderr)
+            return 1
+        workers = []
+        for out in outputs:
+            if out.exists():
+                with open(out, "r", encoding="utf-8") as f:
+                    workers.append(json.load(f))
+
+    summary = summarize(workers)
+    print(pd.Series(summary["overall"]).to_string())
+    print()
+    print(summary["by_step"].to_string(index=False))
+    print()
+    print(summary["memory"].to_string(index=False))
+    if summary["errors"]:
+        print("\nerros:", json.dumps(summary["errors"], ensure_ascii=False, indent=2))
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "config": {k: v for k, v in vars(args).items() if k not in ("output", "worker")},
+                "overall": summary["overall"],
+                "by_step": summary["by_step"].to_dict("records"),
+                "memory": summary["memory"].to_dict("records"),
+                "errors": summary["errors"],
+            },
+            f, indent=2, ensure_ascii=False, default=float,
+        )
+        f.write("\n")
+    print(f"\nresultado: {args.output}", file=sys.stderr)
+    return 1 if summary["overall"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
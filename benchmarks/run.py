@@ -0,0 +1,509 @@
+# benchmarks/run.py
+"""
+Suíte de benchmarks do catálogo em escala.
+
+Para cada escala, gera (ou reaproveita) o catálogo sintético de
+benchmarks/synthetic.py e roda os casos em um subprocesso próprio, com
+JA_DATA_DIR apontando para os dados sintéticos; assim cada escala começa
+com caches e memória limpos. Casos:
+  - catalog.load.*:   leitura do Excel (com escrita do snapshot), do
+                      snapshot colunar e do cache em memória;
+  - match.*:          índice de cargos e find_best_job_profile(s);
+  - ggs.*:            map_factors_to_level (escalar e em lote) e a
+                      tabela pré-calculada (lookup_outcome);
+  - hierarchy.*:      filtrar_cargos_por_hierarquia com o catálogo inteiro;
+  - search.*:         construção do índice BM25 e consultas;
+  - page.*:           execução dos scripts das páginas 2–7 (AppTest).
+
+Cada caso registra a mediana e o mínimo de `repeat` execuções e o pico
+de memória (tracemalloc, em uma execução à parte). O resultado vai para
+benchmarks/results/latest.json e é comparado com benchmarks/baseline.json:
+um caso regride quando fica TOLERANCE mais lento (ou mais pesado) e a
+diferença passa do piso absoluto. Com regressão, o processo sai com 1.
+
+A escala 1000× (825 mil linhas) é opcional: só gerar o Excel já leva
+vários minutos.
+
+Uso:
+    python -m benchmarks.run [--scales 1 10 100] [--cases 'match.*' ...]
+                             [--repeat 5] [--no-memory] [--save-baseline]
+"""
+import argparse
+import fnmatch
+import gc
+import json
+import logging
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import synthetic
+
+ROOT = Path(__file__).resolve().parents[1]
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+DEFAULT_SCALES = [1, 10, 100]
+
+# Regressão: TOLERANCE relativa E diferença acima do piso absoluto
+TOLERANCE = 0.25
+FLOOR_MS = 5.0
+FLOOR_MB = 1.0
+
+# Consultas do caso search.query (termos reais do catálogo)
+SEARCH_QUERIES = [
+    "budget forecasting",
+    "payroll benefits",
+    "supplier negotiation",
+    "software development",
+    "quality assurance audit",
+    "customer service",
+    "maintenance engineering",
+    "talent acquisition",
+    "tax compliance",
+    "warehouse logistics",
+]
+
+# Cargos de reporte do caso hierarchy.* (chaves de NIVEIS_HIERARQUICOS)
+REPORTING_TITLES = ["Supervisor", "Manager", "Analista Senior"]
+
+# Consultas escalares por caso (o lote usa todas as seleções da escala)
+SCALAR_OPS = 1000
+
+PAGES = sorted(str(p.relative_to(ROOT)) for p in (ROOT / "pages").glob("[2-7]_*.py"))
+
+
+# =========================================================
+# CASOS
+# =========================================================
+# Cada caso recebe o contexto da escala e devolve um dict com:
+#   run:    função medida;
+#   before: preparação não medida, executada antes de cada repetição;
+#   ops:    operações por execução (para o tempo por operação);
+#   repeat: repetições padrão; warmup: executa uma vez antes de medir.
+
+CASES = {}
+
+
+def case(name, repeat=5, warmup=True):
+    def decorator(setup):
+        CASES[name] = {"setup": setup, "repeat": repeat, "warmup": warmup}
+        return setup
+    return decorator
+
+
+def _load_all():
+    from utils import catalog
+
+    catalog.load_job_families()
+    catalog.load_job_profiles()
+    catalog.load_level_structure()
+    catalog.load_ggs_factors()
+
+
+@case("catalog.load.source", repeat=1, warmup=False)
+def _catalog_source(ctx):
+    from utils import catalog, snapshot
+
+    # Só apaga snapshots dos dados sintéticos, nunca o data/snapshot real
+    if not snapshot.SNAPSHOT_DIR.resolve().is_relative_to(synthetic.BENCH_DATA_DIR.resolve()):
+        raise RuntimeError(f"Snapshot fora de {synthetic.BENCH_DATA_DIR}: {snapshot.SNAPSHOT_DIR}")
+
+    def before():
+        shutil.rmtree(snapshot.SNAPSHOT_DIR, ignore_errors=True)
+        catalog.clear_cache()
+
+    return {"run": _load_all, "before": before}
+
+
+@case("catalog.load.snapshot", warmup=False)
+def _catalog_snapshot(ctx):
+    from utils import catalog
+
+    return {"run": _load_all, "before": catalog.clear_cache}
+
+
+@case("catalog.load.warm")
+def _catalog_warm(ctx):
+    return {"run": _load_all}
+
+
+@case("match.build_profile_index", repeat=3)
+def _build_profile_index(ctx):
+    from utils import job_match_engine
+
+    return {"run": lambda: job_match_engine.build_profile_index(ctx["profiles"])}
+
+
+@case("match.find_best_job_profile")
+def _find_best(ctx):
+    from utils import job_match_engine
+
+    queries = ctx["outcomes"].head(SCALAR_OPS).itertuples(index=False)
+    queries = [(q.career_band, q.career_level, int(q.survey_grade)) for q in queries]
+
+    def run():
+        for band, level, grade in queries:
+            job_match_engine.find_best_job_profile(band, level, grade)
+
+    return {"run": run, "ops": len(queries)}
+
+
+@case("match.find_best_job_profiles")
+def _find_best_batch(ctx):
+    from utils import job_match_engine
+
+    return {
+        "run": lambda: job_match_engine.find_best_job_profiles(ctx["outcomes"]),
+        "ops": len(ctx["outcomes"]),
+    }
+
+
+@case("ggs.map_factors_to_level")
+def _map_factors(ctx):
+    from utils import ggs_factors
+
+    factors = ggs_factors.load_ggs_factors()
+    selected = [
+        {name: {"selected": key, **factors[name]["levels"][key]} for name, key in row.items()}
+        for row in ctx["selections"].head(SCALAR_OPS).to_dict("records")
+    ]
+
+    def run():
+        for item in selected:
+            ggs_factors.map_factors_to_level(item)
+
+    return {"run": run, "ops": len(selected)}
+
+
+@case("ggs.map_factors_to_level_batch")
+def _map_factors_batch(ctx):
+    from utils import ggs_factors
+
+    return {
+        "run": lambda: ggs_factors.map_factors_to_level_batch(ctx["selections"]),
+        "ops": len(ctx["selections"]),
+    }
+
+
+@case("ggs.lookup_outcome")
+def _lookup_outcome(ctx):
+    from utils import ggs_factors
+
+    selections = ctx["selections"].head(SCALAR_OPS).to_dict("records")
+
+    def run():
+        for selection in selections:
+            ggs_factors.lookup_outcome(selection)
+
+    return {"run": run, "ops": len(selections)}
+
+
+@case("hierarchy.filtrar_cargos_por_hierarquia")
+def _hierarchy(ctx):
+    from logica_cargos import filtrar_cargos_por_hierarquia
+
+    df = ctx["profiles"]
+    candidates = [
+        {"titulo": title, "gg": int(grade)}
+        for title, grade in zip(df["Job Profile"], df["Global Grade"])
+    ]
+
+    def run():
+        for title in REPORTING_TITLES:
+            filtrar_cargos_por_hierarquia(title, candidates)
+
+    return {"run": run, "ops": len(REPORTING_TITLES) * len(candidates)}
+
+
+@case("search.build_index", repeat=3)
+def _search_build(ctx):
+    from utils import search
+
+    return {"run": lambda: search.build_search_index(ctx["profiles"])}
+
+
+@case("search.query")
+def _search_query(ctx):
+    from utils import search
+
+    search.get_search_index()
+
+    def run():
+        for query in SEARCH_QUERIES:
+            search.search_profiles(query, k=20)
+
+    return {"run": run, "ops": len(SEARCH_QUERIES)}
+
+
+def _page_case(page):
+    def setup(ctx):
+        from streamlit.testing.v1 import AppTest
+
+        # Avisos de "bare mode" do Streamlit fora do AppTest só poluem o log
+        logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").disabled = True
+
+        def run():
+            at = AppTest.from_file(str(ROOT / page), default_timeout=600).run()
+            # Job Match: mede também o clique que dispara o match
+            for button in at.button:
+                if button.label == "Buscar Job Match":
+                    button.click().run()
+            if at.exception:
+                raise RuntimeError(f"{page}: {at.exception[0].value}")
+
+        return {"run": run}
+    return setup
+
+
+for _page in PAGES:
+    case(f"page.{Path(_page).stem}", repeat=3)(_page_case(_page))
+
+
+# =========================================================
+# EXECUÇÃO DE UMA ESCALA (subprocesso)
+# =========================================================
+
+def _context(data_dir):
+    from utils import catalog, ggs_factors
+
+    selections = pd.read_csv(data_dir / "selections.csv", dtype=str)
+    profiles = catalog.load_job_profiles()
+    return {
+        "profiles": profiles,
+        "selections": selections,
+        "outcomes": ggs_factors.map_factors_to_level_batch(selections),
+    }
+
+
+def _measure(spec, repeat, memory):
+    before = spec.get("before") or (lambda: None)
+    run = spec["run"]
+
+    if spec["warmup"]:
+        before()
+        run()
+
+    times = []
+    for _ in range(repeat):
+        before()
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - start) * 1000)
+
+    peak = None
+    if memory:
+        before()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+
+    return times, peak
+
+
+def run_scale(scale, patterns=None, repeat=None, memory=True, log=sys.stderr):
+    """Roda os casos da escala no processo atual (JA_DATA_DIR já aponta para ela)."""
+    from utils import catalog
+
+    data_dir = synthetic.data_dir(scale)
+    if catalog.DATA_DIR.resolve() != data_dir.resolve():
+        raise SystemExit(
+            f"JA_DATA_DIR deve apontar para {data_dir} (atual: {catalog.DATA_DIR}); "
+            "rode sem --worker para o runner preparar o ambiente."
+        )
+    selected = [name for name in CASES if not patterns or any(fnmatch.fnmatch(name, p) for p in patterns)]
+
+    # A leitura do Excel é medida antes de qualquer outra carga do catálogo
+    results = []
+    ctx = None
+    for name in selected:
+        if ctx is None and name != "catalog.load.source":
+            ctx = _context(data_dir)
+
+        spec = dict(CASES[name])
+        spec.update(spec.pop("setup")(ctx))
+        n = repeat or spec["repeat"]
+        if name == "catalog.load.source":
+            n = min(n, spec["repeat"])  # cada repetição relê o Excel inteiro
+
+        times, peak = _measure(spec, n, memory)
+        ops = spec.get("ops", 1)
+        median = statistics.median(times)
+        results.append({
+            "scale": scale,
+            "case": name,
+            "repeat": n,
+            "ops": ops,
+            "median_ms": round(median, 3),
+            "min_ms": round(min(times), 3),
+            "per_op_us": round(median * 1000 / ops, 3),
+            "peak_mb": None if peak is None else round(peak, 2),
+        })
+        if log is not None:
+            print(f"  {scale}x {name}: {median:,.1f} ms" + ("" if peak is None else f", pico {peak:,.1f} MB"), file=log)
+
+    from utils import catalog
+
+    return {
+        "scale": scale,
+        "rows": {name: table["rows"] for name, table in catalog.memory_report().items()},
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "results": results,
+    }
+
+
+def _spawn(scale, args, log=sys.stderr):
+    """Roda uma escala em subprocesso, com JA_DATA_DIR apontando para os dados dela."""
+    # Sem aquecimento em segundo plano (utils.warmup): cada caso mede só
+    # o próprio trabalho, e o tracemalloc não soma a thread de aquecimento
+    env = dict(os.environ, JA_DATA_DIR=str(synthetic.data_dir(scale)), JA_WARMUP="0")
+    env.pop("JA_PERF", None)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / "scale.json"
+        command = [sys.executable, "-m", "benchmarks.run", "--worker", str(scale), "--output", str(output)]
+        if args.cases:
+            command += ["--cases", *args.cases]
+        if args.repeat:
+            command += ["--repeat", str(args.repeat)]
+        if args.no_memory:
+            command.append("--no-memory")
+        subprocess.run(command, cwd=ROOT, env=env, check=True, stdout=log)
+        with open(output, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+# =========================================================
+# RELATÓRIO E COMPARAÇÃO COM O BASELINE
+# =========================================================
+
+def _meta():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+    }
+
+
+def compare(current, baseline, tolerance=TOLERANCE):
+    """
+    Casos (escala, caso) presentes nos dois relatórios com a variação de
+    tempo e memória. Retorna um DataFrame com a coluna `regression`.
+    """
+    base = {(r["scale"], r["case"]): r for s in baseline.get("scales", []) for r in s["results"]}
+    rows = []
+    for scale in current["scales"]:
+        for result in scale["results"]:
+            old = base.get((result["scale"], result["case"]))
+            if old is None:
+                continue
+            slower = (
+                result["median_ms"] > old["median_ms"] * (1 + tolerance)
+                and result["median_ms"] - old["median_ms"] > FLOOR_MS
+            )
+            heavier = (
+                result["peak_mb"] is not None and old["peak_mb"] is not None
+                and result["peak_mb"] > old["peak_mb"] * (1 + tolerance)
+                and result["peak_mb"] - old["peak_mb"] > FLOOR_MB
+            )
+            rows.append({
+                "scale": result["scale"],
+                "case": result["case"],
+                "baseline_ms": old["median_ms"],
+                "median_ms": result["median_ms"],
+                "time_change": result["median_ms"] / old["median_ms"] - 1 if old["median_ms"] else np.nan,
+                "baseline_mb": old["peak_mb"],
+                "peak_mb": result["peak_mb"],
+                "regression": slower or heavier,
+            })
+    columns = ["scale", "case", "baseline_ms", "median_ms", "time_change", "baseline_mb", "peak_mb", "regression"]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def _write_json(path, payload):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do catálogo com dados sintéticos em escala.")
+    parser.add_argument("--scales", nargs="+", type=int, default=DEFAULT_SCALES)
+    parser.add_argument("--cases", nargs="+", help="padrões de nome (ex.: 'match.*' 'page.5_*')")
+    parser.add_argument("--repeat", type=int, help="repetições por caso (padrão: o de cada caso)")
+    parser.add_argument("--no-memory", action="store_true", help="não mede o pico de memória")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR / "latest.json")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="grava o resultado como novo baseline")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker is not None:
+        report = run_scale(args.worker, args.cases, args.repeat, memory=not args.no_memory)
+        _write_json(args.output, report)
+        return 0
+
+    report = {"meta": _meta(), "scales": []}
+    for scale in args.scales:
+        start = time.perf_counter()
+        synthetic.generate(scale)
+        print(f"{scale}x: dados prontos em {time.perf_counter() - start:.1f}s", file=sys.stderr)
+        report["scales"].append(_spawn(scale, args))
+
+    _write_json(args.output, report)
+    print(f"resultado: {args.output}", file=sys.stderr)
+
+    if args.save_baseline:
+        _write_json(args.baseline, report)
+        print(f"baseline: {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not args.baseline.exists():
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        comparison = compare(report, json.load(f), args.tolerance)
+    if comparison.empty:
+        return 0
+
+    shown = comparison.assign(time_change=comparison["time_change"].map(lambda v: f"{v:+.0%}"))
+    print(shown.to_string(index=False))
+    regressions = comparison[comparison["regression"]]
+    if len(regressions):
+        print(f"{len(regressions)} regressão(ões) acima de {args.tolerance:.0%}.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
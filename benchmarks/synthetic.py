@@ -0,0 +1,206 @@
+# benchmarks/synthetic.py
+"""
+Catálogos sintéticos em escala para os benchmarks.
+
+Cada escala N gera uma pasta de dados completa (mesmos arquivos, abas e
+colunas de data/), pronta para ser usada pelo app via JA_DATA_DIR:
+  - Job Profile.xlsx:     N cópias das linhas reais. A cópia c ganha
+                          Full Job Code / Job Code short com sufixo, Job
+                          Family, Sub Job Family e Job Profile numerados
+                          e os textos com as linhas embaralhadas (o
+                          vocabulário é o real, mas os documentos não se
+                          repetem);
+  - Job Family.xlsx:      as mesmas N cópias das famílias;
+  - Level Structure.xlsx: inalterado (a tabela é limitada pelos grades,
+                          não cresce com o catálogo);
+  - wtw_ggs_factors.json: inalterado;
+  - selections.csv:       N × SELECTIONS_PER_SCALE seleções GGS aleatórias
+                          (uma coluna por fator, chave do nível).
+
+As pastas ficam em benchmarks/.data/<N>x e só são refeitas quando a
+fonte, a semente ou o formato mudam.
+
+Uso:
+    python -m benchmarks.synthetic 1 10 100 [--force]
+"""
+import argparse
+import hashlib
+import json
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils import catalog
+
+BENCH_DATA_DIR = Path(__file__).resolve().parent / ".data"
+
+SCALES = [1, 10, 100, 1000]
+
+SELECTIONS_PER_SCALE = 1000
+
+FORMAT_VERSION = 1
+
+DEFAULT_SEED = 42
+
+# Colunas de texto longo cujas linhas são embaralhadas em cada cópia
+TEXT_FIELDS = [
+    "Job Profile Description",
+    "Role Description",
+    "Grade Differentiator",
+    "Qualifications",
+    "Specific parameters / KPIs",
+]
+
+
+# =========================================================
+# GERAÇÃO
+# =========================================================
+
+def _read_workbook(path):
+    """Abas do Excel original, sem tratamento (cabeçalhos e tipos como estão)."""
+    return pd.read_excel(path, sheet_name=None)
+
+
+def _write_workbook(sheets, path):
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for sheet, df in sheets.items():
+            df.to_excel(writer, sheet_name=sheet, index=False)
+
+
+def _suffix(series, tag, sep=" "):
+    if not tag:
+        return series
+    return series.map(lambda v: v if pd.isna(v) else f"{str(v).rstrip()}{sep}{tag}")
+
+
+def _shuffle_lines(value, rng):
+    if not isinstance(value, str) or "\n" not in value:
+        return value
+    lines = value.split("\n")
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+def _column(df, name):
+    # Cabeçalhos do Excel podem ter espaços sobrando
+    for column in df.columns:
+        if isinstance(column, str) and column.strip() == name:
+            return column
+    return None
+
+
+def scale_job_profiles(df, scale, rng):
+    copies = []
+    for copy in range(scale):
+        part = df.copy()
+        for name in ["Full Job Code", "Job Code short"]:
+            column = _column(part, name)
+            if column is not None:
+                part[column] = _suffix(part[column], copy and f"{copy:04d}", "-")
+        for name in ["Job Family", "Sub Job Family", "Job Profile"]:
+            column = _column(part, name)
+            if column is not None:
+                part[column] = _suffix(part[column], copy)
+        if copy:
+            for name in TEXT_FIELDS:
+                column = _column(part, name)
+                if column is not None:
+                    part[column] = [_shuffle_lines(v, rng) for v in part[column]]
+        copies.append(part)
+    return pd.concat(copies, ignore_index=True)
+
+
+def scale_job_families(df, scale):
+    copies = []
+    for copy in range(scale):
+        part = df.copy()
+        for name in ["Job Family", "Sub Job Family"]:
+            column = _column(part, name)
+            if column is not None:
+                part[column] = _suffix(part[column], copy)
+        copies.append(part)
+    return pd.concat(copies, ignore_index=True)
+
+
+def random_selections(factors, n, rng):
+    """n seleções GGS: uma coluna por fator com a chave do nível sorteado."""
+    return pd.DataFrame({
+        name: rng.choice(list(factor["levels"]), size=n)
+        for name, factor in factors.items()
+    })
+
+
+def _fingerprint(scale, seed):
+    sources = {name: catalog.file_digest(path) for name, path in catalog.SOURCES.items()}
+    payload = json.dumps({"scale": scale, "seed": seed, "format": FORMAT_VERSION, "sources": sources}, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def data_dir(scale):
+    return BENCH_DATA_DIR / f"{scale}x"
+
+
+def generate(scale, seed=DEFAULT_SEED, force=False):
+    """
+    Garante a pasta de dados da escala `scale` e devolve o caminho.
+    Reaproveita a geração anterior se fonte, semente e formato não mudaram.
+    """
+    out_dir = data_dir(scale)
+    manifest_path = out_dir / "manifest.json"
+    fingerprint = _fingerprint(scale, seed)
+
+    if not force and manifest_path.exists():
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            if json.load(f).get("fingerprint") == fingerprint:
+                return out_dir
+
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    out_dir.mkdir(parents=True)
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+
+    profiles = _read_workbook(catalog.JOB_PROFILE_PATH)
+    _write_workbook(
+        {sheet: scale_job_profiles(df, scale, rng) for sheet, df in profiles.items()},
+        out_dir / catalog.JOB_PROFILE_PATH.name,
+    )
+    families = _read_workbook(catalog.JOB_FAMILY_PATH)
+    _write_workbook(
+        {sheet: scale_job_families(df, scale) for sheet, df in families.items()},
+        out_dir / catalog.JOB_FAMILY_PATH.name,
+    )
+    shutil.copy2(catalog.LEVEL_STRUCTURE_PATH, out_dir / catalog.LEVEL_STRUCTURE_PATH.name)
+    shutil.copy2(catalog.GGS_FACTORS_PATH, out_dir / catalog.GGS_FACTORS_PATH.name)
+
+    with open(catalog.GGS_FACTORS_PATH, "r", encoding="utf-8") as f:
+        factors = json.load(f)
+    random_selections(factors, scale * SELECTIONS_PER_SCALE, rng).to_csv(out_dir / "selections.csv", index=False)
+
+    manifest = {
+        "fingerprint": fingerprint,
+        "scale": scale,
+        "seed": seed,
+        "job_profiles": sum(len(df) for df in profiles.values()) * scale,
+        "selections": scale * SELECTIONS_PER_SCALE,
+        "seconds": round(time.perf_counter() - start, 2),
+    }
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return out_dir
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera catálogos sintéticos em escala.")
+    parser.add_argument("scales", nargs="*", type=int, default=SCALES[:3])
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--force", action="store_true", help="refaz mesmo se já existir")
+    args = parser.parse_args()
+
+    for scale in args.scales:
+        start = time.perf_counter()
+        path = generate(scale, args.seed, args.force)
+        print(f"{scale}x: {path} ({time.perf_counter() - start:.1f}s)")
@@ -13,6 +13,14 @@ NIVEIS_HIERARQUICOS = {
     "MANAGER": 18
 }
 
+def normalizar_cargo(cargo: str) -> str:
+    """
+    Normaliza o nome de um cargo de reporte para as chaves de NIVEIS_HIERARQUICOS
+    (ex: 'Analista Senior' -> 'ANALISTA_SENIOR').
+    """
+    return cargo.upper().replace(" ", "_").replace("/", "_")
+
+
 def filtrar_cargos_por_hierarquia(cargo_de_reporte: str, lista_cargos_sugeridos: list) -> list:
     """
     Filtra a lista de cargos sugeridos para garantir que o GG do cargo
@@ -32,7 +40,7 @@ def filtrar_cargos_por_hierarquia(cargo_de_reporte: str, lista_cargos_sugeridos:
     
     # 1. Normalizar e buscar o GG mínimo do cargo de reporte
     # A normalização é necessária para lidar com variações de escrita (ex: 'supervisor' vs 'SUPERVISOR')
-    cargo_normalizado = cargo_de_reporte.upper().replace(" ", "_").replace("/", "_")
+    cargo_normalizado = normalizar_cargo(cargo_de_reporte)
 
     # Tenta encontrar o GG do cargo reportado no mapa de NÍVEIS
     gg_minimo_reporte = NIVEIS_HIERARQUICOS.get(cargo_normalizado)
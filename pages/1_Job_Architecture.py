@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import streamlit as st
-from pathlib import Path
+
+from utils.assets import asset_uri, inject_css
 
 # ===========================================================
 # CONFIGURAÇÃO DA PÁGINA
@@ -12,23 +13,16 @@ st.set_page_config(
 )
 
 # ===========================================================
-# CARREGAR CSS GLOBAL (fonts, theme, menu)
+# CSS GLOBAL (fonts, theme, menu) — bundle em memória
 # ===========================================================
-assets_path = Path(__file__).parents[1] / "assets"
-css_files = ["fonts.css", "theme.css", "menu.css"]
-
-for css_name in css_files:
-    css_path = assets_path / css_name
-    if css_path.exists():
-        with open(css_path) as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+inject_css("home")
 
 # ===========================================================
 # TÍTULO PRINCIPAL — ÍCONE 2×2 cm + 26px
 # ===========================================================
-st.markdown("""
+st.markdown(f"""
 <div class="sig-title-wrapper">
-    <img src="https://raw.githubusercontent.com/alexandrejs13/job_architecture/main/assets/icons/governance.png"
+    <img src="{asset_uri('icons/governance.png')}"
          class="sig-title-icon">
     <h1 class="sig-title">Job Architecture</h1>
 </div>
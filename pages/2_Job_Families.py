@@ -2,9 +2,7 @@
 # pages/2_Job_Families.py
 
 import streamlit as st
-import pandas as pd
-from pathlib import Path
-from utils.ui import sidebar_logo_and_title
+from utils.ui import asset_uri, finish_page, sidebar_logo_and_title, wait_for_data
 
 # ==========================================================
 # CONFIGURAÇÃO DA PÁGINA
@@ -23,23 +21,30 @@ sidebar_logo_and_title("assets/SIG_Logo_RGB_Black.png")
 # TÍTULO SIG
 # ==========================================================
 
-st.markdown("""
+st.markdown(f"""
 <div class="sig-title">
-    <img src="assets/icons/people employees.png">
+    <img src="{asset_uri('icons/people employees.png')}">
     <span>Job Families</span>
 </div>
 """, unsafe_allow_html=True)
 
+# ==========================================================
+# DADOS (aquecidos em segundo plano — utils.warmup)
+# ==========================================================
+
+wait_for_data("catalog")
+from utils.catalog import JOB_FAMILY_PATH, load_job_families  # noqa: E402
+
 # ==========================================================
 # CARREGAMENTO DO ARQUIVO
 # ==========================================================
 
-file_path = Path("data/Job Family.xlsx")
+file_path = JOB_FAMILY_PATH
 
 if not file_path.exists():
     st.error("Arquivo 'Job Family.xlsx' não encontrado na pasta data/")
 else:
-    df = pd.read_excel(file_path)
+    df = load_job_families()
 
     st.markdown("""
     <div class="sig-card">
@@ -82,3 +87,6 @@ st.markdown("""
     </p>
 </div>
 """, unsafe_allow_html=True)
+
+# Fecha a medição do rerun (painel "Desempenho" com ?perf=1)
+finish_page()
@@ -2,9 +2,7 @@
 # pages/3_Job_Profile_Description.py
 
 import streamlit as st
-import pandas as pd
-from pathlib import Path
-from utils.ui import sidebar_logo_and_title
+from utils.ui import asset_uri, finish_page, language_selector, sidebar_logo_and_title, wait_for_data
 
 # ==========================================================
 # CONFIGURAÇÃO DA PÁGINA
@@ -23,24 +21,37 @@ sidebar_logo_and_title("assets/SIG_Logo_RGB_Black.png")
 # TÍTULO SIG
 # ==========================================================
 
-st.markdown("""
+st.markdown(f"""
 <div class="sig-title">
-    <img src="assets/icons/business review clipboard.png">
+    <img src="{asset_uri('icons/business review clipboard.png')}">
     <span>Job Profile Description</span>
 </div>
 """, unsafe_allow_html=True)
 
+# ==========================================================
+# DADOS (aquecidos em segundo plano — utils.warmup)
+# ==========================================================
+
+wait_for_data("catalog", "search_index", "similar_roles")
+from utils.catalog import JOB_PROFILE_PATH, load_job_profiles  # noqa: E402
+from utils.search import search_profiles  # noqa: E402
+from utils.similar_roles import similar_roles  # noqa: E402
+from utils.pdf_export import export_combined_pdf, export_zip, select_records  # noqa: E402
+from utils.translation import translate_record  # noqa: E402
+
+language = language_selector()
+
 # ==========================================================
 # CARREGAMENTO DO ARQUIVO
 # ==========================================================
 
-file_path = Path("data/Job Profile.xlsx")
+file_path = JOB_PROFILE_PATH
 
 if not file_path.exists():
     st.error("Arquivo 'Job Profile.xlsx' não encontrado na pasta data/")
     st.stop()
 
-df = pd.read_excel(file_path)
+df = load_job_profiles()
 
 # ==========================================================
 # SELEÇÃO DO CARGO
@@ -55,16 +66,46 @@ st.markdown("""
         <li>Principais Responsabilidades</li>
         <li>Requisitos e Competências</li>
         <li>Qualificações</li>
-        <li>Interações internas e externas</li>
+        <li>Diferencial de Grade</li>
     </ul>
 </div>
 """, unsafe_allow_html=True)
 
-job_list = df["Job Title"].dropna().unique()
-selected_job = st.selectbox("Escolha o cargo:", job_list)
+# Busca textual (BM25) nas descrições do catálogo
+query = st.text_input(
+    "Buscar por palavra-chave (título, descrição do cargo, diferencial de grade, subfamília):"
+)
+
+if query:
+    results = search_profiles(query, k=20)
+
+    if results.empty:
+        st.info("Nenhum cargo encontrado para a busca informada.")
+        positions = []
+    else:
+        for _, hit in results.head(5).iterrows():
+            st.markdown(f"""
+            <div class="sig-card">
+                <strong>{hit['Job Profile']}</strong> ({hit['Full Job Code']})
+                <p style="font-size:14px;"><em>{hit['field']}:</em> {hit['snippet']}</p>
+            </div>
+            """, unsafe_allow_html=True)
+        positions = results["position"].tolist()
+else:
+    positions = list(range(len(df)))
+
+# Rótulos montados uma vez por rerun (indexados pela posição no catálogo)
+labels = [f"{title} ({code})" for title, code in zip(df["Job Profile"], df["Full Job Code"])]
+
+selected_pos = st.selectbox(
+    "Escolha o cargo:",
+    positions,
+    format_func=labels.__getitem__
+)
 
-if selected_job:
-    job_data = df[df["Job Title"] == selected_job].iloc[0]
+if selected_pos is not None:
+    # Textos no idioma escolhido (somente do cache local de traduções)
+    job_data = translate_record(df.iloc[selected_pos], language)
 
     # ==========================================================
     # MISSÃO DO CARGO
@@ -75,7 +116,7 @@ if selected_job:
         <h3>Missão do Cargo</h3>
         <p>{}</p>
     </div>
-    """.format(job_data.get("Job Mission", "Informação não cadastrada")), unsafe_allow_html=True)
+    """.format(job_data.get("Job Profile Description", "Informação não cadastrada")), unsafe_allow_html=True)
 
     # ==========================================================
     # PRINCIPAIS RESPONSABILIDADES
@@ -86,7 +127,7 @@ if selected_job:
         <h3>Principais Responsabilidades</h3>
         <p>{}</p>
     </div>
-    """.format(job_data.get("Key Responsibilities", "Informação não cadastrada")), unsafe_allow_html=True)
+    """.format(job_data.get("Role Description", "Informação não cadastrada")), unsafe_allow_html=True)
 
     # ==========================================================
     # QUALIFICAÇÕES / COMPETÊNCIAS
@@ -100,15 +141,72 @@ if selected_job:
     """.format(job_data.get("Qualifications", "Informação não cadastrada")), unsafe_allow_html=True)
 
     # ==========================================================
-    # INTERAÇÕES
+    # DIFERENCIAL DE GRADE
     # ==========================================================
 
     st.markdown("""
     <div class="sig-card">
-        <h3>Interações Internas e Externas</h3>
+        <h3>Diferencial de Grade</h3>
         <p>{}</p>
     </div>
-    """.format(job_data.get("Interactions", "Informação não cadastrada")), unsafe_allow_html=True)
+    """.format(job_data.get("Grade Differentiator", "Informação não cadastrada")), unsafe_allow_html=True)
+
+    # ==========================================================
+    # CARGOS SIMILARES (MOBILIDADE INTERNA)
+    # ==========================================================
+
+    st.markdown("""
+    <div class="sig-card">
+        <h3>Cargos Similares</h3>
+        <p>Perfis com descrição semelhante e Global Grade próximo, sugeridos para mobilidade interna.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.dataframe(similar_roles(selected_pos, k=10), use_container_width=True, hide_index=True)
+
+# ==========================================================
+# EXPORTAÇÃO EM PDF
+# ==========================================================
+
+st.markdown("""
+<div class="sig-card">
+    <h3>Exportar em PDF</h3>
+    <p>Gere o PDF do cargo selecionado, de uma Job Family inteira ou do catálogo completo.</p>
+</div>
+""", unsafe_allow_html=True)
+
+col_scope, col_format = st.columns(2)
+with col_scope:
+    scope = st.radio("Abrangência:", ["Cargo selecionado", "Job Family", "Catálogo completo"], horizontal=True)
+with col_format:
+    export_format = st.radio("Formato:", ["PDF único", "ZIP (um PDF por cargo)"], horizontal=True)
+
+export_family = None
+if scope == "Job Family":
+    export_family = st.selectbox("Job Family:", sorted(df["Job Family"].dropna().unique()))
+
+if st.button("Gerar exportação"):
+    if scope == "Cargo selecionado":
+        if selected_pos is None:
+            st.warning("Selecione um cargo para exportar.")
+            st.stop()
+        records = select_records(codes=[df.iloc[selected_pos]["Full Job Code"]])
+        file_stem = df.iloc[selected_pos]["Full Job Code"]
+    elif scope == "Job Family":
+        records = select_records(job_family=export_family)
+        file_stem = f"job_profiles_{export_family}".replace(" ", "_")
+    else:
+        records = select_records()
+        file_stem = "job_profiles"
+
+    with st.spinner(f"Gerando {len(records)} perfil(is)..."):
+        if export_format == "PDF único":
+            exported, file_name, mime = export_combined_pdf(records), f"{file_stem}.pdf", "application/pdf"
+        else:
+            exported, file_name, mime = export_zip(records), f"{file_stem}.zip", "application/zip"
+
+    with exported:
+        st.download_button("Baixar arquivo", data=exported.read(), file_name=file_name, mime=mime)
 
 # ==========================================================
 # RODAPÉ
@@ -122,3 +220,6 @@ st.markdown("""
     </p>
 </div>
 """, unsafe_allow_html=True)
+
+# Fecha a medição do rerun (painel "Desempenho" com ?perf=1)
+finish_page()
@@ -2,9 +2,8 @@
 # pages/4_Job_Maps.py
 
 import streamlit as st
-import pandas as pd
-from pathlib import Path
-from utils.ui import sidebar_logo_and_title
+from utils.instrumentation import span
+from utils.ui import asset_uri, finish_page, sidebar_logo_and_title, wait_for_data
 
 # ==========================================================
 # CONFIGURAÇÃO DA PÁGINA
@@ -23,13 +22,21 @@ sidebar_logo_and_title("assets/SIG_Logo_RGB_Black.png")
 # TÍTULO SIG
 # ==========================================================
 
-st.markdown("""
+st.markdown(f"""
 <div class="sig-title">
-    <img src="assets/icons/globe trade.png">
+    <img src="{asset_uri('icons/globe trade.png')}">
     <span>Job Maps</span>
 </div>
 """, unsafe_allow_html=True)
 
+# ==========================================================
+# DADOS (aquecidos em segundo plano — utils.warmup)
+# ==========================================================
+
+wait_for_data("catalog", "career_graph")
+from utils.catalog import LEVEL_STRUCTURE_PATH, load_job_profiles, load_level_structure  # noqa: E402
+from utils.career_paths import next_roles, reachable_roles, shortest_path  # noqa: E402
+
 # ==========================================================
 # VISÃO GERAL
 # ==========================================================
@@ -54,13 +61,13 @@ st.markdown("""
 # CARREGAR ARQUIVO DE NÍVEIS
 # ==========================================================
 
-file_path = Path("data/Level Structure.xlsx")
+file_path = LEVEL_STRUCTURE_PATH
 
 if not file_path.exists():
     st.error("Arquivo 'Level Structure.xlsx' não encontrado na pasta data/")
     st.stop()
 
-df = pd.read_excel(file_path)
+df = load_level_structure()
 
 # ==========================================================
 # APRESENTAÇÃO DO MAPA
@@ -76,7 +83,51 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-st.dataframe(df, use_container_width=True)
+with span("render:profiles_table"):
+    st.dataframe(df, use_container_width=True)
+
+# ==========================================================
+# TRILHAS DE CARREIRA
+# ==========================================================
+
+st.markdown("""
+<div class="sig-card">
+    <h3>Trilhas de Carreira</h3>
+    <p>
+        Selecione um Job Profile para ver as próximas posições possíveis
+        (próximo grade na mesma subfamília, mudança de Career Band ou movimento
+        lateral para subfamílias relacionadas), os cargos alcançáveis em N passos
+        e o menor caminho até um cargo de destino.
+    </p>
+</div>
+""", unsafe_allow_html=True)
+
+profiles = load_job_profiles()
+codes = profiles["Full Job Code"].astype(object).tolist()
+titles = dict(zip(codes, profiles["Job Profile"].astype(object)))
+
+def profile_label(code):
+    return f"{titles[code]} ({code})"
+
+origin = st.selectbox("Cargo de origem:", codes, format_func=profile_label)
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.markdown("**Próximas posições possíveis**")
+    st.dataframe(next_roles(origin), use_container_width=True, hide_index=True)
+
+with col2:
+    steps = st.slider("Cargos alcançáveis em até N passos:", 1, 6, 2)
+    st.dataframe(reachable_roles(origin, steps), use_container_width=True, hide_index=True)
+
+target = st.selectbox("Cargo de destino:", codes, index=len(codes) - 1, format_func=profile_label)
+path = shortest_path(origin, target)
+
+if path is None:
+    st.info("Não há trilha de progressão entre os cargos selecionados.")
+else:
+    st.markdown(" → ".join(profile_label(code) for code in path))
 
 # ==========================================================
 # RODAPÉ
@@ -89,3 +140,6 @@ st.markdown("""
     </p>
 </div>
 """, unsafe_allow_html=True)
+
+# Fecha a medição do rerun (painel "Desempenho" com ?perf=1)
+finish_page()
@@ -2,10 +2,8 @@
 # pages/5_Job_Match.py
 
 import streamlit as st
-import pandas as pd
-from pathlib import Path
-from utils.ui import sidebar_logo_and_title
-import json
+from utils.instrumentation import span
+from utils.ui import asset_uri, finish_page, language_selector, sidebar_logo_and_title, wait_for_data
 
 # ==========================================================
 # CONFIGURAÇÃO DA PÁGINA
@@ -24,13 +22,26 @@ sidebar_logo_and_title("assets/SIG_Logo_RGB_Black.png")
 # TÍTULO SIG
 # ==========================================================
 
-st.markdown("""
+st.markdown(f"""
 <div class="sig-title">
-    <img src="assets/icons/checkmark success.png">
+    <img src="{asset_uri('icons/checkmark success.png')}">
     <span>Job Match (GGS)</span>
 </div>
 """, unsafe_allow_html=True)
 
+# ==========================================================
+# DADOS (aquecidos em segundo plano — utils.warmup)
+# ==========================================================
+
+wait_for_data("catalog", "outcome_table", "profile_index", "embeddings")
+from utils.catalog import GGS_FACTORS_PATH, JOB_PROFILE_PATH, load_ggs_factors  # noqa: E402
+from utils.ggs_factors import lookup_outcome  # noqa: E402
+from utils.job_match_engine import find_best_job_profile, rank_job_profiles, load_profiles  # noqa: E402
+from utils.semantic import semantic_search  # noqa: E402
+from utils.translation import translate_record  # noqa: E402
+
+language = language_selector()
+
 # ==========================================================
 # EXPLICAÇÃO INICIAL
 # ==========================================================
@@ -54,19 +65,20 @@ st.markdown("""
 # CARREGAMENTO DAS REGRAS GGS
 # ==========================================================
 
-ggs_path = Path("data/wtw_ggs_factors.json")
+ggs_path = GGS_FACTORS_PATH
 
 if not ggs_path.exists():
     st.error("Arquivo 'wtw_ggs_factors.json' não encontrado na pasta data/")
     st.stop()
 
-with open(ggs_path, "r", encoding="utf-8") as f:
-    ggs_data = json.load(f)
+ggs_data = load_ggs_factors()
 
 # Cada fator está estruturado como dict:
 # {
-#   "Fator": {
-#       "Níveis": { "1": "descrição", "2": "...", ... }
+#   "fator": {
+#       "label": "...", "description_short": "...",
+#       "levels": { "chave": { "title", "desc", "career_band",
+#                              "career_level", "survey_grade_range" } }
 #   }
 # }
 
@@ -85,19 +97,17 @@ factor_selections = {}
 
 for factor_name, factor_content in ggs_data.items():
 
-    with st.expander(factor_name):
-        st.markdown(f"<p>{factor_content.get('descricao', '')}</p>", unsafe_allow_html=True)
+    label = factor_content.get("label", factor_name)
+    levels = factor_content.get("levels", {})
 
-        levels = list(factor_content.get("niveis", {}).keys())
-        labels = [
-            f"Nível {lvl} – {factor_content['niveis'][lvl][:80]}..."
-            for lvl in levels
-        ]
+    with st.expander(label):
+        st.markdown(f"<p>{factor_content.get('description_short', '')}</p>", unsafe_allow_html=True)
 
         selection = st.selectbox(
-            f"Selecione o nível para {factor_name}:",
-            options=levels,
-            format_func=lambda x: f"Nível {x} – {factor_content['niveis'][x][:80]}..."
+            f"Selecione o nível para {label}:",
+            options=list(levels.keys()),
+            format_func=lambda x, levels=levels: f"{levels[x]['title']} – {levels[x]['desc'][:80]}...",
+            key=f"ggs_{factor_name}"
         )
 
         factor_selections[factor_name] = selection
@@ -111,7 +121,7 @@ st.markdown("<br>", unsafe_allow_html=True)
 process = st.button("Buscar Job Match", type="primary")
 
 # ==========================================================
-# CÁLCULO SIMPLES DO MATCH
+# CÁLCULO DO MATCH (tabela GGS pré-calculada + índice de cargos)
 # ==========================================================
 
 if process:
@@ -123,40 +133,30 @@ if process:
     </div>
     """, unsafe_allow_html=True)
 
-    # Carregar Job Profiles
-    file_path = Path("data/Job Profile.xlsx")
-    if not file_path.exists():
+    if not JOB_PROFILE_PATH.exists():
         st.error("Arquivo 'Job Profile.xlsx' não encontrado.")
         st.stop()
 
-    df = pd.read_excel(file_path)
-
-    # Logika simples:
-    # Somamos os níveis escolhidos → maior soma = maior complexidade → job mais alto
-    soma = sum(int(v) for v in factor_selections.values())
-
-    # Critério de exemplo (ajustável conforme necessidade)
-    if soma <= 8:
-        nivel = "Entry Level"
-    elif soma <= 12:
-        nivel = "Intermediate"
-    elif soma <= 16:
-        nivel = "Senior"
-    else:
-        nivel = "Expert"
-
-    # Filtragem no Excel (garante compatibilidade com qualquer estrutura)
-    match_df = df[df["Level"].str.contains(nivel, case=False, na=False)]
+    outcome = lookup_outcome(factor_selections)
+    selected = find_best_job_profile(
+        outcome["career_band"],
+        outcome["career_level"],
+        outcome["survey_grade"]
+    )
 
-    if match_df.empty:
-        st.warning("Nenhum Job Profile correspondente encontrado com base na soma dos fatores.")
+    if selected is None:
+        st.warning("Nenhum Job Profile correspondente encontrado para os fatores selecionados.")
     else:
-        selected = match_df.iloc[0]
+        selected = translate_record(selected, language)
 
         st.markdown(f"""
         <div class="sig-card">
-            <h3>{selected['Job Title']}</h3>
-            <p><strong>Nível:</strong> {selected['Level']}</p>
+            <h3>{selected['Job Profile']}</h3>
+            <p><strong>Career Band:</strong> {outcome['career_band']} &nbsp;|&nbsp;
+               <strong>Career Level:</strong> {outcome['career_level']} &nbsp;|&nbsp;
+               <strong>Global Grade:</strong> {outcome['survey_grade']}</p>
+            <p><strong>Job Code:</strong> {selected['Full Job Code']} &nbsp;|&nbsp;
+               <strong>Nível:</strong> {selected['SIG Level Title']}</p>
         </div>
         """, unsafe_allow_html=True)
 
@@ -170,14 +170,14 @@ if process:
         st.markdown(f"""
         <div class="sig-card">
             <h4>Missão</h4>
-            <p>{selected.get('Job Mission', 'Não informado')}</p>
+            <p>{selected.get('Job Profile Description', 'Não informado')}</p>
         </div>
         """, unsafe_allow_html=True)
 
         st.markdown(f"""
         <div class="sig-card">
             <h4>Principais Responsabilidades</h4>
-            <p>{selected.get('Key Responsibilities', 'Não informado')}</p>
+            <p>{selected.get('Role Description', 'Não informado')}</p>
         </div>
         """, unsafe_allow_html=True)
 
@@ -190,7 +190,55 @@ if process:
 
         st.markdown(f"""
         <div class="sig-card">
-            <h4>Interações</h4>
-            <p>{selected.get('Interactions', 'Não informado')}</p>
+            <h4>Diferencial de Grade</h4>
+            <p>{selected.get('Grade Differentiator', 'Não informado')}</p>
         </div>
         """, unsafe_allow_html=True)
+
+    # ======================================================
+    # RANKING DOS CARGOS MAIS PRÓXIMOS
+    # ======================================================
+
+    ranking = rank_job_profiles(factor_selections, k=10)
+
+    st.markdown("""
+    <div class="sig-card">
+        <h3>Cargos Mais Próximos</h3>
+        <p>
+            Ranking dos 10 Job Profiles com menor distância aos fatores selecionados.
+            As colunas <strong>dist_*</strong> mostram a contribuição de cada fator
+            (diferença de grade, de band e de career level) para a distância total.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    with span("render:ranking_table"):
+        st.dataframe(ranking, use_container_width=True, hide_index=True)
+
+# ==========================================================
+# MATCH SEMÂNTICO POR DESCRIÇÃO
+# ==========================================================
+
+st.markdown("""
+<div class="sig-card">
+    <h3>Match por Descrição do Cargo</h3>
+    <p>
+        Cole a descrição de uma posição para encontrar os Job Profiles do catálogo
+        com conteúdo mais semelhante. Opcionalmente, restrinja a busca a uma ou
+        mais Job Families.
+    </p>
+</div>
+""", unsafe_allow_html=True)
+
+description = st.text_area("Descrição da posição:", height=160)
+families = st.multiselect(
+    "Filtrar por Job Family:",
+    sorted(load_profiles()["Job Family"].dropna().unique())
+)
+
+if st.button("Buscar perfis semelhantes") and description.strip():
+    similar = semantic_search(description, k=10, job_family=families or None)
+    st.dataframe(similar.drop(columns="position"), use_container_width=True, hide_index=True)
+
+# Fecha a medição do rerun (painel "Desempenho" com ?perf=1)
+finish_page()
@@ -2,9 +2,7 @@
 # pages/6_Structure_Level.py
 
 import streamlit as st
-import pandas as pd
-from pathlib import Path
-from utils.ui import sidebar_logo_and_title
+from utils.ui import asset_uri, finish_page, sidebar_logo_and_title, wait_for_data
 
 # ==========================================================
 # CONFIGURAÇÃO
@@ -23,13 +21,20 @@ sidebar_logo_and_title("assets/SIG_Logo_RGB_Black.png")
 # TÍTULO SIG
 # ==========================================================
 
-st.markdown("""
+st.markdown(f"""
 <div class="sig-title">
-    <img src="assets/icons/process.png">
+    <img src="{asset_uri('icons/process.png')}">
     <span>Structure Level</span>
 </div>
 """, unsafe_allow_html=True)
 
+# ==========================================================
+# DADOS (aquecidos em segundo plano — utils.warmup)
+# ==========================================================
+
+wait_for_data("catalog")
+from utils.catalog import LEVEL_STRUCTURE_PATH, load_level_structure  # noqa: E402
+
 # ==========================================================
 # VISÃO GERAL
 # ==========================================================
@@ -54,13 +59,13 @@ st.markdown("""
 # CARREGAMENTO DO ARQUIVO
 # ==========================================================
 
-file_path = Path("data/Level Structure.xlsx")
+file_path = LEVEL_STRUCTURE_PATH
 
 if not file_path.exists():
     st.error("Arquivo 'Level Structure.xlsx' não encontrado na pasta data/")
     st.stop()
 
-df = pd.read_excel(file_path)
+df = load_level_structure()
 
 # ==========================================================
 # EXIBIÇÃO DA ESTRUTURA
@@ -85,3 +90,6 @@ st.markdown("""
     </p>
 </div>
 """, unsafe_allow_html=True)
+
+# Fecha a medição do rerun (painel "Desempenho" com ?perf=1)
+finish_page()
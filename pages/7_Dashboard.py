@@ -2,9 +2,8 @@
 # pages/7_Dashboard.py
 
 import streamlit as st
-import pandas as pd
-from pathlib import Path
-from utils.ui import sidebar_logo_and_title
+from utils.instrumentation import span
+from utils.ui import asset_uri, finish_page, sidebar_logo_and_title, wait_for_data
 
 # ==========================================================
 # CONFIGURAÇÃO DA PÁGINA
@@ -23,13 +22,21 @@ sidebar_logo_and_title("assets/SIG_Logo_RGB_Black.png")
 # TÍTULO SIG
 # ==========================================================
 
-st.markdown("""
+st.markdown(f"""
 <div class="sig-title">
-    <img src="assets/icons/data 2 performance.png">
+    <img src="{asset_uri('icons/data 2 perfromance.png')}">
     <span>Dashboard</span>
 </div>
 """, unsafe_allow_html=True)
 
+# ==========================================================
+# DADOS (aquecidos em segundo plano — utils.warmup)
+# ==========================================================
+
+wait_for_data("catalog", "facets")
+from utils.catalog import load_job_families, load_job_profiles, load_level_structure  # noqa: E402
+from utils.facets import FACET_COLUMNS, facet_query  # noqa: E402
+
 # ==========================================================
 # SEÇÃO 1 – VISÃO GERAL
 # ==========================================================
@@ -49,15 +56,11 @@ st.markdown("""
 # SEÇÃO 2 – INDICADORES SIMPLES
 # ==========================================================
 
-# Carregamento dos arquivos Excel
-jf_path = Path("data/Job Family.xlsx")
-jp_path = Path("data/Job Profile.xlsx")
-ls_path = Path("data/Level Structure.xlsx")
-
+# Carregamento dos arquivos Excel (cache compartilhado entre sessões)
 try:
-    jf_df = pd.read_excel(jf_path)
-    jp_df = pd.read_excel(jp_path)
-    ls_df = pd.read_excel(ls_path)
+    jf_df = load_job_families()
+    jp_df = load_job_profiles()
+    ls_df = load_level_structure()
 
     col1, col2, col3 = st.columns(3)
 
@@ -75,7 +78,7 @@ try:
             <h3>Job Profiles</h3>
             <p style="font-size: 32px; font-weight: 700; color:#145efc;">{}</p>
         </div>
-        """.format(jp_df["Job Title"].nunique()), unsafe_allow_html=True)
+        """.format(jp_df["Job Profile"].nunique()), unsafe_allow_html=True)
 
     with col3:
         st.markdown("""
@@ -108,7 +111,25 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 if 'jp_df' in locals():
-    st.dataframe(jp_df, use_container_width=True)
+    # Filtros facetados: as contagens de cada opção já consideram os
+    # filtros aplicados nas demais facetas.
+    selection = {col: st.session_state.get(f"facet_{col}", []) for col in FACET_COLUMNS}
+    facet_result = facet_query(selection)
+
+    facet_cols = st.columns(3)
+    for i, column in enumerate(FACET_COLUMNS):
+        counts = facet_result["counts"].get(column, {})
+        with facet_cols[i % 3]:
+            st.multiselect(
+                column,
+                options=list(counts.keys()),
+                format_func=lambda value, counts=counts: f"{value} ({counts[value]})",
+                key=f"facet_{column}"
+            )
+
+    st.caption(f"{facet_result['total']} de {len(jp_df)} Job Profiles")
+    with span("render:profiles_table"):
+        st.dataframe(jp_df.iloc[facet_result["rows"]], use_container_width=True)
 
 st.markdown("""
 <div class="sig-card">
@@ -131,3 +152,6 @@ st.markdown("""
     </p>
 </div>
 """, unsafe_allow_html=True)
+
+# Fecha a medição do rerun (painel "Desempenho" com ?perf=1)
+finish_page()
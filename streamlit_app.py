@@ -1,7 +1,16 @@
+import streamlit as st
+
+from utils import warmup
+from utils.assets import asset_uri
+
+# Catálogo, tabela GGS e índices de busca carregam em segundo plano; as
+# páginas só esperam pelo que usam (utils.ui.wait_for_data)
+warmup.start()
+
 st.sidebar.markdown(
-    """
+    f"""
     <div style="padding: 20px 0 30px 0; text-align:center;">
-        <img src="https://raw.githubusercontent.com/alexandrejs13/job_architecture/main/assets/SIG_Logo_RGB_Black.png"
+        <img src="{asset_uri('SIG_Logo_RGB_Black.png')}"
              style="width:160px;">
     </div>
     """,
@@ -0,0 +1,409 @@
+# utils/api.py
+"""
+API HTTP (ASGI) para integrações (HRIS, ATS) com o match e o catálogo.
+
+Aplicação ASGI pura, sem framework: o catálogo e os índices são os
+mesmos caches de processo usados pelas páginas (utils.catalog,
+ggs_factors, job_match_engine, search), então todas as requisições
+compartilham a mesma memória. Respostas de GET/POST (exceto /health e
+/match/batch) são guardadas em um cache LRU cuja chave inclui a versão
+(hash) do catálogo e dos fatores, limitado em entradas e em bytes.
+
+Endpoints:
+  GET  /health
+  POST /match              {"selection": {fator: nível}, "k": 5}
+  POST /match/batch        {"selections": [{fator: nível}, ...]}
+  GET  /profiles/{código}  (Full Job Code)
+  GET  /search?q=...&k=20
+
+Uso:
+    python -m utils.api [--host 127.0.0.1] [--port 8000]   # requer uvicorn
+
+Em testes, ApiClient chama a aplicação no próprio processo:
+    client = ApiClient()
+    status, body = client.post("/match", {"selection": {...}})
+"""
+import argparse
+import asyncio
+import json
+import math
+import threading
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote
+
+import numpy as np
+
+from utils import catalog, ggs_factors, job_match_engine, search
+
+# Limites do cache LRU de respostas: quantidade, total de bytes (resposta
+# + corpo da requisição, que faz parte da chave) e tamanho máximo de uma
+# entrada; respostas maiores são servidas sem passar pelo cache
+RESPONSE_CACHE_SIZE = 4096
+RESPONSE_CACHE_BYTES = 64 * 2**20
+MAX_CACHED_RESPONSE = 256 * 2**10
+# Limite de seleções por chamada de /match/batch
+MAX_BATCH = 10_000
+
+_lock = threading.Lock()
+_responses = OrderedDict()
+_response_bytes = 0
+
+
+class ApiError(Exception):
+    """Erro com status HTTP, devolvido ao cliente como {"error": mensagem}."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# =========================================================
+# SERIALIZAÇÃO
+# =========================================================
+
+def _jsonable(value):
+    """Converte valores do pandas/NumPy em tipos JSON (NaN → null)."""
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return None if math.isnan(value) else float(value)
+    if value is None or isinstance(value, (str, int, bool)):
+        return value
+    try:
+        if value != value:  # pd.NA / NaT
+            return None
+    except (TypeError, ValueError):
+        pass
+    return str(value)
+
+
+def _records(df):
+    return [_jsonable(r) for r in df.to_dict("records")]
+
+
+# =========================================================
+# ESTADO COMPARTILHADO
+# =========================================================
+
+def catalog_version():
+    """Versão dos dados servidos: hash do Job Profile e dos fatores GGS."""
+    catalog.load_job_profiles()
+    catalog.load_ggs_factors()
+    return (catalog.source_digest("job_profile"), catalog.source_digest("ggs_factors"))
+
+
+def _profile_codes():
+    """Full Job Code → posição no catálogo, refeito só quando o Job Profile muda."""
+    def build():
+        df = catalog.load_job_profiles()
+        return {code: pos for pos, code in enumerate(df["Full Job Code"].astype(str))}
+
+    return catalog.derived("api_profile_codes", build)
+
+
+def warm_up():
+    """Carrega catálogo e índices antes da primeira requisição."""
+    ggs_factors.get_outcome_table()
+    job_match_engine.get_profile_index()
+    job_match_engine.get_profile_vectors()
+    search.get_search_index()
+    _profile_codes()
+
+
+# =========================================================
+# HANDLERS
+# =========================================================
+
+def _match_one(selection, k=0):
+    if not isinstance(selection, dict):
+        raise ApiError(400, "'selection' deve ser um objeto {fator: nível}.")
+    # Chaves de nível vêm do JSON dos fatores: listas/objetos/números não
+    # existem na tabela (e listas nem são hasháveis)
+    invalid = sorted(str(name) for name, level in selection.items() if not isinstance(level, str))
+    if invalid:
+        raise ApiError(422, f"Nível deve ser texto para o(s) fator(es): {', '.join(invalid)}")
+    try:
+        outcome = ggs_factors.lookup_outcome(selection)
+    except (KeyError, ValueError) as exc:
+        raise ApiError(422, str(exc.args[0]))
+
+    profile = job_match_engine.find_best_job_profile(
+        outcome["career_band"], outcome["career_level"], outcome["survey_grade"]
+    )
+    result = {"outcome": outcome, "profile": _jsonable(profile)}
+    if k:
+        result["ranking"] = _records(job_match_engine.rank_job_profiles(selection, k=k))
+    return result
+
+
+async def handle_health(params, body):
+    profiles, factors = catalog_version()
+    return {"status": "ok", "job_profile": profiles, "ggs_factors": factors}
+
+
+async def handle_match(params, body):
+    k = _int_param(body.get("k", 0), "k", 0, 100)
+    return _match_one(body.get("selection"), k)
+
+
+async def handle_match_batch(params, body):
+    selections = body.get("selections")
+    if not isinstance(selections, list):
+        raise ApiError(400, "'selections' deve ser uma lista.")
+    if len(selections) > MAX_BATCH:
+        raise ApiError(413, f"Máximo de {MAX_BATCH} seleções por chamada.")
+
+    def run():
+        results = []
+        for selection in selections:
+            try:
+                results.append(_match_one(selection))
+            except ApiError as exc:
+                results.append({"error": exc.message})
+        return results
+
+    return {"results": await asyncio.to_thread(run)}
+
+
+async def handle_profile(params, body, code):
+    pos = _profile_codes().get(code)
+    if pos is None:
+        raise ApiError(404, f"Job Profile não encontrado: {code}")
+    record = job_match_engine.get_profile_index()["records"][pos]
+    return {"profile": _jsonable(record)}
+
+
+async def handle_search(params, body):
+    query = params.get("q", "").strip()
+    if not query:
+        raise ApiError(400, "Parâmetro 'q' obrigatório.")
+    k = _int_param(params.get("k", 20), "k", 1, 200)
+    results = await asyncio.to_thread(search.search_profiles, query, k)
+    return {"results": _records(results)}
+
+
+def _int_param(value, name, low, high):
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ApiError(400, f"'{name}' deve ser um inteiro.")
+    if not low <= value <= high:
+        raise ApiError(400, f"'{name}' deve estar entre {low} e {high}.")
+    return value
+
+
+ROUTES = {
+    ("GET", "/health"): handle_health,
+    ("POST", "/match"): handle_match,
+    ("POST", "/match/batch"): handle_match_batch,
+    ("GET", "/search"): handle_search,
+}
+
+# /health reflete o estado atual; /match/batch tem corpo e resposta
+# grandes e raramente repetidos. Nenhum dos dois passa pelo cache
+UNCACHED = {"/health", "/match/batch"}
+
+
+def _route(method, path):
+    handler = ROUTES.get((method, path))
+    if handler is not None:
+        return handler, ()
+    if path.startswith("/profiles/") and len(path) > len("/profiles/"):
+        if method != "GET":
+            raise ApiError(405, "Método não permitido.")
+        return handle_profile, (unquote(path[len("/profiles/"):]),)
+    if any(p == path for _, p in ROUTES):
+        raise ApiError(405, "Método não permitido.")
+    raise ApiError(404, "Rota não encontrada.")
+
+
+# =========================================================
+# CACHE DE RESPOSTAS
+# =========================================================
+
+def _cache_get(key):
+    with _lock:
+        payload = _responses.get(key)
+        if payload is not None:
+            _responses.move_to_end(key)
+        return payload
+
+
+def _entry_size(key, payload):
+    # key = (method, path, query_string, raw_body, versão)
+    return len(payload) + len(key[2]) + len(key[3])
+
+
+def _cache_put(key, payload):
+    global _response_bytes
+    size = _entry_size(key, payload)
+    if size > MAX_CACHED_RESPONSE:
+        return
+    with _lock:
+        old = _responses.pop(key, None)
+        if old is not None:
+            _response_bytes -= _entry_size(key, old)
+        _responses[key] = payload
+        _response_bytes += size
+        while len(_responses) > RESPONSE_CACHE_SIZE or _response_bytes > RESPONSE_CACHE_BYTES:
+            old_key, old_payload = _responses.popitem(last=False)
+            _response_bytes -= _entry_size(old_key, old_payload)
+
+
+def clear_response_cache():
+    global _response_bytes
+    with _lock:
+        _responses.clear()
+        _response_bytes = 0
+
+
+# =========================================================
+# APLICAÇÃO ASGI
+# =========================================================
+
+async def _read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def _send_json(send, status, payload, cache_state=None):
+    headers = [(b"content-type", b"application/json; charset=utf-8"), (b"content-length", str(len(payload)).encode())]
+    if cache_state:
+        headers.append((b"x-cache", cache_state.encode()))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": payload})
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            try:
+                await asyncio.to_thread(warm_up)
+            except Exception as exc:  # noqa: BLE001 - o servidor decide se sobe
+                await send({"type": "lifespan.startup.failed", "message": str(exc)})
+                return
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    """Aplicação ASGI 3."""
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    method = scope["method"].upper()
+    path = scope["path"].rstrip("/") or "/"
+    query_string = scope.get("query_string", b"")
+    raw_body = await _read_body(receive)
+
+    try:
+        handler, args = _route(method, path)
+
+        key = None
+        if path not in UNCACHED:
+            key = (method, path, query_string, raw_body, catalog_version())
+            cached = _cache_get(key)
+            if cached is not None:
+                await _send_json(send, 200, cached, "hit")
+                return
+
+        params = {k: v[-1] for k, v in parse_qs(query_string.decode("latin-1")).items()}
+        body = {}
+        if raw_body:
+            try:
+                body = json.loads(raw_body)
+            except ValueError:
+                raise ApiError(400, "Corpo da requisição não é um JSON válido.")
+            if not isinstance(body, dict):
+                raise ApiError(400, "Corpo da requisição deve ser um objeto JSON.")
+
+        payload = json.dumps(await handler(params, body, *args), ensure_ascii=False).encode("utf-8")
+        if key is not None:
+            _cache_put(key, payload)
+        await _send_json(send, 200, payload, "miss" if key is not None else None)
+
+    except ApiError as exc:
+        await _send_json(send, exc.status, json.dumps({"error": exc.message}, ensure_ascii=False).encode("utf-8"))
+    except Exception as exc:  # noqa: BLE001 - a requisição sempre recebe resposta
+        message = f"Erro interno: {type(exc).__name__}"
+        await _send_json(send, 500, json.dumps({"error": message}, ensure_ascii=False).encode("utf-8"))
+
+
+# =========================================================
+# CLIENTE EM PROCESSO (testes / integrações locais)
+# =========================================================
+
+class ApiClient:
+    """Chama a aplicação ASGI diretamente, sem rede."""
+
+    def __init__(self, application=app):
+        self.app = application
+
+    async def arequest(self, method, path, payload=None):
+        path, _, query = path.partition("?")
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method.upper(),
+            "path": path,
+            "query_string": query.encode("latin-1"),
+            "headers": [(b"content-type", b"application/json")],
+        }
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+        response = {"headers": {}}
+
+        async def receive():
+            return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = {k.decode(): v.decode() for k, v in message["headers"]}
+            elif message["type"] == "http.response.body":
+                response["body"] = message.get("body", b"")
+
+        await self.app(scope, receive, send)
+        return response["status"], json.loads(response["body"] or b"null"), response["headers"]
+
+    def request(self, method, path, payload=None):
+        """Retorna (status, corpo JSON)."""
+        status, body, _ = asyncio.run(self.arequest(method, path, payload))
+        return status, body
+
+    def get(self, path):
+        return self.request("GET", path)
+
+    def post(self, path, payload):
+        return self.request("POST", path, payload)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API HTTP de Job Match e catálogo.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("uvicorn não está instalado: pip install uvicorn")
+
+    uvicorn.run("utils.api:app", host=args.host, port=args.port, workers=args.workers, log_level="warning")
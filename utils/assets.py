@@ -0,0 +1,189 @@
+# utils/assets.py
+"""
+Bundle de assets das páginas: CSS concatenado e minificado, com fontes e
+imagens embutidas como data URIs.
+
+Cada bundle (BUNDLES) junta os .css de assets/ na ordem dada, troca cada
+url(...) relativa pelo arquivo embutido (fontes .ttf, ícones) e remove
+comentários e espaços. O resultado fica em memória, indexado pelo hash
+do conteúdo dos arquivos; a cada rerun só o mtime/tamanho é conferido
+(sem ler o disco) e o bundle é refeito apenas quando algum arquivo muda.
+Ícones e logo seguem o mesmo cache (asset_uri). Nada depende de hosts
+externos: a página pinta só com o que já está no processo.
+
+Como o bloco <style> é idêntico em todos os reruns, o cache de mensagens
+do Streamlit envia o conteúdo ao navegador uma vez por sessão.
+"""
+import base64
+import hashlib
+import mimetypes
+import re
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+ASSETS_DIR = ROOT / "assets"
+
+# CSS de cada bundle, na ordem de aplicação. fonts.css (fontes embutidas,
+# ~285 KB) fica só na home, como antes do bundle
+BUNDLES = {
+    "global": ["theme.css", "styles.css", "header.css"],
+    "home": ["fonts.css", "theme.css", "menu.css"],
+}
+
+# mimetypes não conhece fontes em todas as plataformas
+MIME_TYPES = {
+    ".ttf": "font/ttf",
+    ".otf": "font/otf",
+    ".woff": "font/woff",
+    ".woff2": "font/woff2",
+    ".svg": "image/svg+xml",
+}
+
+_lock = threading.Lock()
+_entries = {}   # bundle / arquivo -> {"signature", "digest", "files"}
+_built = {}     # hash do conteúdo -> resultado pronto
+
+
+# =========================================================
+# CACHE POR HASH DO CONTEÚDO
+# =========================================================
+
+def _signature(paths):
+    signature = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            signature.append((str(path), None, None))
+            continue
+        signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def _cached(key, build):
+    """
+    Resultado de `build()` para `key`, refeito só quando os arquivos de que
+    ele depende mudam. `build` devolve (arquivos lidos, bytes lidos, valor).
+    """
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry["signature"] == _signature(entry["files"]):
+            return _built[entry["digest"]]
+
+        files, contents, value = build()
+        digest = hashlib.sha1(b"\0".join(contents)).hexdigest()
+        _built.setdefault(digest, value)
+        _entries[key] = {"signature": _signature(files), "digest": digest, "files": files}
+        return _built[digest]
+
+
+# =========================================================
+# DATA URIs
+# =========================================================
+
+def _mime_type(path):
+    return MIME_TYPES.get(path.suffix.lower()) or mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+
+def _data_uri(path, content):
+    return f"data:{_mime_type(path)};base64,{base64.b64encode(content).decode('ascii')}"
+
+
+def _resolve(path):
+    path = Path(path)
+    if path.is_absolute():
+        return path
+    for base in (ROOT, ASSETS_DIR):
+        if (base / path).exists():
+            return base / path
+    return ASSETS_DIR / path
+
+
+def asset_uri(path):
+    """
+    Data URI de um arquivo de assets/ (ícone, logo). Aceita o caminho a
+    partir da raiz do repositório ("assets/icons/x.png") ou de assets/
+    ("icons/x.png"). Arquivo inexistente devolve o caminho como veio.
+    """
+    resolved = _resolve(path)
+    if not resolved.exists():
+        return str(path)
+
+    def build():
+        content = resolved.read_bytes()
+        return [resolved], [content], _data_uri(resolved, content)
+
+    return _cached(("uri", str(resolved)), build)
+
+
+# =========================================================
+# CSS
+# =========================================================
+
+_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_SPACE = re.compile(r"\s+")
+# Espaço em volta de pontuação que nunca muda o sentido do seletor; ":"
+# só perde o espaço depois (antes dele, "a :hover" ≠ "a:hover")
+_PUNCTUATION = re.compile(r"\s*([{};,>])\s*")
+_AFTER_COLON = re.compile(r":\s+")
+
+
+def minify_css(css):
+    """Remove comentários e espaços supérfluos."""
+    css = _COMMENT.sub("", css)
+    css = _SPACE.sub(" ", css)
+    css = _PUNCTUATION.sub(r"\1", css)
+    css = _AFTER_COLON.sub(":", css)
+    return css.replace(";}", "}").strip()
+
+
+def _inline_urls(css, base_dir, files, contents):
+    def replace(match):
+        target = match.group(2).strip()
+        if target.startswith(("data:", "http:", "https:", "//", "#")):
+            return match.group(0)
+        path = (base_dir / target).resolve()
+        if not path.is_file():
+            return match.group(0)
+        content = path.read_bytes()
+        files.append(path)
+        contents.append(content)
+        return f"url({_data_uri(path, content)})"
+
+    return _URL.sub(replace, css)
+
+
+def css_bundle(bundle="global"):
+    """CSS minificado do bundle, com fontes e imagens embutidas."""
+    names = BUNDLES[bundle]
+    paths = [ASSETS_DIR / name for name in names]
+
+    def build():
+        files, contents, parts = [], [], []
+        for path in paths:
+            files.append(path)
+            if not path.exists():
+                contents.append(b"")
+                continue
+            content = path.read_bytes()
+            contents.append(content)
+            parts.append(_inline_urls(content.decode("utf-8"), path.parent, files, contents))
+        return files, contents, minify_css("\n".join(parts))
+
+    return _cached(("css", bundle), build)
+
+
+def inject_css(bundle="global"):
+    """Injeta o bundle inteiro na página com um único elemento."""
+    import streamlit as st
+
+    st.markdown(f"<style>{css_bundle(bundle)}</style>", unsafe_allow_html=True)
+
+
+def clear_cache():
+    """Descarta os bundles e data URIs montados."""
+    with _lock:
+        _entries.clear()
+        _built.clear()
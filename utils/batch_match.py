@@ -0,0 +1,229 @@
+# utils/batch_match.py
+"""
+Match em lote (linha de comando) para arquivos grandes de posições.
+
+Lê um CSV/XLSX com uma linha por posição e uma coluna por fator GGS
+(proficiencia, complexidade_problema, ...) contendo a chave do nível
+escolhido, em blocos de linhas. Cada bloco é avaliado em um processo do
+pool (tabela exaustiva de resultados + índice do catálogo) e o resultado
+é gravado incrementalmente em CSV ou Parquet, na ordem de entrada. A
+quantidade de blocos em memória é limitada a 2 × workers.
+
+Uso:
+    python -m utils.batch_match posicoes.xlsx resultado.parquet [--chunksize 50000] [--workers 4]
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils import ggs_factors, job_match_engine
+
+# Colunas do cargo encontrado acrescentadas a cada posição
+MATCH_COLUMNS = ["Full Job Code", "Job Profile", "Job Family", "Sub Job Family", "Global Grade"]
+
+# Todas as colunas que o match acrescenta; o arquivo de entrada não pode
+# ter nenhuma delas (seriam sobrescritas sem aviso)
+OUTPUT_COLUMNS = ["career_band", "career_level", "survey_grade", *MATCH_COLUMNS, "error"]
+
+DEFAULT_CHUNKSIZE = 50_000
+
+
+# =========================================================
+# LEITURA / ESCRITA EM BLOCOS
+# =========================================================
+
+def read_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Gera DataFrames de até `chunksize` linhas de um CSV ou XLSX (todas as colunas como texto)."""
+    path = Path(path)
+
+    if path.suffix.lower() in (".xlsx", ".xlsm"):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(c).strip() if c is not None else "" for c in next(rows, [])]
+            buffer = []
+            for row in rows:
+                buffer.append(row)
+                if len(buffer) >= chunksize:
+                    yield pd.DataFrame(buffer, columns=header, dtype=object)
+                    buffer = []
+            if buffer:
+                yield pd.DataFrame(buffer, columns=header, dtype=object)
+        finally:
+            workbook.close()
+        return
+
+    for chunk in pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=False):
+        chunk.columns = chunk.columns.str.strip()
+        yield chunk
+
+
+class ResultWriter:
+    """Grava blocos de resultado em CSV (append) ou Parquet (row groups)."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.parquet = self.path.suffix.lower() == ".parquet"
+        self._writer = None
+        self._schema = None
+        self._started = False
+
+    def write(self, df):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._writer is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                # Colunas só com nulos no primeiro bloco viram texto
+                self._schema = pa.schema([
+                    field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                    for field in table.schema
+                ])
+                table = table.cast(self._schema)
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            else:
+                table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode="a" if self._started else "w", header=not self._started, index=False)
+        self._started = True
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+# =========================================================
+# AVALIAÇÃO DE UM BLOCO
+# =========================================================
+
+def match_chunk(chunk):
+    """
+    Avalia um bloco de posições: seleção → (band, level, grade) pela
+    tabela exaustiva de resultados → cargo do catálogo. Linhas com
+    fator ausente ou nível inválido recebem a mensagem em `error`.
+    Colunas de entrada com nome de OUTPUT_COLUMNS geram ValueError.
+    """
+    collisions = [c for c in OUTPUT_COLUMNS if c in chunk.columns]
+    if collisions:
+        raise ValueError(
+            f"Colunas de entrada com nome reservado ao resultado do match: {collisions}. "
+            "Renomeie-as antes de rodar o lote."
+        )
+
+    table = ggs_factors.get_outcome_table()
+    n = len(chunk)
+
+    code = np.zeros(n, dtype=np.int64)
+    errors = np.full(n, None, dtype=object)
+
+    for name, weight, positions in zip(table["factors"], table["weights"], table["positions"]):
+        if name not in chunk.columns:
+            errors[:] = f"Fator GGS ausente: '{name}'"
+            continue
+        values = chunk[name].astype(object).where(chunk[name].notna(), "").astype(str).str.strip()
+        pos = pd.Categorical(values, categories=list(positions)).codes.astype(np.int64)
+        invalid = (pos < 0) & pd.isna(errors)
+        errors[invalid] = f"Nível inválido para o fator '{name}'"
+        code += np.maximum(pos, 0) * weight
+
+    ok = pd.isna(errors)
+    bands = np.asarray(table["bands"], dtype=object)[table["band"][code]]
+    levels = np.asarray(table["levels"], dtype=object)[table["level"][code]]
+    grades = table["grade"][code].astype(np.int64)
+
+    result = chunk.reset_index(drop=True).copy()
+    result["career_band"] = np.where(ok, bands, None)
+    result["career_level"] = np.where(ok, levels, None)
+    result["survey_grade"] = pd.Series(grades).astype("Int64").where(ok)
+
+    # Cada combinação distinta (band, level, grade) é buscada uma única vez
+    keys = pd.MultiIndex.from_arrays([bands, levels, grades])
+    unique_keys = keys[ok].unique()
+    profiles = job_match_engine.find_best_job_profiles(list(unique_keys))
+    matched = pd.DataFrame(
+        [{c: (p or {}).get(c) for c in MATCH_COLUMNS} for p in profiles] + [{}],
+        columns=MATCH_COLUMNS,
+        dtype=object,
+    )
+    # A última linha (vazia) atende as posições com erro
+    inverse = np.where(ok, unique_keys.get_indexer(keys), len(unique_keys))
+    for column in MATCH_COLUMNS:
+        result[column] = matched[column].to_numpy(dtype=object)[inverse]
+    result["Global Grade"] = pd.to_numeric(result["Global Grade"]).astype("Int64")
+
+    result["error"] = errors
+    return result
+
+
+# =========================================================
+# EXECUÇÃO
+# =========================================================
+
+def run_batch(input_path, output_path, chunksize=DEFAULT_CHUNKSIZE, workers=None, log=sys.stderr):
+    """
+    Processa `input_path` inteiro e grava em `output_path` (.csv ou .parquet).
+    Retorna {"rows", "errors", "chunks", "seconds", "rows_per_second"}.
+    """
+    workers = workers or os.cpu_count() or 1
+    writer = ResultWriter(output_path)
+    stats = {"rows": 0, "errors": 0, "chunks": 0}
+    start = time.perf_counter()
+
+    def consume(result):
+        writer.write(result)
+        stats["rows"] += len(result)
+        stats["errors"] += int(result["error"].notna().sum())
+        stats["chunks"] += 1
+        if log is not None:
+            elapsed = time.perf_counter() - start
+            print(
+                f"bloco {stats['chunks']}: {stats['rows']:,} linhas, "
+                f"{stats['rows'] / max(elapsed, 1e-9):,.0f} linhas/s",
+                file=log,
+            )
+
+    try:
+        if workers == 1:
+            for chunk in read_chunks(input_path, chunksize):
+                consume(match_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for chunk in read_chunks(input_path, chunksize):
+                    pending.append(pool.submit(match_chunk, chunk))
+                    if len(pending) >= 2 * workers:
+                        consume(pending.popleft().result())
+                while pending:
+                    consume(pending.popleft().result())
+    finally:
+        writer.close()
+
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    stats["rows_per_second"] = round(stats["rows"] / max(stats["seconds"], 1e-9))
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Match em lote de posições (fatores GGS → Job Profile).")
+    parser.add_argument("input", help="CSV ou XLSX com uma coluna por fator GGS")
+    parser.add_argument("output", help="arquivo de saída (.csv ou .parquet)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="linhas por bloco")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: núcleos da máquina)")
+    args = parser.parse_args()
+
+    summary = run_batch(args.input, args.output, args.chunksize, args.workers)
+    print(
+        f"{summary['rows']:,} posições em {summary['seconds']}s "
+        f"({summary['rows_per_second']:,} linhas/s), {summary['errors']:,} com erro → {args.output}"
+    )
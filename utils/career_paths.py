@@ -0,0 +1,182 @@
+# utils/career_paths.py
+"""
+Grafo de trilhas de carreira sobre o catálogo de Job Profiles.
+
+Nós são Job Profiles (Full Job Code). Arestas (direcionadas):
+  - grade:   próximo Global Grade existente na mesma Sub Job Family e
+             Career Path;
+  - band:    transição de Career Band (W→T, P→M, M→EX...) dentro da mesma
+             Sub Job Family, para o mesmo grade ou o seguinte, quando a
+             transição é permitida pelo Level Structure;
+  - lateral: Sub Job Families relacionadas (mesma Job Family, mesma band
+             e mesmo grade), nos dois sentidos.
+
+O grafo é montado uma vez por versão do catálogo e os caminhos mais
+curtos são memorizados.
+"""
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from utils import catalog
+from utils.instrumentation import timed
+
+
+# =========================================================
+# CONSTRUÇÃO
+# =========================================================
+
+def band_transitions(levels):
+    """
+    Transições de band permitidas, derivadas do Level Structure: A → B
+    quando B começa em um grade acima do início de A e no máximo um grade
+    depois do topo de A (as faixas se tocam ou se sobrepõem).
+    """
+    ranges = levels.groupby("Career Band", observed=True)["Global Grade"].agg(["min", "max"])
+    pairs = set()
+    for a, ra in ranges.iterrows():
+        for b, rb in ranges.iterrows():
+            if a != b and rb["min"] > ra["min"] and rb["min"] <= ra["max"] + 1:
+                pairs.add((a, b))
+    return pairs
+
+
+@timed("build:career_graph")
+def build_career_graph(profiles, levels):
+    """Monta nós e listas de adjacência {código: [(código_destino, tipo), ...]}."""
+    df = pd.DataFrame({
+        "code": profiles["Full Job Code"].astype(object),
+        "family": profiles["Job Family"].astype(object),
+        "sub": profiles["Sub Job Family"].astype(object).str.strip(),
+        "path": profiles["Career Path"].astype(object),
+        "band": profiles["Career Band Short"].astype(object),
+        "grade": profiles["Global Grade"].astype(int),
+    })
+
+    # Arestas de grade: próximo grade existente na mesma Sub Family + Career Path
+    grades = df[["sub", "path", "grade"]].drop_duplicates().sort_values(["sub", "path", "grade"])
+    grades["next_grade"] = grades.groupby(["sub", "path"])["grade"].shift(-1)
+    steps = df.merge(grades.dropna(subset=["next_grade"]), on=["sub", "path", "grade"])
+    steps["next_grade"] = steps["next_grade"].astype(int)
+    grade_edges = steps.merge(
+        df, left_on=["sub", "path", "next_grade"], right_on=["sub", "path", "grade"], suffixes=("", "_to")
+    )[["code", "code_to"]].assign(kind="grade")
+
+    # Arestas de band: transições permitidas dentro da Sub Family
+    allowed = band_transitions(levels)
+    pairs = df.merge(df, on="sub", suffixes=("", "_to"))
+    delta = pairs["grade_to"] - pairs["grade"]
+    is_transition = np.array([(a, b) in allowed for a, b in zip(pairs["band"], pairs["band_to"])], dtype=bool)
+    band_edges = pairs[is_transition & delta.between(0, 1)][["code", "code_to"]].assign(kind="band")
+
+    # Arestas laterais: Sub Families relacionadas (mesma família, band e grade)
+    peers = df.merge(df, on=["family", "band", "grade"], suffixes=("", "_to"))
+    lateral_edges = peers[peers["sub"] != peers["sub_to"]][["code", "code_to"]].assign(kind="lateral")
+
+    edges = pd.concat([grade_edges, band_edges, lateral_edges], ignore_index=True)
+    edges = edges[edges["code"] != edges["code_to"]].drop_duplicates(["code", "code_to"])
+
+    adjacency = {code: [] for code in df["code"]}
+    for source, target, kind in edges.itertuples(index=False):
+        adjacency[source].append((target, kind))
+
+    return {
+        "nodes": df.set_index("code"),
+        "adjacency": adjacency,
+        "edges": edges.reset_index(drop=True),
+    }
+
+
+def get_career_graph():
+    """Grafo do catálogo atual + versão (hash do Job Profile e do Level Structure)."""
+    sources = ("job_profile", "level_structure")
+
+    def build():
+        version = tuple(catalog.source_digest(source) for source in sources)
+        return version, build_career_graph(catalog.load_job_profiles(), catalog.load_level_structure())
+
+    return catalog.derived("career_graph", build, sources=sources)
+
+
+# =========================================================
+# CONSULTAS
+# =========================================================
+
+def next_roles(code):
+    """Cargos alcançáveis em um passo a partir de `code`, com o tipo da aresta."""
+    _, graph = get_career_graph()
+    rows = [
+        {"Full Job Code": target, "kind": kind, **_describe(graph, target)}
+        for target, kind in graph["adjacency"].get(code, [])
+    ]
+    return pd.DataFrame(rows)
+
+
+@lru_cache(maxsize=4096)
+def _shortest_path(version, source, target):
+    # `version` só entra na chave do cache: uma nova versão do catálogo
+    # invalida automaticamente os caminhos memorizados
+    adjacency = get_career_graph()[1]["adjacency"]
+    if source not in adjacency or target not in adjacency:
+        return None
+
+    previous = {source: None}
+    queue = deque([source])
+    while queue:
+        node = queue.popleft()
+        if node == target:
+            path = []
+            while node is not None:
+                path.append(node)
+                node = previous[node]
+            return tuple(reversed(path))
+        for neighbour, _ in adjacency[node]:
+            if neighbour not in previous:
+                previous[neighbour] = node
+                queue.append(neighbour)
+    return None
+
+
+def shortest_path(source, target):
+    """
+    Menor progressão (em número de passos) de `source` até `target`.
+    Retorna a lista de códigos do caminho ou None se não houver caminho.
+    Resultados ficam memorizados por versão do catálogo.
+    """
+    version, _ = get_career_graph()
+    path = _shortest_path(version, source, target)
+    return list(path) if path is not None else None
+
+
+def reachable_roles(code, max_steps):
+    """Todos os cargos alcançáveis em até `max_steps` passos, com a distância."""
+    _, graph = get_career_graph()
+    adjacency = graph["adjacency"]
+    if code not in adjacency:
+        return pd.DataFrame(columns=["Full Job Code", "steps"])
+
+    distance = {code: 0}
+    queue = deque([code])
+    while queue:
+        node = queue.popleft()
+        if distance[node] >= max_steps:
+            continue
+        for neighbour, _ in adjacency[node]:
+            if neighbour not in distance:
+                distance[neighbour] = distance[node] + 1
+                queue.append(neighbour)
+
+    rows = [
+        {"Full Job Code": target, "steps": steps, **_describe(graph, target)}
+        for target, steps in distance.items() if target != code
+    ]
+    if not rows:
+        return pd.DataFrame(columns=["Full Job Code", "steps"])
+    return pd.DataFrame(rows).sort_values(["steps", "Full Job Code"], ignore_index=True)
+
+
+def _describe(graph, code):
+    node = graph["nodes"].loc[code]
+    return {"Sub Job Family": node["sub"], "Career Band": node["band"], "Global Grade": int(node["grade"])}
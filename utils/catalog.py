@@ -0,0 +1,302 @@
+# utils/catalog.py
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from utils.instrumentation import span
+
+# =========================================================
+# LOCALIZAÇÃO DOS ARQUIVOS DO CATÁLOGO
+# =========================================================
+
+# JA_DATA_DIR aponta o app para outra pasta de dados (ex.: benchmarks)
+DATA_DIR = Path(os.environ.get("JA_DATA_DIR") or Path(__file__).resolve().parents[1] / "data")
+
+JOB_FAMILY_PATH = DATA_DIR / "Job Family.xlsx"
+JOB_PROFILE_PATH = DATA_DIR / "Job Profile.xlsx"
+LEVEL_STRUCTURE_PATH = DATA_DIR / "Level Structure.xlsx"
+GGS_FACTORS_PATH = DATA_DIR / "wtw_ggs_factors.json"
+
+SOURCES = {
+    "job_family": JOB_FAMILY_PATH,
+    "job_profile": JOB_PROFILE_PATH,
+    "level_structure": LEVEL_STRUCTURE_PATH,
+    "ggs_factors": GGS_FACTORS_PATH,
+}
+
+# =========================================================
+# CACHE COMPARTILHADO POR PROCESSO
+# =========================================================
+# Cada fonte é lida uma única vez por processo e o mesmo objeto é
+# devolvido para todas as sessões do Streamlit. Os DataFrames são
+# compartilhados: trate-os como somente leitura (use .copy() antes
+# de alterar qualquer valor).
+
+_lock = threading.RLock()
+_entries = {}
+_stats = {name: {"hits": 0, "misses": 0} for name in SOURCES}
+
+
+def file_digest(path):
+    """Calcula o SHA-1 do conteúdo do arquivo."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Tipos garantidos por tabela, independentemente da origem (Excel ou
+# snapshot). Global Grade pode vir como texto com zero à esquerda ("09").
+SCHEMAS = {
+    "job_profile": {"Global Grade": "int8"},
+    "level_structure": {"Global Grade": "int8"},
+}
+
+# Colunas de baixa cardinalidade (bands, famílias, códigos) guardadas
+# como categorical. As demais colunas de texto (descrições longas) ficam
+# como object com as strings internadas: textos repetidos em várias
+# linhas passam a ocupar memória uma única vez.
+CATEGORY_COLUMNS = {
+    "job_family": ["Job Family", "Sub Job Family"],
+    "job_profile": [
+        "Job Family",
+        "Sub Job Family",
+        "Generic Job Profile",
+        "Function Code",
+        "Discipline Code",
+        "Career Band Short",
+        "Career Level",
+        "Job Code short",
+        "Career Path",
+        "SIG Level Title",
+        "Competencies 1",
+        "Competencies 2",
+        "Competencies 3",
+    ],
+    "level_structure": ["Career Path", "Level", "Career Band", "Career Level"],
+}
+
+
+def _as_text(value):
+    if isinstance(value, str):
+        return sys.intern(value)
+    if pd.isna(value):
+        return value
+    return sys.intern(str(value))
+
+
+def _is_text(series):
+    return pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)
+
+
+def _apply_schema(name, df):
+    # Cabeçalhos com espaços sobrando no Excel (ex.: "Level ") e colunas
+    # totalmente vazias do range exportado
+    df.columns = [c.strip() if isinstance(c, str) else c for c in df.columns]
+    df = df.dropna(axis=1, how="all")
+
+    categories = CATEGORY_COLUMNS.get(name, [])
+    for column in df.columns:
+        if not _is_text(df[column]):
+            continue
+        # Células numéricas soltas em colunas de texto (ex.: 0 no lugar
+        # de descrição vazia) viram texto puro
+        values = df[column].astype(object).map(_as_text)
+        df[column] = values.astype("category") if column in categories else values
+
+    for column, dtype in SCHEMAS.get(name, {}).items():
+        if column not in df.columns or df[column].dtype == dtype:
+            continue
+        values = pd.to_numeric(df[column], errors="coerce")
+        df[column] = values.astype(dtype if values.notna().all() else dtype.capitalize())
+    return df
+
+
+def read_source(name, path):
+    """Lê a fonte original (Excel/JSON), já com os tipos de SCHEMAS aplicados."""
+    if path.suffix == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return _apply_schema(name, pd.read_excel(path))
+
+
+def _read(name, path, digest):
+    """
+    Usa o snapshot colunar quando ele corresponde ao hash atual da fonte;
+    senão lê o Excel/JSON e atualiza o snapshot para os próximos processos.
+    """
+    from utils import snapshot  # snapshot importa catalog (DATA_DIR, SOURCES)
+
+    with span(f"load:{name}:snapshot"):
+        value = snapshot.read_table(name, digest)
+        if value is not None and isinstance(value, pd.DataFrame):
+            value = _apply_schema(name, value)
+    if value is not None:
+        return value, "snapshot"
+
+    with span(f"load:{name}:source"):
+        value = read_source(name, path)
+        snapshot.try_write_table(name, value, digest, path)
+    return value, "source"
+
+
+def _load(name):
+    """
+    Devolve o conteúdo da fonte `name`, relendo o arquivo apenas quando
+    ele mudou. A verificação rápida usa mtime/tamanho; se eles mudarem,
+    o hash do conteúdo decide se é preciso reprocessar o arquivo.
+    """
+    path = SOURCES[name]
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _lock:
+        entry = _entries.get(name)
+
+        if entry is not None and entry["signature"] == signature:
+            _stats[name]["hits"] += 1
+            return entry["value"]
+
+        digest = file_digest(path)
+
+        if entry is not None and entry["digest"] == digest:
+            # Arquivo "tocado" sem alteração de conteúdo
+            entry["signature"] = signature
+            _stats[name]["hits"] += 1
+            return entry["value"]
+
+        value, origin = _read(name, path, digest)
+        _entries[name] = {
+            "signature": signature,
+            "digest": digest,
+            "value": value,
+            "origin": origin,
+            "loaded_at": time.time(),
+        }
+        _stats[name]["misses"] += 1
+        return value
+
+
+# =========================================================
+# API PÚBLICA
+# =========================================================
+
+def load_job_families():
+    """Carrega o Job Family.xlsx (cache compartilhado)."""
+    return _load("job_family")
+
+
+def load_job_profiles():
+    """Carrega o Job Profile.xlsx (cache compartilhado)."""
+    return _load("job_profile")
+
+
+def load_level_structure():
+    """Carrega o Level Structure.xlsx (cache compartilhado)."""
+    return _load("level_structure")
+
+
+def load_ggs_factors():
+    """Carrega o wtw_ggs_factors.json (cache compartilhado)."""
+    return _load("ggs_factors")
+
+
+def source_digest(name):
+    """Hash do conteúdo atualmente carregado para a fonte `name` (ou None)."""
+    with _lock:
+        entry = _entries.get(name)
+        return entry["digest"] if entry else None
+
+
+def cache_stats():
+    """
+    Retorna, por fonte, o número de hits/misses do cache, o hash do
+    conteúdo carregado, a origem da última leitura ("snapshot" ou
+    "source") e o instante em que ela ocorreu.
+    """
+    with _lock:
+        report = {}
+        for name in SOURCES:
+            entry = _entries.get(name)
+            report[name] = {
+                "hits": _stats[name]["hits"],
+                "misses": _stats[name]["misses"],
+                "digest": entry["digest"] if entry else None,
+                "origin": entry["origin"] if entry else None,
+                "loaded_at": entry["loaded_at"] if entry else None,
+            }
+        return report
+
+
+def _deep_bytes(series):
+    """Memória da coluna contando cada objeto Python uma única vez."""
+    if series.dtype != object:
+        return int(series.memory_usage(index=False, deep=True))
+    unique = {id(v): v for v in series.array}
+    return 8 * len(series) + sum(sys.getsizeof(v) for v in unique.values())
+
+
+def memory_report():
+    """
+    Memória ocupada por cada tabela carregada no cache: linhas, colunas,
+    bytes reais (strings internadas contadas uma vez) e detalhe por coluna.
+    """
+    with _lock:
+        loaded = {name: e["value"] for name, e in _entries.items() if isinstance(e["value"], pd.DataFrame)}
+
+    report = {}
+    for name, df in loaded.items():
+        columns = {str(col): _deep_bytes(df[col]) for col in df.columns}
+        report[name] = {
+            "rows": len(df),
+            "columns": len(df.columns),
+            "bytes": sum(columns.values()) + int(df.index.memory_usage(deep=True)),
+            "by_column": columns,
+        }
+    return report
+
+
+# =========================================================
+# VALORES DERIVADOS (índices, tabelas e grafos do catálogo)
+# =========================================================
+
+_derived = {}        # nome -> (versão das fontes, valor)
+_derived_locks = {}  # nome -> lock da construção
+
+
+def derived(name, build, sources=("job_profile",)):
+    """
+    Valor calculado a partir do catálogo, guardado no processo sob `name`
+    e refeito por `build()` só quando o conteúdo (hash) de alguma das
+    `sources` muda. Cada nome tem seu próprio lock: o mesmo valor nunca é
+    construído duas vezes ao mesmo tempo, e nomes diferentes podem ser
+    construídos em paralelo (ex.: aquecimento e páginas).
+    """
+    for source in sources:
+        _load(source)
+    version = tuple(source_digest(source) for source in sources)
+
+    with _lock:
+        lock = _derived_locks.setdefault(name, threading.Lock())
+    with lock:
+        cached = _derived.get(name)
+        if cached is None or cached[0] != version:
+            cached = (version, build())
+            _derived[name] = cached
+        return cached[1]
+
+
+def clear_cache():
+    """Descarta tudo o que foi carregado (útil em testes e manutenção)."""
+    with _lock:
+        _entries.clear()
+        for counters in _stats.values():
+            counters["hits"] = 0
+            counters["misses"] = 0
@@ -0,0 +1,174 @@
+# utils/duplicates.py
+"""
+Relatório de qualidade: Job Profiles quase duplicados.
+
+Os textos de cada perfil são quebrados em shingles (3-gramas de palavras),
+resumidos por assinaturas MinHash e agrupados por LSH (bandas da
+assinatura): só pares que caem no mesmo bucket são comparados, o que
+mantém o custo sub-quadrático mesmo em catálogos de 10k+ perfis. Os
+candidatos são confirmados pela similaridade de Jaccard exata contra o
+primeiro membro de cada bucket e reunidos em clusters (union-find).
+
+Uso:
+    python -m utils.duplicates [--threshold 0.8] [--output relatorio.csv]
+"""
+import argparse
+import re
+import zlib
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from utils import catalog
+
+# Campos comparados (concatenados)
+DUPLICATE_FIELDS = ["Job Profile", "Role Description", "Job Profile Description"]
+# Só compara perfis dentro do mesmo valor desta coluna (None = catálogo todo)
+DUPLICATE_BLOCK = "Global Grade"
+
+SHINGLE_SIZE = 3
+NUM_PERM = 128
+LSH_BANDS = 16  # 16 bandas × 8 linhas → limiar efetivo ≈ 0,7
+MERSENNE_PRIME = (1 << 31) - 1
+
+_TOKEN = re.compile(r"\w+")
+
+
+# =========================================================
+# SHINGLES E MINHASH
+# =========================================================
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Conjunto de hashes (crc32) dos n-gramas de palavras do texto normalizado."""
+    tokens = _TOKEN.findall(str(text).lower())
+    if len(tokens) < size:
+        tokens = tokens + [""] * (size - len(tokens))
+    return {
+        zlib.crc32(" ".join(tokens[i:i + size]).encode("utf-8"))
+        for i in range(len(tokens) - size + 1)
+    }
+
+
+def _permutations(num_perm=NUM_PERM, seed=13):
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+    b = rng.integers(0, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash(shingle_set, a, b):
+    """Assinatura MinHash (num_perm valores) de um conjunto de shingles."""
+    h = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set)) % MERSENNE_PRIME
+    return ((a[:, None] * h[None, :] + b[:, None]) % MERSENNE_PRIME).min(axis=1)
+
+
+def _jaccard(x, y):
+    return len(x & y) / len(x | y) if x or y else 1.0
+
+
+# =========================================================
+# DETECÇÃO
+# =========================================================
+
+def find_near_duplicates(df=None, threshold=0.8, fields=DUPLICATE_FIELDS, block=DUPLICATE_BLOCK):
+    """
+    Encontra clusters de perfis quase duplicados.
+
+    Retorna um dict com:
+      - pairs:    pares confirmados (código A, código B, jaccard)
+      - clusters: uma linha por perfil em cluster, com o id e o tamanho
+    """
+    df = df if df is not None else catalog.load_job_profiles()
+
+    text = df[fields[0]].astype(object).fillna("").astype(str)
+    for field in fields[1:]:
+        text = text + "\n" + df[field].astype(object).fillna("").astype(str)
+    normalized = text.str.lower().str.split().str.join(" ")
+    blocks = df[block].astype(object).to_numpy() if block else np.zeros(len(df), dtype=object)
+
+    # Textos idênticos (após normalização) no mesmo bloco são tratados uma
+    # única vez: o LSH roda apenas sobre os textos distintos
+    groups = defaultdict(list)
+    for pos, key in enumerate(zip(blocks, normalized)):
+        groups[key].append(pos)
+    keys = list(groups)
+
+    a, b = _permutations()
+    sets = [shingles(text) for _, text in keys]
+    rows_per_band = NUM_PERM // LSH_BANDS
+
+    buckets = defaultdict(list)
+    for i, (blk, _) in enumerate(keys):
+        signature = minhash(sets[i], a, b)
+        for band in range(LSH_BANDS):
+            chunk = signature[band * rows_per_band:(band + 1) * rows_per_band]
+            buckets[(blk, band, chunk.tobytes())].append(i)
+
+    # Union-find sobre as linhas do catálogo
+    parent = list(range(len(df)))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(x, y):
+        rx, ry = find(x), find(y)
+        if rx != ry:
+            parent[max(rx, ry)] = min(rx, ry)
+
+    codes = df["Full Job Code"].astype(object).to_numpy()
+    pairs = []
+
+    for members in groups.values():
+        for other in members[1:]:
+            union(members[0], other)
+            pairs.append((codes[members[0]], codes[other], 1.0))
+
+    # Cada bucket é verificado contra o seu primeiro membro (custo linear
+    # no tamanho do bucket); pares já ligados por outro caminho são pulados
+    for members in buckets.values():
+        head = groups[keys[members[0]]][0]
+        for i in members[1:]:
+            row = groups[keys[i]][0]
+            if find(head) == find(row):
+                continue
+            similarity = _jaccard(sets[members[0]], sets[i])
+            if similarity >= threshold:
+                union(head, row)
+                pairs.append((codes[head], codes[row], round(similarity, 4)))
+
+    roots = np.array([find(x) for x in range(len(df))])
+    sizes = pd.Series(roots).value_counts()
+    in_cluster = np.flatnonzero(sizes.reindex(roots).to_numpy() > 1)
+
+    clusters = df.iloc[in_cluster][
+        ["Full Job Code", "Job Profile", "Sub Job Family", "Global Grade"]
+    ].reset_index(drop=True)
+    clusters.insert(0, "cluster_size", sizes.reindex(roots[in_cluster]).to_numpy())
+    clusters.insert(0, "cluster", pd.factorize(roots[in_cluster])[0] + 1)
+    clusters = clusters.sort_values(["cluster", "Full Job Code"], ignore_index=True)
+
+    return {
+        "pairs": pd.DataFrame(pairs, columns=["code_a", "code_b", "jaccard"]),
+        "clusters": clusters,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Relatório de Job Profiles quase duplicados.")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Jaccard mínimo (0-1)")
+    parser.add_argument("--output", help="grava os clusters em CSV")
+    args = parser.parse_args()
+
+    report = find_near_duplicates(threshold=args.threshold)
+    clusters = report["clusters"]
+
+    print(f"{clusters['cluster'].nunique()} clusters, {len(clusters)} perfis, {len(report['pairs'])} pares")
+    if args.output:
+        clusters.to_csv(args.output, index=False)
+        print(f"Relatório gravado em {args.output}")
+    else:
+        print(clusters.head(30).to_string(index=False))
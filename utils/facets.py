@@ -0,0 +1,115 @@
+# utils/facets.py
+"""
+Filtros facetados sobre o catálogo de Job Profiles.
+
+Para cada valor de cada faceta é pré-calculado um bitset (int do Python,
+bit i = linha i do catálogo). Uma consulta combina os bitsets com OR
+dentro da mesma faceta e AND entre facetas, e as contagens por valor
+saem de popcounts — sem varrer o DataFrame novamente.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils import catalog
+from utils.instrumentation import timed
+
+FACET_COLUMNS = [
+    "Job Family",
+    "Sub Job Family",
+    "Career Band Short",
+    "Global Grade",
+    "Function Code",
+    "Discipline Code",
+]
+
+
+# =========================================================
+# BITSETS
+# =========================================================
+
+def _to_bitset(mask):
+    """Array booleano → int com o bit i ligado quando mask[i] é True."""
+    packed = np.packbits(mask, bitorder="little")
+    return int.from_bytes(packed.tobytes(), "little")
+
+
+def bitset_positions(bits, size):
+    """Int bitset → array com as posições das linhas selecionadas."""
+    n_bytes = (size + 7) // 8
+    raw = np.frombuffer(bits.to_bytes(n_bytes, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(raw, bitorder="little")[:size])
+
+
+@timed("build:facet_index")
+def build_facet_index(df, columns=FACET_COLUMNS):
+    """Um bitset por valor de cada faceta: {coluna: {valor: bitset}}."""
+    size = len(df)
+    facets = {}
+
+    for column in columns:
+        if column not in df.columns:
+            continue
+        codes, uniques = pd.factorize(df[column], sort=True)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+
+        values = {}
+        for code, value in enumerate(uniques.tolist()):
+            mask = np.zeros(size, dtype=bool)
+            mask[order[bounds[code]:bounds[code + 1]]] = True
+            values[value] = _to_bitset(mask)
+        facets[column] = values
+
+    return {"size": size, "all": (1 << size) - 1, "facets": facets}
+
+
+def get_facet_index():
+    """Índice de facetas do catálogo atual, refeito só quando o Job Profile muda."""
+    return catalog.derived("facets", lambda: build_facet_index(catalog.load_job_profiles()))
+
+
+# =========================================================
+# CONSULTA
+# =========================================================
+
+@timed("query:facets")
+def facet_query(selection, index=None):
+    """
+    Aplica os filtros `selection` ({coluna: [valores]}; listas vazias são
+    ignoradas) e retorna:
+      - rows:   posições das linhas que atendem a todos os filtros
+      - total:  quantidade dessas linhas
+      - counts: {coluna: {valor: n}} — para cada faceta, quantas linhas
+                restariam escolhendo aquele valor, mantendo os filtros
+                das demais facetas (contagem "drill-sideways")
+    """
+    index = index or get_facet_index()
+    facets = index["facets"]
+
+    masks = {}
+    for column, values in (selection or {}).items():
+        if column not in facets or not values:
+            continue
+        bits = 0
+        for value in values:
+            bits |= facets[column].get(value, 0)
+        masks[column] = bits
+
+    total_mask = index["all"]
+    for bits in masks.values():
+        total_mask &= bits
+
+    counts = {}
+    for column, values in facets.items():
+        others = index["all"]
+        for other, bits in masks.items():
+            if other != column:
+                others &= bits
+        counts[column] = {value: (bits & others).bit_count() for value, bits in values.items()}
+
+    return {
+        "rows": bitset_positions(total_mask, index["size"]),
+        "total": total_mask.bit_count(),
+        "counts": counts,
+    }
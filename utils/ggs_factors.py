@@ -1,13 +1,27 @@
-import json
-from pathlib import Path
 
-DATA_PATH = Path("job_architecture/data/wtw_ggs_factors.json")
+import numpy as np
+import pandas as pd
+
+from utils import catalog
+from utils.instrumentation import timed
+
+DATA_PATH = catalog.GGS_FACTORS_PATH
 
 
 def load_ggs_factors():
-    """Carrega os fatores GGS do JSON."""
-    with open(DATA_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """Carrega os fatores GGS do JSON (cache compartilhado)."""
+    return catalog.load_ggs_factors()
+
+
+# Níveis de carreira permitidos conforme o superior imediato
+SUPERVISOR_LEVELS = {
+    "Supervisor": ["U1", "U2", "P1", "P2"],
+    "Coordenador": ["P2", "P3", "P4"],
+    "Gerente": ["P3", "P4", "M1"],
+    "Diretor": ["M1", "M2"],
+    "Vice-presidente": ["M2", "M3"],
+    "Presidente / CEO": ["EX"]
+}
 
 
 def filter_levels_by_supervisor(superior):
@@ -16,16 +30,7 @@ def filter_levels_by_supervisor(superior):
     Define quais níveis de carreira podem aparecer conforme o superior imediato.
     """
 
-    mapping = {
-        "Supervisor": ["U1", "U2", "P1", "P2"],
-        "Coordenador": ["P2", "P3", "P4"],
-        "Gerente": ["P3", "P4", "M1"],
-        "Diretor": ["M1", "M2"],
-        "Vice-presidente": ["M2", "M3"],
-        "Presidente / CEO": ["EX"]
-    }
-
-    return mapping.get(superior, None)
+    return SUPERVISOR_LEVELS.get(superior, None)
 
 
 def map_factors_to_level(selected):
@@ -64,3 +69,229 @@ def map_factors_to_level(selected):
         "career_level": max(level_scores),
         "survey_grade": survey_grade
     }
+
+
+# =========================================================
+# AVALIAÇÃO EM LOTE (NumPy)
+# =========================================================
+
+
+def build_factor_encoding(factors):
+    """
+    Codifica os fatores GGS em arrays NumPy, um por fator, indexados pela
+    posição do nível dentro do fator:
+      - band:        índice da career band em `bands`
+      - level:       posição da career level em `levels` (ordem de texto,
+                     a mesma usada pelo max() de map_factors_to_level)
+      - grade_sum / grade_count: soma e quantidade de grades do range
+    """
+    bands = []
+    for content in factors.values():
+        for level in content["levels"].values():
+            if level["career_band"] not in bands:
+                bands.append(level["career_band"])
+
+    levels = sorted({
+        level["career_level"]
+        for content in factors.values()
+        for level in content["levels"].values()
+    })
+
+    encoding = {"bands": bands, "levels": levels, "factors": {}}
+
+    for name, content in factors.items():
+        items = list(content["levels"].values())
+        encoding["factors"][name] = {
+            "keys": list(content["levels"].keys()),
+            "band": np.array([bands.index(i["career_band"]) for i in items], dtype=np.int8),
+            "level": np.array([levels.index(i["career_level"]) for i in items], dtype=np.int8),
+            "grade_sum": np.array([sum(i["survey_grade_range"]) for i in items], dtype=np.int32),
+            "grade_count": np.array([len(i["survey_grade_range"]) for i in items], dtype=np.int32),
+        }
+
+    return encoding
+
+
+def get_factor_encoding():
+    """Codificação dos fatores atuais, refeita só quando o JSON muda."""
+    return catalog.derived(
+        "factor_encoding", lambda: build_factor_encoding(load_ggs_factors()), sources=("ggs_factors",)
+    )
+
+
+def evaluate_level_codes(codes, encoding, factor_names):
+    """
+    Núcleo vetorizado de map_factors_to_level.
+
+    `codes` é uma matriz N × F com a posição do nível escolhido em cada
+    fator (colunas na ordem de `factor_names`). Retorna três arrays de
+    tamanho N: índice da band dominante, posição da career level máxima
+    e survey grade médio arredondado.
+    """
+    codes = np.asarray(codes)
+    n, f = codes.shape
+    rows = np.arange(n)
+
+    band = np.empty((n, f), dtype=np.int8)
+    level = np.empty((n, f), dtype=np.int8)
+    grade_sum = np.zeros(n, dtype=np.int64)
+    grade_count = np.zeros(n, dtype=np.int64)
+
+    for j, name in enumerate(factor_names):
+        enc = encoding["factors"][name]
+        band[:, j] = enc["band"][codes[:, j]]
+        level[:, j] = enc["level"][codes[:, j]]
+        grade_sum += enc["grade_sum"][codes[:, j]]
+        grade_count += enc["grade_count"][codes[:, j]]
+
+    # Band dominante: maior contagem; no empate vence a band que aparece
+    # primeiro na seleção (mesmo critério do sorted estável original).
+    n_bands = len(encoding["bands"])
+    counts = np.zeros((n, n_bands), dtype=np.int16)
+    first_seen = np.full((n, n_bands), f, dtype=np.int16)
+    for j in range(f):
+        counts[rows, band[:, j]] += 1
+    for j in reversed(range(f)):
+        first_seen[rows, band[:, j]] = j
+
+    dominant = np.argmax(counts * (f + 1) - first_seen, axis=1)
+    max_level = level.max(axis=1)
+    survey_grade = np.round(grade_sum / grade_count).astype(np.int16)
+
+    return dominant, max_level, survey_grade
+
+
+def map_factors_to_level_batch(selections, factors=None):
+    """
+    Versão vetorizada de map_factors_to_level para N posições de uma vez.
+
+    `selections` é um DataFrame com uma coluna por fator GGS
+    (proficiencia, complexidade_problema, ...) contendo a chave do nível
+    escolhido (ex.: "avancado"). As colunas são avaliadas na ordem do
+    JSON de fatores. Retorna um DataFrame com career_band, career_level
+    e survey_grade, alinhado ao índice de `selections`.
+    """
+    encoding = build_factor_encoding(factors) if factors is not None else get_factor_encoding()
+
+    factor_names = [name for name in encoding["factors"] if name in selections.columns]
+    if not factor_names:
+        raise ValueError("Nenhuma coluna de fator GGS encontrada na tabela de seleções.")
+
+    codes = np.empty((len(selections), len(factor_names)), dtype=np.intp)
+    for j, name in enumerate(factor_names):
+        keys = encoding["factors"][name]["keys"]
+        column = pd.Categorical(selections[name], categories=keys).codes
+        if (column < 0).any():
+            invalid = sorted(set(selections[name][column < 0].astype(str)))
+            raise ValueError(f"Nível inválido para o fator '{name}': {', '.join(invalid)}")
+        codes[:, j] = column
+
+    dominant, max_level, survey_grade = evaluate_level_codes(codes, encoding, factor_names)
+
+    return pd.DataFrame(
+        {
+            "career_band": np.asarray(encoding["bands"], dtype=object)[dominant],
+            "career_level": np.asarray(encoding["levels"], dtype=object)[max_level],
+            "survey_grade": survey_grade,
+        },
+        index=selections.index,
+    )
+
+
+# =========================================================
+# TABELA EXAUSTIVA DE RESULTADOS (lookup O(1))
+# =========================================================
+# O espaço de seleções é pequeno (4 níveis ^ 5 fatores = 1024), então o
+# resultado de map_factors_to_level é pré-calculado para todas as
+# combinações. Cada seleção vira um índice em base mista:
+#   índice = Σ posição_do_nível[f] × peso[f],  peso[f] = Π radix[f+1:]
+
+
+@timed("build:outcome_table")
+def build_outcome_table(encoding):
+    """Avalia todas as combinações de níveis e guarda o resultado em arrays compactos."""
+    names = list(encoding["factors"])
+    radix = [len(encoding["factors"][name]["keys"]) for name in names]
+    weights = [int(np.prod(radix[j + 1:], dtype=np.int64)) for j in range(len(radix))]
+
+    codes = np.indices(radix).reshape(len(radix), -1).T
+    dominant, max_level, survey_grade = evaluate_level_codes(codes, encoding, names)
+
+    return {
+        "factors": names,
+        "radix": radix,
+        "weights": weights,
+        "positions": [
+            {key: pos for pos, key in enumerate(encoding["factors"][name]["keys"])}
+            for name in names
+        ],
+        "bands": encoding["bands"],
+        "levels": encoding["levels"],
+        "band": dominant.astype(np.int8),
+        "level": max_level.astype(np.int8),
+        "grade": survey_grade,
+        # Mesmo resultado já em tipos Python, para o lookup escalar
+        "outcomes": [
+            (encoding["bands"][band], encoding["levels"][level], int(grade))
+            for band, level, grade in zip(dominant.tolist(), max_level.tolist(), survey_grade.tolist())
+        ],
+    }
+
+
+def get_outcome_table():
+    """Tabela de resultados dos fatores atuais, refeita só quando o JSON muda."""
+    return catalog.derived(
+        "outcome_table", lambda: build_outcome_table(get_factor_encoding()), sources=("ggs_factors",)
+    )
+
+
+# Tabela em uso no caminho quente (lookup_outcome), com o hash do JSON
+# de onde veio
+_table_state = None
+
+
+def _current_table():
+    """
+    Tabela atual com uma única conferência barata: o hash do JSON já
+    carregado no catálogo. A releitura do arquivo (os.stat, hash) segue o
+    cache do catálogo, que as páginas e a API atualizam a cada rerun /
+    requisição; só quando o hash muda a tabela é buscada de novo.
+    """
+    global _table_state
+    digest = catalog.source_digest("ggs_factors")
+    state = _table_state
+    if digest is None or state is None or state[0] != digest:
+        table = get_outcome_table()
+        state = (catalog.source_digest("ggs_factors"), table)
+        _table_state = state
+    return state[1]
+
+
+def encode_selection(selection, table=None):
+    """
+    Converte {fator: chave_do_nível} no índice em base mista da tabela.
+    Todos os fatores do JSON precisam estar presentes.
+    """
+    table = table or _current_table()
+
+    code = 0
+    for name, weight, positions in zip(table["factors"], table["weights"], table["positions"]):
+        if name not in selection:
+            raise KeyError(f"Fator GGS ausente na seleção: '{name}'")
+        pos = positions.get(selection[name])
+        if pos is None:
+            raise ValueError(f"Nível inválido para o fator '{name}': {selection[name]}")
+        code += pos * weight
+    return code
+
+
+@timed("match:lookup_outcome")
+def lookup_outcome(selection, table=None):
+    """
+    Resultado de map_factors_to_level para {fator: chave_do_nível}
+    com uma única leitura na tabela pré-calculada. Laços longos podem
+    passar `table` (get_outcome_table()) e pular até a conferência.
+    """
+    table = table or _current_table()
+    band, level, grade = table["outcomes"][encode_selection(selection, table)]
+    return {"career_band": band, "career_level": level, "survey_grade": grade}
@@ -0,0 +1,276 @@
+# utils/instrumentation.py
+"""
+Instrumentação das páginas: spans de tempo, agregados por página e
+painel de depuração.
+
+Cada rerun de uma página é uma "execução": sidebar_logo_and_title abre a
+execução (start_page) e a página a fecha no final (finish_page). Dentro
+dela, span()/timed() medem carregamentos, construção de índices, match e
+blocos de renderização. Ao fechar, a execução:
+  - entra nos agregados da página (p50/p95 por span, últimas N execuções);
+  - vira uma linha em logs/perf.jsonl;
+  - aparece no painel "Desempenho" da sidebar.
+
+Desligado por padrão (span vira no-op). Liga com JA_PERF=1 no ambiente
+ou ?perf=1 na URL. O cProfile de cada rerun (logs/profiles/) só existe
+com JA_PERF=profile no servidor: aí ?perf=profile também o liga por
+sessão; sem o ambiente, a URL fica no modo "on". O JSONL é rotacionado
+em LOG_MAX_BYTES e só os PROFILE_KEEP .prof mais recentes são mantidos.
+"""
+import cProfile
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from pathlib import Path
+
+# numpy/pandas só são importados nos agregados e no painel: as páginas
+# importam este módulo antes de qualquer dependência pesada
+
+LOG_DIR = Path(__file__).resolve().parents[1] / "logs"
+LOG_PATH = LOG_DIR / "perf.jsonl"
+PROFILE_DIR = LOG_DIR / "profiles"
+
+# Execuções guardadas por página para os percentis
+HISTORY_SIZE = 200
+
+# perf.jsonl passa para perf.jsonl.1 (substituindo o anterior) ao
+# atingir este tamanho; de logs/profiles/ ficam só os mais recentes
+LOG_MAX_BYTES = 10 * 2**20
+PROFILE_KEEP = 50
+
+_lock = threading.Lock()
+_history = defaultdict(lambda: defaultdict(lambda: deque(maxlen=HISTORY_SIZE)))
+_local = threading.local()
+
+
+# =========================================================
+# MODO
+# =========================================================
+
+def _mode_from_query():
+    try:
+        import streamlit as st
+
+        return st.query_params.get("perf")
+    except Exception:  # noqa: BLE001 - fora do Streamlit
+        return None
+
+
+def _normalize_mode(value):
+    value = (value or "").strip().lower()
+    if value in ("", "0", "false", "off"):
+        return None
+    return "profile" if value == "profile" else "on"
+
+
+def perf_mode():
+    """
+    None (desligado), "on" ou "profile". A URL escolhe o modo da sessão,
+    mas "profile" só vale se o servidor tiver JA_PERF=profile.
+    """
+    allowed = _normalize_mode(os.environ.get("JA_PERF"))
+    query = _mode_from_query()
+    mode = _normalize_mode(query) if query is not None else allowed
+    if mode == "profile" and allowed != "profile":
+        return "on"
+    return mode
+
+
+# =========================================================
+# SPANS
+# =========================================================
+
+def _current():
+    return getattr(_local, "run", None)
+
+
+@contextmanager
+def span(name):
+    """Mede o bloco e registra na execução atual (no-op se desligado)."""
+    run = _current()
+    if run is None:
+        yield
+        return
+
+    run["depth"] += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1000
+        run["depth"] -= 1
+        run["spans"].append({"name": name, "ms": round(elapsed, 3), "depth": run["depth"]})
+
+
+def timed(name):
+    """Decorator: a função inteira vira um span."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current() is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# =========================================================
+# EXECUÇÕES (uma por rerun de página)
+# =========================================================
+
+def start_page(page=None):
+    """
+    Abre a execução da página atual. Sem `page`, usa o nome do script que
+    chamou sidebar_logo_and_title. Uma execução anterior não fechada
+    (st.stop, exceção) é encerrada aqui.
+    """
+    if _current() is not None:
+        finish_page(render_panel=False)
+
+    mode = perf_mode()
+    if mode is None:
+        return
+
+    if page is None:
+        page = _caller_page()
+
+    run = {"page": page, "mode": mode, "start": time.perf_counter(), "spans": [], "depth": 0}
+    if mode == "profile":
+        run["profiler"] = cProfile.Profile()
+        run["profiler"].enable()
+    _local.run = run
+
+
+def _caller_page():
+    # Primeiro frame fora de utils/: o script da página
+    here = Path(__file__).resolve().parent
+    for frame in inspect.stack()[2:]:
+        path = Path(frame.filename).resolve()
+        if path.parent != here:
+            return path.stem
+    return "?"
+
+
+def finish_page(render_panel=True):
+    """Fecha a execução: agrega, grava no JSONL e mostra o painel (se ligado)."""
+    run = _current()
+    if run is None:
+        return
+    _local.run = None
+
+    total = round((time.perf_counter() - run["start"]) * 1000, 3)
+    record = {"ts": time.time(), "page": run["page"], "total_ms": total, "spans": run["spans"]}
+
+    with _lock:
+        history = _history[run["page"]]
+        history["total"].append(total)
+        for item in run["spans"]:
+            history[item["name"]].append(item["ms"])
+
+    _append_log(record)
+
+    if run.get("profiler") is not None:
+        run["profiler"].disable()
+        _dump_profile(run["profiler"], run["page"])
+
+    if render_panel:
+        render_debug_panel(record)
+
+
+def _append_log(record):
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    try:
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+        with _lock:
+            try:
+                if LOG_PATH.stat().st_size + len(line) > LOG_MAX_BYTES:
+                    os.replace(LOG_PATH, LOG_PATH.with_name(LOG_PATH.name + ".1"))
+            except FileNotFoundError:
+                pass
+            with open(LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(line)
+    except OSError:
+        pass  # log é auxiliar: diretório somente leitura não derruba a página
+
+
+def _dump_profile(profiler, page):
+    try:
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(PROFILE_DIR / f"{page}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.prof")
+        profiles = sorted(PROFILE_DIR.glob("*.prof"), key=lambda path: path.stat().st_mtime_ns)
+        for old in profiles[:-PROFILE_KEEP]:
+            old.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+# =========================================================
+# AGREGADOS E PAINEL
+# =========================================================
+
+def page_stats(page=None):
+    """
+    Percentis por página e span (p50/p95 em ms, nas últimas HISTORY_SIZE
+    execuções). Retorna um DataFrame com page, span, runs, p50_ms, p95_ms.
+    """
+    import numpy as np
+    import pandas as pd
+
+    with _lock:
+        items = [
+            (name, span_name, list(values))
+            for name, spans in _history.items() if page in (None, name)
+            for span_name, values in spans.items()
+        ]
+
+    rows = [
+        {
+            "page": name,
+            "span": span_name,
+            "runs": len(values),
+            "p50_ms": round(float(np.percentile(values, 50)), 2),
+            "p95_ms": round(float(np.percentile(values, 95)), 2),
+        }
+        for name, span_name, values in items if values
+    ]
+    columns = ["page", "span", "runs", "p50_ms", "p95_ms"]
+    return pd.DataFrame(rows, columns=columns).sort_values(["page", "p95_ms"], ascending=[True, False], ignore_index=True)
+
+
+def read_log(path=None):
+    """Spans de todas as execuções gravadas no JSONL (uma linha por span)."""
+    import pandas as pd
+
+    rows = []
+    try:
+        with open(path or LOG_PATH, "r", encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                rows.append({"ts": record["ts"], "page": record["page"], "span": "total", "ms": record["total_ms"]})
+                rows.extend(
+                    {"ts": record["ts"], "page": record["page"], "span": s["name"], "ms": s["ms"]}
+                    for s in record["spans"]
+                )
+    except (OSError, ValueError):
+        pass
+    return pd.DataFrame(rows, columns=["ts", "page", "span", "ms"])
+
+
+def render_debug_panel(record):
+    """Painel "Desempenho" na sidebar: spans deste rerun e p50/p95 da página."""
+    import pandas as pd
+    import streamlit as st
+
+    with st.sidebar.expander("Desempenho", expanded=False):
+        st.caption(f"{record['page']}: {record['total_ms']:.0f} ms neste rerun")
+        if record["spans"]:
+            spans = pd.DataFrame(record["spans"])
+            spans["name"] = ["· " * d + n for d, n in zip(spans["depth"], spans["name"])]
+            st.dataframe(spans[["name", "ms"]], hide_index=True, use_container_width=True)
+        st.dataframe(page_stats(record["page"]).drop(columns="page"), hide_index=True, use_container_width=True)
@@ -1,37 +1,215 @@
+import re
+
+import numpy as np
 import pandas as pd
-from pathlib import Path
 
-PROFILE_PATH = Path("job_architecture/data/Job Profile.xlsx")
+from utils import catalog
+from utils.instrumentation import timed
+
+PROFILE_PATH = catalog.JOB_PROFILE_PATH
+
+# Colunas do Job Profile.xlsx usadas como chave do match
+BAND_COLUMN = "Career Band Short"
+LEVEL_COLUMN = "Career Level"
+GRADE_COLUMN = "Global Grade"
 
 
 def load_profiles():
-    """Carrega o catálogo completo de cargos."""
-    return pd.read_excel(PROFILE_PATH)
+    """Carrega o catálogo completo de cargos (cache compartilhado)."""
+    return catalog.load_job_profiles()
+
+
+# =========================================================
+# ÍNDICE (CareerBand, CareerLevel, Grade)
+# =========================================================
+
+def _grade_key(value):
+    if value is None or pd.isna(value):
+        return None
+    return int(value)
+
+
+@timed("build:profile_index")
+def build_profile_index(df):
+    """
+    Monta o índice hierárquico do catálogo. Cada nível guarda a posição
+    da PRIMEIRA linha com aquela chave, preservando o resultado do antigo
+    df_match.iloc[0]:
+      - exact:      (band, level, grade) -> posição
+      - band_level: (band, level)        -> posição
+      - band:       band                 -> posição
+    """
+    index = {
+        "records": df.to_dict("records"),
+        "exact": {},
+        "band_level": {},
+        "band": {},
+    }
+
+    rows = zip(df[BAND_COLUMN], df[LEVEL_COLUMN], df[GRADE_COLUMN])
+    for pos, (band, level, grade) in enumerate(rows):
+        index["exact"].setdefault((band, level, _grade_key(grade)), pos)
+        index["band_level"].setdefault((band, level), pos)
+        index["band"].setdefault(band, pos)
+
+    return index
 
 
+def get_profile_index():
+    """Índice do catálogo atual, reconstruído só quando o Job Profile muda."""
+    return catalog.derived("profile_index", lambda: build_profile_index(load_profiles()))
+
+
+def _lookup(index, career_band, career_level, survey_grade):
+    """Mesma ordem de fallback do match: band+level+grade → band+level → band."""
+    pos = index["exact"].get((career_band, career_level, _grade_key(survey_grade)))
+    if pos is None:
+        pos = index["band_level"].get((career_band, career_level))
+    if pos is None:
+        pos = index["band"].get(career_band)
+    if pos is None:
+        return None
+    return dict(index["records"][pos])
+
+
+# =========================================================
+# MATCH
+# =========================================================
+
+@timed("match:find_best_job_profile")
 def find_best_job_profile(career_band, career_level, survey_grade):
     """
     Procura no Job Profile.xlsx o cargo mais compatível.
     """
 
-    df = load_profiles()
+    return _lookup(get_profile_index(), career_band, career_level, survey_grade)
+
+
+def find_best_job_profiles(batch):
+    """
+    Versão em lote de find_best_job_profile.
 
-    df_match = df[
-        (df["CareerBand"] == career_band) &
-        (df["CareerLevel"] == career_level) &
-        (df["Grade"] == survey_grade)
-    ]
+    `batch` pode ser um DataFrame com as colunas career_band, career_level
+    e survey_grade, uma lista de dicts com essas chaves (como os devolvidos
+    por map_factors_to_level) ou uma lista de tuplas (band, level, grade).
+    Retorna uma lista, na mesma ordem, com o cargo encontrado ou None.
+    """
 
-    if df_match.empty:
-        df_match = df[
-            (df["CareerBand"] == career_band) &
-            (df["CareerLevel"] == career_level)
-        ]
+    index = get_profile_index()
 
-    if df_match.empty:
-        df_match = df[df["CareerBand"] == career_band]
+    if isinstance(batch, pd.DataFrame):
+        queries = zip(batch["career_band"], batch["career_level"], batch["survey_grade"])
+    else:
+        queries = (
+            (q["career_band"], q["career_level"], q["survey_grade"]) if isinstance(q, dict) else q
+            for q in batch
+        )
 
-    if df_match.empty:
-        return None
+    return [_lookup(index, band, level, grade) for band, level, grade in queries]
+
+
+# =========================================================
+# RANKING TOP-K (distância vetorizada sobre todo o catálogo)
+# =========================================================
+# Cada Job Profile vira um vetor numérico (band, número do career level,
+# Global Grade). Cada fator GGS selecionado define um alvo com a band,
+# o career level e o centro do survey_grade_range do nível escolhido.
+# A distância de um cargo a um fator é:
+#   |grade - centro| + RANK_WEIGHTS["band"] * (band diferente)
+#                    + RANK_WEIGHTS["level"] * |nível - nível alvo| (mesma band)
+# e a distância total é a soma sobre os fatores. Empates são desfeitos
+# pela ordem das linhas no catálogo, então o ranking é determinístico.
+
+RANK_WEIGHTS = {"band": 3.0, "level": 1.0, "grade": 1.0}
+
+_LEVEL_NUMBER = re.compile(r"(\d+)")
+
+
+def _level_number(career_level):
+    match = _LEVEL_NUMBER.search(str(career_level))
+    return int(match.group(1)) if match else 0
+
+
+@timed("build:profile_vectors")
+def build_profile_vectors(df):
+    """Codifica o catálogo uma vez: arrays de band, nível e grade por linha."""
+    bands = {band: code for code, band in enumerate(pd.unique(df[BAND_COLUMN]))}
+    return {
+        "bands": bands,
+        "band": np.array([bands[b] for b in df[BAND_COLUMN]], dtype=np.int16),
+        "level": np.array([_level_number(l) for l in df[LEVEL_COLUMN]], dtype=np.float32),
+        "grade": df[GRADE_COLUMN].to_numpy(dtype=np.float32, na_value=np.nan),
+    }
+
+
+def get_profile_vectors():
+    """Vetores do catálogo atual, reconstruídos só quando o Job Profile muda."""
+    return catalog.derived("profile_vectors", lambda: build_profile_vectors(load_profiles()))
+
+
+def _factor_targets(selection, factors, vectors):
+    """Alvos (band, nível, centro do grade) de cada fator selecionado."""
+    names = [name for name in factors if name in selection]
+    band = np.array(
+        [vectors["bands"].get(factors[n]["levels"][selection[n]]["career_band"], -1) for n in names],
+        dtype=np.int16,
+    )
+    level = np.array(
+        [_level_number(factors[n]["levels"][selection[n]]["career_level"]) for n in names],
+        dtype=np.float32,
+    )
+    grade = np.array(
+        [np.mean(factors[n]["levels"][selection[n]]["survey_grade_range"]) for n in names],
+        dtype=np.float32,
+    )
+    return names, band, level, grade
+
+
+def score_profiles(selection, factors=None):
+    """
+    Distância de todos os cargos do catálogo para a seleção de fatores.
+    Retorna (nomes_dos_fatores, matriz F × N de distâncias por fator).
+    """
+    factors = factors if factors is not None else catalog.load_ggs_factors()
+    vectors = get_profile_vectors()
+    names, t_band, t_level, t_grade = _factor_targets(selection, factors, vectors)
+
+    same_band = vectors["band"][None, :] == t_band[:, None]
+    distances = (
+        RANK_WEIGHTS["grade"] * np.abs(vectors["grade"][None, :] - t_grade[:, None])
+        + RANK_WEIGHTS["band"] * ~same_band
+        + RANK_WEIGHTS["level"] * np.abs(vectors["level"][None, :] - t_level[:, None]) * same_band
+    )
+    return names, np.nan_to_num(distances, nan=np.inf)
+
+
+@timed("match:rank_job_profiles")
+def rank_job_profiles(selection, k=5, factors=None):
+    """
+    Top-k cargos mais próximos da seleção {fator: chave_do_nível}.
+
+    Retorna um DataFrame com as colunas de identificação do cargo, a
+    distância total, o rank e uma coluna `dist_<fator>` por fator com a
+    contribuição de cada um.
+    """
+    df = load_profiles()
+    names, distances = score_profiles(selection, factors)
+    total = distances.sum(axis=0)
+
+    k = min(k, len(total))
+    if k <= 0:
+        return pd.DataFrame()
+
+    candidates = np.argpartition(total, k - 1)[:k] if k < len(total) else np.arange(len(total))
+    # Inclui todos os empatados com o k-ésimo para desempatar pela ordem do catálogo
+    candidates = np.flatnonzero(total <= total[candidates].max())
+    top = candidates[np.lexsort((candidates, total[candidates]))][:k]
 
-    return df_match.iloc[0].to_dict()
+    result = df.iloc[top][
+        ["Full Job Code", "Job Profile", BAND_COLUMN, LEVEL_COLUMN, GRADE_COLUMN]
+    ].reset_index(drop=True)
+    result.insert(0, "rank", np.arange(1, len(top) + 1))
+    result["distance"] = total[top].round(2)
+    for j, name in enumerate(names):
+        result[f"dist_{name}"] = distances[j, top].round(2)
+    return result
@@ -0,0 +1,123 @@
+# utils/org_chart.py
+"""
+Validação vetorizada de linhas de reporte de um organograma inteiro.
+
+Recebe um extrato do HRIS com uma linha por colaborador (employee,
+position = Full Job Code, manager = employee do gestor e, opcionalmente,
+o título hierárquico do gestor) e, em uma única passada com joins em
+arrays, aponta:
+  - grade_not_below_manager: Global Grade do cargo >= grade de reporte
+    (NIVEIS_HIERARQUICOS pelo título do gestor; na falta dele, o Global
+    Grade do cargo do próprio gestor);
+  - level_not_allowed: career level fora dos níveis permitidos para o
+    superior imediato (SUPERVISOR_LEVELS);
+  - unknown_position / unknown_manager: cargo fora do catálogo ou gestor
+    sem grade de reporte resolvível;
+  - duplicate_employee: o mesmo employee em mais de uma linha do extrato
+    (o gestor é resolvido pela primeira delas).
+"""
+import numpy as np
+import pandas as pd
+
+from logica_cargos import NIVEIS_HIERARQUICOS, normalizar_cargo
+from utils import catalog
+from utils.ggs_factors import SUPERVISOR_LEVELS
+
+VIOLATIONS = [
+    "grade_not_below_manager",
+    "level_not_allowed",
+    "unknown_position",
+    "unknown_manager",
+    "duplicate_employee",
+]
+
+
+def _normalize_titles(titles):
+    """Versão vetorizada de normalizar_cargo."""
+    return (
+        titles.astype(object).fillna("").astype(str)
+        .str.upper().str.replace(" ", "_", regex=False).str.replace("/", "_", regex=False)
+    )
+
+
+def validate_org_chart(
+    edges,
+    employee="employee",
+    position="position",
+    manager="manager",
+    manager_title="manager_title",
+    profiles=None,
+):
+    """
+    Valida todas as linhas de reporte de `edges` contra o catálogo.
+
+    Retorna um dict com:
+      - edges:      `edges` enriquecido com grade, career_level,
+                    reporting_grade e uma coluna booleana por violação
+      - violations: uma linha por (colaborador, violação)
+      - summary:    contagem por tipo de violação
+    """
+    profiles = profiles if profiles is not None else catalog.load_job_profiles()
+
+    # 1. Cargo → Global Grade / Career Level (join por Full Job Code)
+    codes = pd.Index(profiles["Full Job Code"].astype(object))
+    pos = codes.get_indexer(edges[position].astype(object))
+    known_position = pos >= 0
+
+    grades = profiles["Global Grade"].to_numpy(dtype=np.float64)
+    levels = profiles["Career Level"].astype(object).to_numpy()
+
+    grade = np.where(known_position, grades[pos], np.nan)
+    level = np.where(known_position, levels[pos], None)
+
+    # 2. Gestor → grade do cargo do gestor (self-join employee). O join
+    #    usa só a primeira linha de cada employee; as repetidas viram
+    #    violação em vez de quebrar o get_indexer
+    employees = pd.Index(edges[employee])
+    duplicated = employees.duplicated(keep=False) & employees.notna()
+    first = ~employees.duplicated(keep="first")
+    manager_row = employees[first].get_indexer(edges[manager])
+    manager_row = np.where(manager_row >= 0, np.flatnonzero(first)[manager_row], -1)
+    manager_grade = np.where(manager_row >= 0, grade[manager_row], np.nan)
+
+    # 3. Grade de reporte: GG mínimo do título (NIVEIS_HIERARQUICOS) ou,
+    #    se não houver título mapeado, o grade do cargo do gestor
+    if manager_title in edges.columns:
+        titles = _normalize_titles(edges[manager_title])
+        title_grade = titles.map(NIVEIS_HIERARQUICOS).to_numpy(dtype=np.float64)
+    else:
+        titles = pd.Series("", index=edges.index)
+        title_grade = np.full(len(edges), np.nan)
+    reporting_grade = np.where(np.isnan(title_grade), manager_grade, title_grade)
+
+    # 4. Níveis permitidos para o superior imediato
+    allowed = pd.MultiIndex.from_tuples(
+        [(normalizar_cargo(sup), lvl) for sup, lvls in SUPERVISOR_LEVELS.items() for lvl in lvls]
+    )
+    mapped_title = titles.isin(allowed.get_level_values(0)).to_numpy()
+    level_ok = pd.MultiIndex.from_arrays([titles.to_numpy(), level]).isin(allowed)
+
+    result = edges.copy()
+    result["grade"] = grade
+    result["career_level"] = level
+    result["reporting_grade"] = reporting_grade
+    result["unknown_position"] = ~known_position
+    result["unknown_manager"] = edges[manager].notna().to_numpy() & np.isnan(reporting_grade)
+    result["grade_not_below_manager"] = known_position & ~np.isnan(reporting_grade) & (grade >= reporting_grade)
+    result["level_not_allowed"] = known_position & mapped_title & ~level_ok
+    result["duplicate_employee"] = duplicated
+
+    # 5. Relatório: uma linha por violação + resumo
+    flags = result[VIOLATIONS]
+    rows, kinds = np.nonzero(flags.to_numpy())
+    violations = result.drop(columns=VIOLATIONS).iloc[rows].reset_index(drop=True)
+    violations["violation"] = np.asarray(VIOLATIONS, dtype=object)[kinds]
+
+    summary = pd.DataFrame({
+        "violation": VIOLATIONS,
+        "count": [int(flags[v].sum()) for v in VIOLATIONS],
+    })
+    summary.loc[len(summary)] = ["edges_checked", len(result)]
+    summary.loc[len(summary)] = ["edges_with_violation", int(flags.any(axis=1).sum())]
+
+    return {"edges": result, "violations": violations, "summary": summary}
@@ -0,0 +1,234 @@
+# utils/pdf_export.py
+"""
+Exportação de Job Profiles em PDF (um cargo, uma Job Family ou o
+catálogo inteiro).
+
+Fontes (assets/fonts/PPSIGFlow-*.ttf), estilos e o logo do cabeçalho
+são carregados uma única vez por processo. No ZIP, os perfis são
+renderizados em um pool de processos, em lotes, e cada PDF é gravado no
+arquivo assim que fica pronto; o PDF único é montado em um só documento.
+Em ambos os casos a saída vai para um arquivo temporário (em disco a
+partir de alguns MB), não para a memória.
+"""
+import io
+import os
+import re
+import tempfile
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from utils import catalog
+
+ASSETS_DIR = Path(__file__).resolve().parents[1] / "assets"
+FONT_REGULAR_PATH = ASSETS_DIR / "fonts" / "PPSIGFlow-Regular.ttf"
+FONT_SEMIBOLD_PATH = ASSETS_DIR / "fonts" / "PPSIGFlow-SemiBold.ttf"
+LOGO_PATH = ASSETS_DIR / "SIG_Logo_RGB_Black.png"
+
+# Mesmas seções exibidas em pages/3_Job_Profile_Description.py
+PDF_SECTIONS = [
+    ("Missão do Cargo", "Job Profile Description"),
+    ("Principais Responsabilidades", "Role Description"),
+    ("Competências e Requisitos", "Qualifications"),
+    ("Diferencial de Grade", "Grade Differentiator"),
+]
+
+# Perfis enviados a cada processo por vez
+RENDER_BATCH = 25
+# Acima deste tamanho o arquivo temporário vai para o disco
+SPOOL_LIMIT = 16 * 1024 * 1024
+
+ACCENT = "#145efc"
+LOGO_WIDTH, LOGO_HEIGHT = 60, 20
+
+
+# =========================================================
+# FONTES E ESTILOS (uma vez por processo)
+# =========================================================
+
+@lru_cache(maxsize=1)
+def _fonts():
+    """Registra as fontes PP SIG Flow; sem os arquivos, usa Helvetica."""
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    try:
+        pdfmetrics.registerFont(TTFont("PPSIGFlow", str(FONT_REGULAR_PATH)))
+        pdfmetrics.registerFont(TTFont("PPSIGFlow-SemiBold", str(FONT_SEMIBOLD_PATH)))
+        return "PPSIGFlow", "PPSIGFlow-SemiBold"
+    except Exception:  # noqa: BLE001 - fonte ausente/corrompida
+        return "Helvetica", "Helvetica-Bold"
+
+
+@lru_cache(maxsize=1)
+def _styles():
+    from reportlab.lib.colors import HexColor
+    from reportlab.lib.styles import ParagraphStyle
+
+    regular, bold = _fonts()
+    return {
+        "title": ParagraphStyle("title", fontName=bold, fontSize=18, leading=22, spaceAfter=4),
+        "meta": ParagraphStyle("meta", fontName=regular, fontSize=9, leading=12,
+                               textColor=HexColor("#555555"), spaceAfter=10),
+        "heading": ParagraphStyle("heading", fontName=bold, fontSize=12, leading=15,
+                                  textColor=HexColor(ACCENT), spaceBefore=10, spaceAfter=4),
+        "body": ParagraphStyle("body", fontName=regular, fontSize=10, leading=14),
+        "footer_font": regular,
+    }
+
+
+@lru_cache(maxsize=1)
+def _logo():
+    """Logo reduzido uma única vez para o tamanho impresso (a codificação
+    da imagem original em cada página domina o tempo de renderização)."""
+    from PIL import Image
+    from reportlab.lib.utils import ImageReader
+
+    try:
+        image = Image.open(LOGO_PATH)
+        image.thumbnail((LOGO_WIDTH * 3, LOGO_HEIGHT * 3))
+        return ImageReader(image)
+    except Exception:  # noqa: BLE001 - logo é opcional
+        return None
+
+
+def _draw_page(canvas, doc):
+    """Template das páginas: logo no topo e rodapé com o número da página."""
+    from reportlab.lib.pagesizes import A4
+
+    width, height = A4
+    canvas.saveState()
+    logo = _logo()
+    if logo is not None:
+        canvas.drawImage(logo, doc.leftMargin, height - 40, width=LOGO_WIDTH, height=LOGO_HEIGHT,
+                         preserveAspectRatio=True, anchor="sw", mask="auto")
+    canvas.setFont(_styles()["footer_font"], 8)
+    canvas.drawRightString(width - doc.rightMargin, 20, f"Job Architecture · página {doc.page}")
+    canvas.restoreState()
+
+
+# =========================================================
+# RENDERIZAÇÃO
+# =========================================================
+
+def _text(value):
+    """Texto do catálogo → markup de Paragraph (escapado, quebras preservadas)."""
+    if value is None or value != value or str(value).strip() == "":
+        return "Informação não cadastrada"
+    return escape(str(value).strip()).replace("\n", "<br/>")
+
+
+def profile_story(record):
+    """Flowables de um perfil (título, identificação e seções)."""
+    from reportlab.platypus import Paragraph
+
+    styles = _styles()
+    meta = " · ".join(
+        _text(record.get(column)) for column in
+        ["Full Job Code", "Job Family", "Sub Job Family", "Career Band Short", "Career Level"]
+    ) + f" · GG {_text(record.get('Global Grade'))}"
+
+    story = [
+        Paragraph(_text(record.get("Job Profile")), styles["title"]),
+        Paragraph(meta, styles["meta"]),
+    ]
+    for title, column in PDF_SECTIONS:
+        story.append(Paragraph(title, styles["heading"]))
+        story.append(Paragraph(_text(record.get(column)), styles["body"]))
+    return story
+
+
+def _document(target, title):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate
+
+    return SimpleDocTemplate(
+        target, pagesize=A4, title=title,
+        leftMargin=50, rightMargin=50, topMargin=60, bottomMargin=40,
+    )
+
+
+def render_profile_pdf(record):
+    """PDF (bytes) de um único perfil."""
+    buffer = io.BytesIO()
+    _document(buffer, str(record.get("Job Profile", ""))).build(
+        profile_story(record), onFirstPage=_draw_page, onLaterPages=_draw_page
+    )
+    return buffer.getvalue()
+
+
+def pdf_filename(record):
+    name = re.sub(r"[^A-Za-z0-9]+", "_", str(record.get("Job Profile", ""))).strip("_")
+    return f"{record.get('Full Job Code', 'perfil')}_{name[:60]}.pdf"
+
+
+def _render_batch(records):
+    # Executado nos processos do pool: fontes e estilos ficam no cache do processo
+    return [(pdf_filename(r), render_profile_pdf(r)) for r in records]
+
+
+# =========================================================
+# EXPORTAÇÃO
+# =========================================================
+
+def select_records(job_family=None, codes=None):
+    """Perfis do catálogo: todos, de uma Job Family ou de uma lista de Full Job Codes."""
+    df = catalog.load_job_profiles()
+    if job_family:
+        df = df[df["Job Family"] == job_family]
+    if codes is not None:
+        df = df[df["Full Job Code"].isin(list(codes))]
+    return df.astype(object).to_dict("records")
+
+
+def export_zip(records, target=None, workers=None):
+    """
+    Um PDF por perfil dentro de um ZIP. Os lotes são renderizados em
+    paralelo e gravados na ordem, sem acumular os PDFs em memória.
+    Retorna o arquivo (posicionado no início).
+    """
+    target = target or tempfile.SpooledTemporaryFile(max_size=SPOOL_LIMIT)
+    batches = [records[i:i + RENDER_BATCH] for i in range(0, len(records), RENDER_BATCH)]
+    workers = min(workers or os.cpu_count() or 1, max(len(batches), 1))
+
+    with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+
+        def write(batch):
+            for name, pdf in batch:
+                archive.writestr(name, pdf)
+
+        if workers == 1:
+            for batch in batches:
+                write(_render_batch(batch))
+        else:
+            # No máximo 2 × workers lotes em andamento/aguardando gravação
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for batch in batches:
+                    pending.append(pool.submit(_render_batch, batch))
+                    if len(pending) >= 2 * workers:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+
+    target.seek(0)
+    return target
+
+
+def export_combined_pdf(records, target=None, title="Job Profiles"):
+    """Todos os perfis em um único PDF (uma quebra de página por perfil)."""
+    from reportlab.platypus import PageBreak
+
+    target = target or tempfile.SpooledTemporaryFile(max_size=SPOOL_LIMIT)
+    story = []
+    for i, record in enumerate(records):
+        if i:
+            story.append(PageBreak())
+        story.extend(profile_story(record))
+
+    _document(target, title).build(story, onFirstPage=_draw_page, onLaterPages=_draw_page)
+    target.seek(0)
+    return target
@@ -0,0 +1,216 @@
+# utils/reconciliation.py
+"""
+Conciliação de extratos de colaboradores com o catálogo de Job Profiles.
+
+O catálogo vira dois índices (hash) montados uma vez por versão:
+  - por Full Job Code:  grade, band, career level e Job Code short;
+  - por Job Code short: band, faixa de grades e career levels existentes.
+O extrato é lido em blocos e cada bloco é conciliado com joins de hash
+contra esses índices; só as divergências são gravadas, então a memória
+depende do tamanho do bloco e não do arquivo. Divergências:
+  - unknown_code:   Full Job Code (ou, sem ele, o Job Code short) fora do
+                    catálogo; com um short válido, as demais checagens
+                    usam as faixas do short;
+  - code_conflict:  Job Code short informado diferente do Full Job Code;
+  - grade_drift:    grade diferente do cargo (ou fora da faixa do short);
+  - band_mismatch:  career band diferente da do cargo;
+  - level_mismatch: career level diferente do cargo (ou inexistente no short).
+
+Uso:
+    python -m utils.reconciliation colaboradores.csv divergencias.csv [--chunksize 100000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils import catalog
+from utils.batch_match import ResultWriter, read_chunks
+
+MISMATCHES = [
+    "unknown_code",
+    "code_conflict",
+    "grade_drift",
+    "band_mismatch",
+    "level_mismatch",
+]
+
+# Colunas esperadas no extrato (podem ser trocadas na chamada)
+EMPLOYEE_COLUMNS = {
+    "code": "Full Job Code",
+    "short": "Job Code short",
+    "grade": "Global Grade",
+    "band": "Career Band",
+    "level": "Career Level",
+}
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+# =========================================================
+# ÍNDICES DO CATÁLOGO
+# =========================================================
+
+def build_code_index(df):
+    """Índices por Full Job Code e por Job Code short."""
+    profiles = pd.DataFrame({
+        "code": df["Full Job Code"].astype(str).str.strip().str.upper(),
+        "short": df["Job Code short"].astype(str).str.strip().str.upper(),
+        "grade": df["Global Grade"].astype(float),
+        "band": df["Career Band Short"].astype(str).str.strip().str.upper(),
+        "level": df["Career Level"].astype(str).str.strip().str.upper(),
+    })
+
+    by_code = profiles.drop_duplicates("code").set_index("code")
+    by_short = profiles.groupby("short").agg(
+        short_band=("band", "first"),
+        grade_min=("grade", "min"),
+        grade_max=("grade", "max"),
+    )
+    by_short["grade_range"] = (
+        by_short["grade_min"].astype(int).astype(str) + "-" + by_short["grade_max"].astype(int).astype(str)
+    )
+    short_levels = pd.MultiIndex.from_frame(profiles[["short", "level"]].drop_duplicates())
+
+    return {
+        "by_code": by_code.add_prefix("cat_"),
+        "by_short": by_short,
+        "short_levels": short_levels,
+    }
+
+
+def get_code_index():
+    """Índices do catálogo atual, reconstruídos só quando o Job Profile muda."""
+    return catalog.derived("reconciliation_codes", lambda: build_code_index(catalog.load_job_profiles()))
+
+
+# =========================================================
+# CONCILIAÇÃO DE UM BLOCO
+# =========================================================
+
+def _key(series):
+    return series.astype(object).where(series.notna(), "").astype(str).str.strip().str.upper()
+
+
+def reconcile_chunk(chunk, columns=EMPLOYEE_COLUMNS, index=None):
+    """
+    Concilia um bloco do extrato. Retorna (divergências, contagens), com
+    uma linha por (colaborador, divergência) e as colunas do catálogo
+    usadas na comparação. Checagens cujas colunas não existem no extrato
+    são puladas.
+    """
+    index = index or get_code_index()
+    present = {name: column for name, column in columns.items() if column in chunk.columns}
+    if "code" not in present and "short" not in present:
+        raise ValueError(f"Extrato sem coluna de código ('{columns['code']}' ou '{columns['short']}').")
+    n = len(chunk)
+
+    code = _key(chunk[present["code"]]) if "code" in present else pd.Series("", index=chunk.index)
+    short = _key(chunk[present["short"]]) if "short" in present else pd.Series("", index=chunk.index)
+
+    # Hash joins contra os índices do catálogo
+    by_code = index["by_code"].reindex(code.to_numpy())
+    known_code = by_code["cat_grade"].notna().to_numpy()
+
+    effective_short = np.where(short.to_numpy() != "", short.to_numpy(), by_code["cat_short"].fillna("").to_numpy())
+    by_short = index["by_short"].reindex(effective_short)
+    known_short = by_short["short_band"].notna().to_numpy()
+
+    has_code = (code != "").to_numpy()
+    has_short = (short != "").to_numpy()
+
+    flags = pd.DataFrame(False, index=chunk.index, columns=MISMATCHES)
+    flags["unknown_code"] = (has_code & ~known_code) | (~has_code & has_short & ~known_short)
+    flags["code_conflict"] = known_code & has_short & (by_code["cat_short"].to_numpy() != short.to_numpy())
+
+    if "grade" in present:
+        grade = pd.to_numeric(chunk[present["grade"]], errors="coerce").to_numpy(dtype=float)
+        has_grade = ~np.isnan(grade)
+        exact = known_code & has_grade & (grade != by_code["cat_grade"].to_numpy())
+        in_range = (grade >= by_short["grade_min"].to_numpy()) & (grade <= by_short["grade_max"].to_numpy())
+        ranged = ~known_code & known_short & has_grade & ~in_range
+        flags["grade_drift"] = exact | ranged
+
+    if "band" in present:
+        band = _key(chunk[present["band"]]).to_numpy()
+        expected = np.where(known_code, by_code["cat_band"].fillna("").to_numpy(), by_short["short_band"].fillna("").to_numpy())
+        flags["band_mismatch"] = (known_code | known_short) & (band != "") & (band != expected)
+
+    if "level" in present:
+        level = _key(chunk[present["level"]]).to_numpy()
+        exact = known_code & (level != "") & (level != by_code["cat_level"].fillna("").to_numpy())
+        exists = pd.MultiIndex.from_arrays([effective_short, level]).isin(index["short_levels"])
+        ranged = ~known_code & known_short & (level != "") & ~exists
+        flags["level_mismatch"] = exact | ranged
+
+    # Uma linha por divergência, com os valores do catálogo ao lado
+    rows, kinds = np.nonzero(flags.to_numpy())
+    context = pd.DataFrame({
+        "catalog_grade": np.where(known_code, by_code["cat_grade"].to_numpy(), np.nan),
+        "catalog_grade_range": by_short["grade_range"].to_numpy(),
+        "catalog_band": np.where(known_code, by_code["cat_band"].to_numpy(), by_short["short_band"].to_numpy()),
+        "catalog_level": by_code["cat_level"].to_numpy(),
+    })
+    mismatches = chunk.iloc[rows].reset_index(drop=True)
+    mismatches = pd.concat([mismatches, context.iloc[rows].reset_index(drop=True)], axis=1)
+    mismatches["mismatch"] = np.asarray(MISMATCHES, dtype=object)[kinds]
+
+    counts = {name: int(flags[name].sum()) for name in MISMATCHES}
+    counts["records_checked"] = n
+    counts["records_with_mismatch"] = int(flags.any(axis=1).sum())
+    return mismatches, counts
+
+
+# =========================================================
+# EXECUÇÃO EM ARQUIVO
+# =========================================================
+
+def run_reconciliation(input_path, output_path, columns=EMPLOYEE_COLUMNS, chunksize=DEFAULT_CHUNKSIZE, log=sys.stderr):
+    """
+    Concilia o extrato inteiro em blocos. Grava as divergências em
+    `output_path` (.csv ou .parquet) e o resumo em <output>_summary.csv.
+    Retorna o resumo como DataFrame (divergência, quantidade).
+    """
+    output_path = Path(output_path)
+    index = get_code_index()
+    writer = ResultWriter(output_path)
+    totals = dict.fromkeys(MISMATCHES + ["records_checked", "records_with_mismatch"], 0)
+    start = time.perf_counter()
+
+    try:
+        for i, chunk in enumerate(read_chunks(input_path, chunksize), start=1):
+            mismatches, counts = reconcile_chunk(chunk, columns, index)
+            if len(mismatches):
+                writer.write(mismatches)
+            for name, value in counts.items():
+                totals[name] += value
+            if log is not None:
+                elapsed = time.perf_counter() - start
+                print(
+                    f"bloco {i}: {totals['records_checked']:,} registros, "
+                    f"{totals['records_checked'] / max(elapsed, 1e-9):,.0f} registros/s",
+                    file=log,
+                )
+    finally:
+        writer.close()
+
+    summary = pd.DataFrame({"mismatch": list(totals), "count": list(totals.values())})
+    summary.to_csv(output_path.with_name(f"{output_path.stem}_summary.csv"), index=False)
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concilia um extrato de colaboradores com o catálogo.")
+    parser.add_argument("input", help="CSV ou XLSX de colaboradores")
+    parser.add_argument("output", help="arquivo de divergências (.csv ou .parquet)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    for name, column in EMPLOYEE_COLUMNS.items():
+        parser.add_argument(f"--{name}-column", default=column, help=f"coluna do extrato (padrão: {column})")
+    args = parser.parse_args()
+
+    columns = {name: getattr(args, f"{name}_column") for name in EMPLOYEE_COLUMNS}
+    summary = run_reconciliation(args.input, args.output, columns, args.chunksize)
+    print(summary.to_string(index=False))
@@ -0,0 +1,211 @@
+# utils/search.py
+"""
+Busca textual (BM25) sobre as descrições do Job Profile.
+
+O índice invertido é montado uma vez por versão do catálogo (hash do
+Job Profile.xlsx), mantido em memória para todas as sessões e gravado
+em data/snapshot/search_index.pkl para ser reaproveitado por outros
+processos sem reconstrução.
+"""
+import html
+import pickle
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
+
+from utils import catalog, snapshot
+from utils.instrumentation import timed
+
+INDEX_PATH = snapshot.SNAPSHOT_DIR / "search_index.pkl"
+INDEX_FORMAT = 1
+
+# Campos indexados e peso de cada um (o título conta em dobro)
+SEARCH_FIELDS = {
+    "Job Profile": 2,
+    "Sub Job Family": 1,
+    "Job Profile Description": 1,
+    "Role Description": 1,
+    "Grade Differentiator": 1,
+    "Sub Job Family Description": 1,
+}
+
+# Parâmetros do BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+# =========================================================
+# CONSTRUÇÃO DO ÍNDICE
+# =========================================================
+
+def _field_text(df, field):
+    return df[field].astype(object).fillna("").astype(str) if field in df.columns else pd.Series("", index=df.index)
+
+
+def _documents(df):
+    docs = pd.Series("", index=df.index)
+    for field, boost in SEARCH_FIELDS.items():
+        text = _field_text(df, field)
+        for _ in range(boost):
+            docs = docs + " " + text
+    return docs.tolist()
+
+
+@timed("build:search_index")
+def build_search_index(df):
+    """Monta a matriz BM25 (documentos × termos) do catálogo."""
+    vectorizer = CountVectorizer(
+        lowercase=True,
+        strip_accents="unicode",
+        token_pattern=r"(?u)\b\w\w+\b",
+        dtype=np.float32,
+    )
+    tf = vectorizer.fit_transform(_documents(df)).tocsr()
+
+    n_docs = tf.shape[0]
+    doc_len = np.asarray(tf.sum(axis=1)).ravel()
+    avg_len = doc_len.mean() if n_docs else 0.0
+    doc_freq = np.bincount(tf.indices, minlength=tf.shape[1])
+    idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+
+    # Peso BM25 pré-calculado por célula: idf * tf*(k1+1) / (tf + k1*(1-b+b*dl/avgdl))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len / (avg_len or 1.0))
+    rows = np.repeat(np.arange(n_docs), np.diff(tf.indptr))
+    weights = tf.copy()
+    weights.data = idf[tf.indices] * tf.data * (BM25_K1 + 1) / (tf.data + norm[rows])
+
+    return {
+        "format": INDEX_FORMAT,
+        "vocabulary": vectorizer.vocabulary_,
+        "analyzer": vectorizer.build_analyzer(),
+        "weights": weights.tocsc(),
+    }
+
+
+def _load_persisted(digest):
+    try:
+        with open(INDEX_PATH, "rb") as f:
+            payload = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if payload.get("digest") != digest or payload["index"].get("format") != INDEX_FORMAT:
+        return None
+    return payload["index"]
+
+
+def _persist(digest, index):
+    def write(tmp):
+        with open(tmp, "wb") as f:
+            pickle.dump({"digest": digest, "index": index}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    try:
+        snapshot._atomic_write(INDEX_PATH, write)
+    except (OSError, pickle.PicklingError, AttributeError):
+        pass
+
+
+def get_search_index():
+    """Índice do catálogo atual: memória → disco → reconstrução."""
+    def build():
+        digest = catalog.source_digest("job_profile")
+        index = _load_persisted(digest)
+        if index is None:
+            index = build_search_index(catalog.load_job_profiles())
+            _persist(digest, index)
+        return index
+
+    return catalog.derived("search_index", build)
+
+
+# =========================================================
+# CONSULTA
+# =========================================================
+
+def _fold(text):
+    """
+    Minúsculas sem acentos, um caractere por caractere do original: os
+    offsets do texto dobrado valem no texto original (highlight), mesmo
+    quando lower() mudaria o comprimento ("İ" → "i̇").
+    """
+    if text.isascii():
+        return text.lower()
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        return "".join(unicodedata.normalize("NFKD", ch.lower())[0] for ch in text)
+    return "".join(unicodedata.normalize("NFKD", ch)[0] for ch in lowered)
+
+
+def highlight(text, terms, width=220):
+    """
+    Trecho de `text` em torno da primeira ocorrência de algum dos termos,
+    com HTML escapado e os termos marcados com <mark>.
+    """
+    text = str(text or "")
+    if not terms:
+        return html.escape(text[:width])
+
+    pattern = re.compile(r"\b(" + "|".join(re.escape(t) for t in terms) + r")\w*")
+    folded = _fold(text)
+    matches = list(pattern.finditer(folded))
+    if not matches:
+        return html.escape(text[:width])
+
+    start = max(0, matches[0].start() - width // 3)
+    end = min(len(text), start + width)
+
+    parts, cursor = [], start
+    for m in matches:
+        if m.start() < start or m.end() > end:
+            continue
+        parts.append(html.escape(text[cursor:m.start()]))
+        parts.append(f"<mark>{html.escape(text[m.start():m.end()])}</mark>")
+        cursor = m.end()
+    parts.append(html.escape(text[cursor:end]))
+
+    prefix = "… " if start > 0 else ""
+    suffix = " …" if end < len(text) else ""
+    return prefix + "".join(parts) + suffix
+
+
+@timed("query:search")
+def search_profiles(query, k=20):
+    """
+    Busca `query` no catálogo e retorna um DataFrame com os k melhores
+    resultados: colunas de identificação, score BM25, campo com mais
+    ocorrências e o trecho destacado (HTML) desse campo.
+    """
+    df = catalog.load_job_profiles()
+    index = get_search_index()
+
+    terms = [t for t in dict.fromkeys(index["analyzer"](query or "")) if t in index["vocabulary"]]
+    if not terms:
+        return pd.DataFrame(columns=["Full Job Code", "Job Profile", "score", "field", "snippet", "position"])
+
+    columns = [index["vocabulary"][t] for t in terms]
+    scores = np.asarray(index["weights"][:, columns].sum(axis=1)).ravel()
+
+    hits = np.flatnonzero(scores > 0)
+    top = hits[np.lexsort((hits, -scores[hits]))][:k]
+
+    rows = []
+    for pos in top:
+        record = df.iloc[pos]
+        best_field, best_count = None, -1
+        for field in SEARCH_FIELDS:
+            folded = _fold(str(record.get(field, "") or ""))
+            count = sum(folded.count(t) for t in terms)
+            if count > best_count:
+                best_field, best_count = field, count
+        rows.append({
+            "Full Job Code": record["Full Job Code"],
+            "Job Profile": record["Job Profile"],
+            "score": round(float(scores[pos]), 3),
+            "field": best_field,
+            "snippet": highlight(record.get(best_field, ""), terms),
+            "position": int(pos),
+        })
+
+    return pd.DataFrame(rows)
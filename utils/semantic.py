@@ -0,0 +1,251 @@
+# utils/semantic.py
+"""
+Match semântico: "cole uma descrição de cargo → perfis mais próximos".
+
+Cada Job Profile é convertido em um vetor (embedding) uma única vez e a
+matriz é gravada como .npy float16 em data/snapshot/embeddings/<encoder>/,
+aberta depois via memory-map. Só as linhas cujo texto mudou são
+recalculadas. O encoder é plugável:
+  - HashingEncoder: determinístico, sem modelo, roda offline (padrão);
+  - SentenceTransformerEncoder: modelo local ou do hub (JA_EMBEDDING_MODEL).
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils import catalog, snapshot
+from utils.instrumentation import timed
+
+EMBEDDINGS_DIR = snapshot.SNAPSHOT_DIR / "embeddings"
+
+# Campos que compõem o texto de cada perfil
+EMBEDDING_FIELDS = [
+    "Job Profile",
+    "Sub Job Family",
+    "Job Profile Description",
+    "Role Description",
+    "Sub Job Family Description",
+]
+
+# Linhas do catálogo comparadas por bloco na busca (limita a memória)
+SEARCH_BLOCK = 4096
+
+_lock = threading.Lock()
+
+
+# =========================================================
+# ENCODERS
+# =========================================================
+
+class HashingEncoder:
+    """Bag-of-words com hashing (uni + bigramas), normalizado em L2."""
+
+    def __init__(self, dim=512):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+        self._vectorizer = HashingVectorizer(
+            n_features=dim,
+            ngram_range=(1, 2),
+            strip_accents="unicode",
+            alternate_sign=True,
+            norm="l2",
+        )
+
+    def encode(self, texts):
+        return self._vectorizer.transform(texts).toarray().astype(np.float32)
+
+
+class SentenceTransformerEncoder:
+    """Encoder sentence-transformers (caminho local ou nome do modelo)."""
+
+    def __init__(self, model, batch_size=64):
+        from sentence_transformers import SentenceTransformer
+
+        self._model = SentenceTransformer(model)
+        self.batch_size = batch_size
+        self.dim = self._model.get_sentence_embedding_dimension()
+        self.name = "st-" + re.sub(r"[^A-Za-z0-9_.-]+", "_", os.path.basename(str(model).rstrip("/\\")))
+
+    def encode(self, texts):
+        vectors = self._model.encode(
+            list(texts),
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+
+_default_encoder = None
+
+
+def get_encoder():
+    """
+    Encoder padrão do processo: sentence-transformers se JA_EMBEDDING_MODEL
+    estiver definido (ex.: caminho de um modelo salvo localmente), senão
+    o HashingEncoder.
+    """
+    global _default_encoder
+    with _lock:
+        if _default_encoder is None:
+            model = os.environ.get("JA_EMBEDDING_MODEL")
+            _default_encoder = SentenceTransformerEncoder(model) if model else HashingEncoder()
+        return _default_encoder
+
+
+# =========================================================
+# ARMAZENAMENTO (memory-map + reaproveitamento por hash)
+# =========================================================
+
+def profile_texts(df):
+    """Texto de cada perfil usado no embedding."""
+    parts = [df[f].astype(object).fillna("").astype(str) for f in EMBEDDING_FIELDS if f in df.columns]
+    text = parts[0]
+    for part in parts[1:]:
+        text = text + "\n" + part
+    return text.str.strip().tolist()
+
+
+def _text_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _store_paths(encoder):
+    folder = EMBEDDINGS_DIR / encoder.name
+    return folder / "vectors.npy", folder / "meta.json"
+
+
+def _read_store(encoder):
+    vectors_path, meta_path = _store_paths(encoder)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        vectors = np.load(vectors_path, mmap_mode="r")
+    except (OSError, ValueError):
+        return None, None
+    if meta.get("dim") != encoder.dim or len(meta.get("hashes", [])) != len(vectors):
+        return None, None
+    return meta, vectors
+
+
+@timed("build:embeddings")
+def build_embeddings(df, encoder, dtype=np.float16):
+    """
+    Garante que o store do `encoder` cobre todas as linhas de `df`.
+    Vetores de textos já conhecidos (mesmo hash) são reaproveitados;
+    apenas textos novos/alterados passam pelo encoder, uma vez cada.
+    Retorna {"encoded": n_textos_codificados, "reused": n_linhas_reaproveitadas}.
+    """
+    texts = profile_texts(df)
+    hashes = [_text_hash(t) for t in texts]
+
+    meta, old_vectors = _read_store(encoder)
+    known = {}
+    if meta is not None:
+        known = {h: i for i, h in enumerate(meta["hashes"])}
+
+    if meta is not None and meta["hashes"] == hashes:
+        return {"encoded": 0, "reused": len(hashes)}
+
+    missing = list(dict.fromkeys(h for h in hashes if h not in known))
+    text_by_hash = dict(zip(hashes, texts))
+    fresh = {}
+    if missing:
+        encoded = encoder.encode([text_by_hash[h] for h in missing])
+        fresh = dict(zip(missing, encoded))
+
+    vectors_path, meta_path = _store_paths(encoder)
+
+    def write_vectors(tmp):
+        out = np.lib.format.open_memmap(tmp, mode="w+", dtype=dtype, shape=(len(hashes), encoder.dim))
+        for i, h in enumerate(hashes):
+            out[i] = fresh[h] if h in fresh else old_vectors[known[h]]
+        out.flush()
+        del out
+
+    def write_meta(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"encoder": encoder.name, "dim": encoder.dim, "dtype": np.dtype(dtype).name, "hashes": hashes},
+                f,
+            )
+
+    snapshot._atomic_write(vectors_path, write_vectors)
+    snapshot._atomic_write(meta_path, write_meta)
+
+    return {"encoded": len(missing), "reused": sum(h in known for h in hashes)}
+
+
+def get_embeddings(encoder=None):
+    """Matriz (memory-map) de embeddings do catálogo atual para o encoder."""
+    encoder = encoder or get_encoder()
+
+    def build():
+        build_embeddings(catalog.load_job_profiles(), encoder)
+        return _read_store(encoder)[1]
+
+    return catalog.derived(("embeddings", encoder.name), build)
+
+
+# =========================================================
+# BUSCA
+# =========================================================
+
+@timed("query:semantic")
+def semantic_search(queries, k=10, job_family=None, encoder=None):
+    """
+    Perfis mais próximos (similaridade de cosseno) de um ou mais textos.
+
+    `queries` pode ser uma string ou uma lista de strings; as consultas
+    são codificadas em um único lote. `job_family` (str ou lista)
+    restringe os candidatos. Retorna um DataFrame com as colunas query,
+    rank, score e as colunas de identificação do perfil.
+    """
+    encoder = encoder or get_encoder()
+    df = catalog.load_job_profiles()
+    vectors = get_embeddings(encoder)
+
+    single = isinstance(queries, str)
+    queries = [queries] if single else list(queries)
+    q = encoder.encode(queries)
+    q /= np.maximum(np.linalg.norm(q, axis=1, keepdims=True), 1e-12)
+
+    if job_family:
+        families = [job_family] if isinstance(job_family, str) else list(job_family)
+        candidates = np.flatnonzero(df["Job Family"].isin(families).to_numpy())
+    else:
+        candidates = np.arange(len(df))
+
+    scores = np.empty((len(queries), len(candidates)), dtype=np.float32)
+    for start in range(0, len(candidates), SEARCH_BLOCK):
+        block = candidates[start:start + SEARCH_BLOCK]
+        scores[:, start:start + len(block)] = q @ np.asarray(vectors[block], dtype=np.float32).T
+
+    k = min(k, len(candidates))
+    rows = []
+    for qi, text in enumerate(queries):
+        if k == 0:
+            break
+        part = np.argpartition(-scores[qi], k - 1)[:k]
+        order = part[np.lexsort((part, -scores[qi, part]))]
+        for rank, col in enumerate(order, start=1):
+            pos = candidates[col]
+            rows.append({
+                "query": qi,
+                "rank": rank,
+                "score": round(float(scores[qi, col]), 4),
+                "Full Job Code": df.iloc[pos]["Full Job Code"],
+                "Job Profile": df.iloc[pos]["Job Profile"],
+                "Job Family": df.iloc[pos]["Job Family"],
+                "position": int(pos),
+            })
+
+    result = pd.DataFrame(rows, columns=["query", "rank", "score", "Full Job Code", "Job Profile", "Job Family", "position"])
+    return result.drop(columns="query") if single else result
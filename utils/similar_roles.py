@@ -0,0 +1,149 @@
+# utils/similar_roles.py
+"""
+Grafo k-NN de "cargos similares" para recomendações de mobilidade.
+
+Para cada Job Profile são pré-calculados os k vizinhos mais próximos,
+combinando a similaridade das descrições (embeddings de utils.semantic)
+com a proximidade de Global Grade. O cálculo é feito em blocos de linhas
+(memória limitada) e o resultado é gravado em
+data/snapshot/similar_roles.npz; na página, cada consulta é só uma
+leitura de linha.
+
+Uso:
+    python -m utils.similar_roles   # (re)calcula o grafo do catálogo atual
+"""
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils import catalog, semantic, snapshot
+from utils.instrumentation import timed
+
+NEIGHBOURS_PATH = snapshot.SNAPSHOT_DIR / "similar_roles.npz"
+
+# Quantidade de vizinhos guardados por perfil
+TOP_K = 20
+# Peso da descrição na nota final (o restante vai para a proximidade de grade)
+TEXT_WEIGHT = 0.7
+# Diferença de grade a partir da qual a proximidade de grade zera
+GRADE_SPAN = 5
+# Linhas processadas por bloco
+BLOCK_SIZE = 512
+
+
+# =========================================================
+# CÁLCULO OFFLINE
+# =========================================================
+
+def build_neighbours(vectors, grades, k=TOP_K, block_size=BLOCK_SIZE):
+    """
+    Top-k vizinhos de cada linha. Nota = TEXT_WEIGHT × cosseno das
+    descrições + (1 − TEXT_WEIGHT) × (1 − min(|Δgrade|, GRADE_SPAN) / GRADE_SPAN).
+    Retorna (índices N × k, notas N × k), ordenados da maior para a menor nota.
+    """
+    n = len(grades)
+    k = min(k, max(n - 1, 0))
+    grades = np.asarray(grades, dtype=np.float32)
+
+    indices = np.empty((n, k), dtype=np.int32)
+    scores = np.empty((n, k), dtype=np.float32)
+    if k == 0:
+        return indices, scores
+
+    full = np.asarray(vectors, dtype=np.float32)
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        block = full[start:stop]
+
+        text = block @ full.T
+        grade_gap = np.abs(grades[start:stop, None] - grades[None, :])
+        grade = 1.0 - np.minimum(grade_gap, GRADE_SPAN) / GRADE_SPAN
+        score = TEXT_WEIGHT * text + (1.0 - TEXT_WEIGHT) * grade
+
+        rows = np.arange(stop - start)
+        score[rows, rows + start] = -np.inf  # o próprio perfil não é vizinho
+
+        part = np.argpartition(-score, k - 1, axis=1)[:, :k]
+        part_scores = np.take_along_axis(score, part, axis=1)
+        order = np.lexsort((part, -part_scores), axis=1)
+
+        indices[start:stop] = np.take_along_axis(part, order, axis=1)
+        scores[start:stop] = np.take_along_axis(part_scores, order, axis=1)
+
+    return indices, scores
+
+
+@timed("build:similar_roles")
+def compute_similar_roles(encoder=None):
+    """Calcula e grava o grafo k-NN do catálogo atual."""
+    encoder = encoder or semantic.get_encoder()
+    df = catalog.load_job_profiles()
+    digest = catalog.source_digest("job_profile")
+
+    vectors = semantic.get_embeddings(encoder)
+    indices, scores = build_neighbours(vectors, df["Global Grade"].to_numpy())
+
+    meta = json.dumps({"digest": digest, "encoder": encoder.name, "k": int(indices.shape[1])})
+
+    def write(tmp):
+        with open(tmp, "wb") as f:
+            np.savez(f, indices=indices, scores=scores, meta=np.array(meta))
+
+    snapshot._atomic_write(NEIGHBOURS_PATH, write)
+    return {"digest": digest, "indices": indices, "scores": scores}
+
+
+def _load_persisted(digest, encoder_name):
+    try:
+        with np.load(NEIGHBOURS_PATH) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("digest") != digest or meta.get("encoder") != encoder_name:
+                return None
+            return {"digest": digest, "indices": data["indices"], "scores": data["scores"]}
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def get_similar_roles_graph(encoder=None):
+    """Grafo k-NN atual: memória → snapshot em disco → cálculo."""
+    encoder = encoder or semantic.get_encoder()
+
+    def build():
+        graph = _load_persisted(catalog.source_digest("job_profile"), encoder.name)
+        return graph if graph is not None else compute_similar_roles(encoder)
+
+    return catalog.derived(("similar_roles", encoder.name), build)
+
+
+# =========================================================
+# CONSULTA
+# =========================================================
+
+@timed("query:similar_roles")
+def similar_roles(position, k=10):
+    """
+    Perfis similares ao da linha `position` do catálogo (leitura direta
+    no grafo pré-calculado). Retorna um DataFrame com a nota e as colunas
+    de identificação dos vizinhos.
+    """
+    df = catalog.load_job_profiles()
+    graph = get_similar_roles_graph()
+
+    neighbours = graph["indices"][position, :k]
+    result = df.iloc[neighbours][
+        ["Full Job Code", "Job Profile", "Sub Job Family", "Global Grade"]
+    ].reset_index(drop=True)
+    result.insert(0, "score", graph["scores"][position, :k].round(3))
+    return result
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    graph = compute_similar_roles()
+    print(
+        f"{graph['indices'].shape[0]} perfis × {graph['indices'].shape[1]} vizinhos "
+        f"em {NEIGHBOURS_PATH} ({time.perf_counter() - start:.2f}s)"
+    )
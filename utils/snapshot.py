@@ -0,0 +1,191 @@
+# utils/snapshot.py
+"""
+Snapshot colunar (Parquet) do catálogo.
+
+Compila Job Family.xlsx, Job Profile.xlsx, Level Structure.xlsx e
+wtw_ggs_factors.json para data/snapshot/, com um manifest.json que
+registra o hash de cada arquivo de origem. O utils/catalog lê o
+snapshot sempre que o hash confere e só volta ao Excel quando ele
+está desatualizado (ou o pyarrow não está instalado).
+
+Uso:
+    python -m utils.snapshot          # compila o que estiver desatualizado
+    python -m utils.snapshot --force  # recompila tudo
+"""
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from utils import catalog
+
+FORMAT_VERSION = 1
+
+SNAPSHOT_DIR = catalog.DATA_DIR / "snapshot"
+MANIFEST_PATH = SNAPSHOT_DIR / "manifest.json"
+
+_write_lock = threading.Lock()
+
+
+# =========================================================
+# MANIFEST
+# =========================================================
+
+def read_manifest():
+    """Lê o manifest do snapshot (dict vazio se não existir ou estiver corrompido)."""
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("format_version") != FORMAT_VERSION:
+        return {}
+    return manifest
+
+
+def snapshot_version(manifest):
+    """Versão do snapshot: hash combinado dos hashes de cada fonte."""
+    digests = sorted(
+        f"{name}:{info['digest']}" for name, info in manifest.get("tables", {}).items()
+    )
+    return hashlib.sha1("|".join(digests).encode("utf-8")).hexdigest()[:16]
+
+
+def _atomic_write(path, write):
+    """Grava via arquivo temporário + os.replace (seguro entre workers)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _write_manifest(manifest):
+    manifest["format_version"] = FORMAT_VERSION
+    manifest["version"] = snapshot_version(manifest)
+
+    def write(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    _atomic_write(MANIFEST_PATH, write)
+
+
+# =========================================================
+# LEITURA / ESCRITA DE TABELAS
+# =========================================================
+
+def _table_path(name, kind):
+    suffix = ".json" if kind == "json" else ".parquet"
+    return SNAPSHOT_DIR / f"{name}{suffix}"
+
+
+def read_table(name, digest):
+    """
+    Devolve a tabela `name` do snapshot se ela foi compilada a partir de
+    uma fonte com o hash `digest`; caso contrário devolve None.
+    """
+    info = read_manifest().get("tables", {}).get(name)
+    if not info or info.get("digest") != digest:
+        return None
+
+    path = _table_path(name, info.get("kind"))
+    try:
+        if info.get("kind") == "json":
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return pd.read_parquet(path)
+    except (ImportError, OSError, ValueError):
+        return None
+
+
+def write_table(name, value, digest, source_path):
+    """Grava a tabela `name` no snapshot e atualiza o manifest."""
+    kind = "json" if isinstance(value, dict) else "parquet"
+    path = _table_path(name, kind)
+
+    if kind == "json":
+        def write(tmp):
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+        columns = None
+        rows = len(value)
+    else:
+        def write(tmp):
+            value.to_parquet(tmp, index=False)
+        columns = {str(col): str(dtype) for col, dtype in value.dtypes.items()}
+        rows = len(value)
+
+    with _write_lock:
+        _atomic_write(path, write)
+        manifest = read_manifest()
+        manifest.setdefault("tables", {})[name] = {
+            "kind": kind,
+            "source": Path(source_path).name,
+            "digest": digest,
+            "rows": rows,
+            "columns": columns,
+            "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        _write_manifest(manifest)
+
+
+def try_write_table(name, value, digest, source_path):
+    """Como write_table, mas ignora falhas (pyarrow ausente, disco somente leitura)."""
+    try:
+        write_table(name, value, digest, source_path)
+        return True
+    except (ImportError, OSError, TypeError, ValueError):
+        return False
+
+
+# =========================================================
+# COMANDO DE COMPILAÇÃO
+# =========================================================
+
+def build_snapshot(force=False):
+    """
+    Compila para o snapshot todas as fontes que estiverem desatualizadas
+    (ou todas, com force=True). Retorna {fonte: "built" | "fresh"}.
+    """
+    manifest = read_manifest()
+    result = {}
+
+    for name, path in catalog.SOURCES.items():
+        digest = catalog.file_digest(path)
+        info = manifest.get("tables", {}).get(name, {})
+
+        if not force and info.get("digest") == digest and _table_path(name, info.get("kind")).exists():
+            result[name] = "fresh"
+            continue
+
+        value = catalog.read_source(name, path)
+        write_table(name, value, digest, path)
+        result[name] = "built"
+
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compila o snapshot colunar do catálogo.")
+    parser.add_argument("--force", action="store_true", help="recompila todas as fontes")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    status = build_snapshot(force=args.force)
+    elapsed = time.perf_counter() - start
+
+    for name, state in status.items():
+        print(f"{name:<16} {state}")
+    print(f"Snapshot {read_manifest().get('version')} em {SNAPSHOT_DIR} ({elapsed:.2f}s)")
@@ -0,0 +1,371 @@
+# utils/title_mapper.py
+"""
+Mapeamento de títulos legados (texto livre do HRIS antigo) para Job
+Profiles do catálogo.
+
+Os títulos do catálogo (Job Profile e SIG Level Title) são indexados uma
+vez como vetores TF-IDF de n-gramas de caracteres (matriz esparsa = índice
+invertido de n-gramas). Os títulos legados são agrupados pelo bloco
+(Job Family / Function Code) e cada grupo é multiplicado, em lotes de
+SCORE_BATCH títulos, só contra as colunas dos perfis do seu bloco; do
+produto saem apenas os top-k por título acima de MIN_SCORE, então a
+memória não cresce com chunksize × catálogo. Títulos com nota baixa, sem
+candidato ou com empate entre os primeiros vão para a fila de revisão.
+
+Uso:
+    python -m utils.title_mapper titulos.xlsx mapeamento.csv \\
+        [--title-column title] [--family-column job_family] [--function-column function_code] \\
+        [--k 5] [--workers 4]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils import catalog
+from utils.batch_match import DEFAULT_CHUNKSIZE, ResultWriter, read_chunks
+
+# Peso de cada campo do catálogo na nota final
+TITLE_FIELDS = {"Job Profile": 0.75, "SIG Level Title": 0.25}
+
+# Abaixo desta nota, ou com diferença menor que REVIEW_MARGIN para o
+# segundo candidato (de outro Job Profile), o título vai para revisão
+REVIEW_THRESHOLD = 0.55
+REVIEW_MARGIN = 0.03
+
+# Candidatos com nota até este valor não entram no resultado (n-gramas
+# soltos em comum); um título sem nenhum vira uma linha "no_match"
+MIN_SCORE = 0.1
+
+# Títulos por multiplicação contra o índice (limita a matriz de notas)
+SCORE_BATCH = 2048
+
+RECORD_COLUMNS = ["Job Profile", "Job Family", "Function Code", "Full Job Codes"]
+
+# Abreviações comuns em títulos legados
+ABBREVIATIONS = {
+    "sr": "senior",
+    "jr": "junior",
+    "mgr": "manager",
+    "mngr": "manager",
+    "asst": "assistant",
+    "assoc": "associate",
+    "coord": "coordinator",
+    "spec": "specialist",
+    "eng": "engineer",
+    "engr": "engineer",
+    "dir": "director",
+    "vp": "vice president",
+    "exec": "executive",
+    "admin": "administrative",
+    "acct": "accountant",
+    "tech": "technician",
+    "ops": "operations",
+    "hr": "human resources",
+    "it": "information technology",
+}
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+# =========================================================
+# NORMALIZAÇÃO
+# =========================================================
+
+def normalize_title(title):
+    """Minúsculas, sem acentos/pontuação e com abreviações expandidas."""
+    if title is None or title != title:
+        return ""
+    text = unicodedata.normalize("NFKD", str(title)).encode("ascii", "ignore").decode("ascii").lower()
+    return " ".join(ABBREVIATIONS.get(word, word) for word in _WORD.findall(text))
+
+
+# =========================================================
+# ÍNDICE DO CATÁLOGO
+# =========================================================
+
+def build_title_index(df):
+    """
+    Vetorizadores e matrizes TF-IDF (char n-gramas) por campo, mais os
+    blocos. O índice tem uma entrada por Job Profile distinto (os campos
+    de título não variam entre os grades do mesmo perfil); os Full Job
+    Codes de cada perfil vão juntos no resultado.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    grouped = df.astype({"Job Profile": object}).groupby("Job Profile", sort=False)
+    profiles = grouped.first().reset_index()
+    codes = grouped["Full Job Code"].agg(lambda c: ";".join(c.astype(str))).reindex(profiles["Job Profile"])
+
+    fields = {}
+    for field in TITLE_FIELDS:
+        vectorizer = TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 4), sublinear_tf=True)
+        matrix = vectorizer.fit_transform(profiles[field].astype(object).map(normalize_title))
+        fields[field] = {"vectorizer": vectorizer, "matrix": matrix.T.tocsr().astype(np.float32)}
+
+    def blocks(column):
+        values = profiles[column].astype(object).fillna("").astype(str).str.strip().str.upper()
+        return {key: np.flatnonzero(values.to_numpy() == key) for key in pd.unique(values) if key}
+
+    records = profiles[["Job Profile", "Job Family", "Function Code"]].astype(object)
+    records["Full Job Codes"] = codes.to_numpy()
+
+    return {
+        "fields": fields,
+        "family_blocks": blocks("Job Family"),
+        "function_blocks": blocks("Function Code"),
+        "records": records.to_numpy(),
+        "size": len(profiles),
+    }
+
+
+def get_title_index():
+    """Índice do catálogo atual, reconstruído só quando o Job Profile muda."""
+    return catalog.derived("title_index", lambda: build_title_index(catalog.load_job_profiles()))
+
+
+# =========================================================
+# MATCH
+# =========================================================
+
+def score_titles(titles, index=None, columns=None):
+    """
+    Matriz esparsa CSR (títulos × perfis) de similaridade ponderada, só
+    contra os perfis de `columns` (posições no índice; todos por padrão).
+    Títulos repetidos (após normalização) são vetorizados uma única vez.
+    """
+    index = index or get_title_index()
+    codes, unique = pd.factorize(pd.Series([normalize_title(t) for t in titles], dtype=object))
+
+    scores = None
+    for field, weight in TITLE_FIELDS.items():
+        entry = index["fields"][field]
+        matrix = entry["matrix"] if columns is None else entry["matrix"][:, columns]
+        query = entry["vectorizer"].transform(unique).astype(np.float32)
+        product = weight * (query @ matrix)
+        scores = product if scores is None else scores + product
+    return scores.tocsr()[codes]
+
+
+def _top_k(scores, k):
+    """
+    (linha, coluna, nota, rank) dos k maiores valores acima de MIN_SCORE em
+    cada linha de uma matriz esparsa; empates pela ordem das colunas.
+    """
+    scores = scores.tocsr()
+    scores.sort_indices()
+    rows = np.repeat(np.arange(scores.shape[0]), np.diff(scores.indptr))
+    keep = scores.data > MIN_SCORE
+    rows, cols, data = rows[keep], scores.indices[keep], scores.data[keep]
+
+    # Uma única chave (linha crescente, nota decrescente; notas ≤ 1); a
+    # ordenação estável mantém as colunas em ordem nos empates
+    order = np.argsort(rows * 2.0 - data, kind="stable")
+    rows, cols, data = rows[order], cols[order], data[order]
+    ranks = np.arange(len(rows)) - np.searchsorted(rows, rows, side="left")
+    top = ranks < k
+    return rows[top], cols[top], data[top], ranks[top]
+
+
+def _block_key(value):
+    if value is None or value != value:
+        return ""
+    return str(value).strip().upper()
+
+
+def match_titles(titles, job_families=None, function_codes=None, k=5, index=None):
+    """
+    Top-k perfis para cada título. `job_families` / `function_codes`
+    (opcionais, alinhados a `titles`) restringem os candidatos; Function
+    Code tem prioridade e um valor desconhecido não restringe nada.
+
+    Retorna um DataFrame longo: row, title, rank, score, blocked_by, as
+    colunas de identificação do perfil e needs_review / review_reason
+    (preenchidos no rank 1). Título sem candidato acima de MIN_SCORE sai
+    com uma única linha sem perfil (review_reason = "no_match").
+    """
+    index = index or get_title_index()
+    titles = np.asarray(list(titles), dtype=object)
+    n = len(titles)
+
+    # Blocking: agrupa as linhas pelo bloco; cada grupo só é comparado
+    # com as colunas (perfis) do próprio bloco
+    blocked_by = np.full(n, "", dtype=object)
+    groups = {}
+    for i in range(n):
+        function = _block_key(function_codes[i]) if function_codes is not None else ""
+        family = _block_key(job_families[i]) if job_families is not None else ""
+        if function in index["function_blocks"]:
+            key = ("function_blocks", function)
+            blocked_by[i] = "Function Code"
+        elif family in index["family_blocks"]:
+            key = ("family_blocks", family)
+            blocked_by[i] = "Job Family"
+        else:
+            key = None
+        groups.setdefault(key, []).append(i)
+
+    found = {"row": [], "profile": [], "score": [], "rank": []}
+    for key, rows in groups.items():
+        rows = np.asarray(rows)
+        columns = None if key is None else index[key[0]][key[1]]
+        for start in range(0, len(rows), SCORE_BATCH):
+            batch = rows[start:start + SCORE_BATCH]
+            r, c, score, rank = _top_k(score_titles(titles[batch], index, columns), k)
+            found["row"].append(batch[r])
+            found["profile"].append(c if columns is None else columns[c])
+            found["score"].append(score)
+            found["rank"].append(rank)
+
+    row, profile, score, rank = (np.concatenate(v) if v else np.zeros(0, dtype=int) for v in found.values())
+
+    # Títulos sem candidato: uma linha de rank 1 sem perfil, para a revisão
+    missing = np.setdiff1d(np.arange(n), row)
+    order = np.lexsort((np.concatenate([rank, np.zeros(len(missing), dtype=int)]), np.concatenate([row, missing])))
+    row = np.concatenate([row, missing])[order]
+    rank = np.concatenate([rank, np.zeros(len(missing), dtype=int)])[order]
+    score = np.concatenate([score, np.zeros(len(missing))])[order]
+    profile = np.concatenate([profile, np.full(len(missing), -1)])[order]
+
+    records = np.full((len(row), len(RECORD_COLUMNS)), None, dtype=object)
+    matched = profile >= 0
+    records[matched] = index["records"][profile[matched]]
+
+    out = pd.DataFrame(records, columns=RECORD_COLUMNS)
+    out.insert(0, "blocked_by", blocked_by[row])
+    out.insert(0, "score", np.round(score.astype(np.float64), 4))
+    out.insert(0, "rank", rank + 1)
+    out.insert(0, "title", titles[row])
+    out.insert(0, "row", row)
+    return _flag_review(out)
+
+
+def _flag_review(result):
+    """Marca needs_review no rank 1: sem candidato, nota baixa ou segundo candidato muito próximo."""
+    first = result[result["rank"] == 1].set_index("row")["score"]
+    second = result[result["rank"] == 2].set_index("row")["score"].reindex(first.index)
+
+    no_match = result[result["rank"] == 1].set_index("row")["Job Profile"].isna()
+
+    reason = pd.Series(None, index=first.index, dtype=object)
+    reason[(first - second) < REVIEW_MARGIN] = "ambiguous"
+    reason[first < REVIEW_THRESHOLD] = "low_score"
+    reason[no_match] = "no_match"
+
+    reason = reason.reindex(result["row"]).to_numpy()
+    result["review_reason"] = np.where((result["rank"] == 1) & pd.notna(reason), reason, None)
+    result["needs_review"] = result["review_reason"].notna()
+    return result
+
+
+def match_chunk(chunk, first_row=0, title_column="title", family_column=None, function_column=None, k=5):
+    """Avalia um bloco do arquivo de entrada (executado nos processos do pool)."""
+    if title_column not in chunk.columns:
+        raise ValueError(f"Coluna de título não encontrada: '{title_column}'")
+    families = chunk[family_column].tolist() if family_column in chunk.columns else None
+    functions = chunk[function_column].tolist() if function_column in chunk.columns else None
+    result = match_titles(chunk[title_column].tolist(), families, functions, k=k)
+    result["row"] += first_row
+    return result
+
+
+# =========================================================
+# EXECUÇÃO EM ARQUIVO
+# =========================================================
+
+def run_mapping(
+    input_path,
+    output_path,
+    title_column="title",
+    family_column=None,
+    function_column=None,
+    k=5,
+    chunksize=DEFAULT_CHUNKSIZE,
+    workers=None,
+    log=sys.stderr,
+):
+    """
+    Mapeia todos os títulos de `input_path`. Grava os top-k candidatos em
+    `output_path` e a fila de revisão (rank 1 com needs_review) em
+    <output>_review.<ext>. Retorna as estatísticas da execução.
+    """
+    output_path = Path(output_path)
+    review_path = output_path.with_name(f"{output_path.stem}_review{output_path.suffix}")
+    workers = workers or os.cpu_count() or 1
+
+    writer, review_writer = ResultWriter(output_path), ResultWriter(review_path)
+    stats = {"titles": 0, "review": 0, "chunks": 0}
+    start = time.perf_counter()
+
+    def consume(result):
+        writer.write(result)
+        review = result[result["needs_review"]]
+        if len(review):
+            review_writer.write(review)
+        stats["titles"] += int((result["rank"] == 1).sum())
+        stats["review"] += len(review)
+        stats["chunks"] += 1
+        if log is not None:
+            elapsed = time.perf_counter() - start
+            print(
+                f"bloco {stats['chunks']}: {stats['titles']:,} títulos, "
+                f"{stats['titles'] / max(elapsed, 1e-9):,.0f} títulos/s",
+                file=log,
+            )
+
+    args = (title_column, family_column, function_column, k)
+    offset = 0
+    try:
+        if workers == 1:
+            for chunk in read_chunks(input_path, chunksize):
+                consume(match_chunk(chunk, offset, *args))
+                offset += len(chunk)
+        else:
+            get_title_index()  # os processos herdam o índice pronto (fork)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for chunk in read_chunks(input_path, chunksize):
+                    pending.append(pool.submit(match_chunk, chunk, offset, *args))
+                    offset += len(chunk)
+                    if len(pending) >= 2 * workers:
+                        consume(pending.popleft().result())
+                while pending:
+                    consume(pending.popleft().result())
+    finally:
+        writer.close()
+        review_writer.close()
+
+    stats["input_rows"] = offset
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    stats["review_path"] = str(review_path)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mapeia títulos legados para Job Profiles do catálogo.")
+    parser.add_argument("input", help="CSV ou XLSX com os títulos legados")
+    parser.add_argument("output", help="arquivo de saída (.csv ou .parquet)")
+    parser.add_argument("--title-column", default="title")
+    parser.add_argument("--family-column", default="job_family")
+    parser.add_argument("--function-column", default="function_code")
+    parser.add_argument("--k", type=int, default=5, help="candidatos por título")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    summary = run_mapping(
+        args.input, args.output, args.title_column, args.family_column, args.function_column,
+        args.k, args.chunksize, args.workers,
+    )
+    print(
+        f"{summary['input_rows']:,} títulos em {summary['seconds']}s, "
+        f"{summary['review']:,} para revisão → {summary['review_path']}"
+    )
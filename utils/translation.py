@@ -0,0 +1,274 @@
+# utils/translation.py
+"""
+Traduções do catálogo (inglês → português / espanhol) com cache local.
+
+Os textos do Job Profile.xlsx são quebrados em linhas; cada linha
+distinta do catálogo inteiro é traduzida uma única vez, em lotes, e
+gravada em um SQLite (data/translations.sqlite) com chave = hash do
+conteúdo + idioma. As páginas só leem desse cache: nenhuma chamada
+remota acontece durante a navegação, e o que ainda não foi traduzido
+aparece no original.
+
+Backends plugáveis:
+  - GoogleBackend: deep-translator (GoogleTranslator.translate_batch);
+  - StubBackend:   local, sem rede, para testes ("[pt] texto").
+O padrão vem de JA_TRANSLATION_BACKEND ("google" ou "stub").
+
+Uso:
+    python -m utils.translation pt es [--backend stub]
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from utils import catalog
+
+TRANSLATIONS_PATH = catalog.DATA_DIR / "translations.sqlite"
+
+SOURCE_LANGUAGE = "en"
+LANGUAGES = {"pt": "Português", "es": "Español"}
+
+# Colunas traduzidas do Job Profile.xlsx
+TRANSLATABLE_FIELDS = [
+    "Job Profile Description",
+    "Role Description",
+    "Qualifications",
+    "Grade Differentiator",
+    "Sub Job Family Description",
+    "Career Band Description",
+    "Specific parameters / KPIs",
+]
+
+# Limites de cada chamada ao backend
+BATCH_SIZE = 50
+BATCH_CHARS = 4500
+
+_lock = threading.Lock()
+_cache = {}
+
+
+# =========================================================
+# BACKENDS
+# =========================================================
+
+class GoogleBackend:
+    """Google Translate via deep-translator."""
+
+    name = "google"
+
+    def translate_batch(self, texts, target):
+        from deep_translator import GoogleTranslator
+
+        translator = GoogleTranslator(source=SOURCE_LANGUAGE, target=target)
+        return translator.translate_batch(list(texts))
+
+
+class StubBackend:
+    """Backend local para testes: prefixa o idioma, sem rede."""
+
+    name = "stub"
+
+    def translate_batch(self, texts, target):
+        return [f"[{target}] {text}" for text in texts]
+
+
+BACKENDS = {"google": GoogleBackend, "stub": StubBackend}
+
+
+def get_backend(name=None):
+    name = name or os.environ.get("JA_TRANSLATION_BACKEND", "google")
+    if name not in BACKENDS:
+        raise ValueError(f"Backend de tradução desconhecido: {name}")
+    return BACKENDS[name]()
+
+
+# =========================================================
+# STORE (SQLite, chave = hash do conteúdo + idioma)
+# =========================================================
+
+def text_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _connect(path=None):
+    connection = sqlite3.connect(path or TRANSLATIONS_PATH)
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS translations (
+            hash TEXT NOT NULL,
+            target TEXT NOT NULL,
+            source TEXT NOT NULL,
+            translated TEXT NOT NULL,
+            backend TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (hash, target)
+        )
+        """
+    )
+    return connection
+
+
+def segments(text):
+    """Linhas não vazias de um texto (unidade de tradução e de deduplicação)."""
+    if text is None or text != text:
+        return []
+    return [line.strip() for line in str(text).splitlines() if line.strip()]
+
+
+def catalog_segments(df=None, fields=TRANSLATABLE_FIELDS):
+    """Linhas distintas de todo o catálogo, na ordem em que aparecem."""
+    df = df if df is not None else catalog.load_job_profiles()
+    unique = {}
+    for field in fields:
+        if field not in df.columns:
+            continue
+        for value in pd.unique(df[field].astype(object).dropna()):
+            for line in segments(value):
+                unique.setdefault(line, None)
+    return list(unique)
+
+
+def _batches(texts, size=BATCH_SIZE, chars=BATCH_CHARS):
+    batch, length = [], 0
+    for text in texts:
+        if batch and (len(batch) >= size or length + len(text) > chars):
+            yield batch
+            batch, length = [], 0
+        batch.append(text)
+        length += len(text)
+    if batch:
+        yield batch
+
+
+def translate_segments(texts, target, backend=None, path=None):
+    """
+    Garante no store a tradução de cada texto de `texts` para `target`.
+    Só textos ainda ausentes vão ao backend, uma vez cada, em lotes.
+    Respostas vazias não são gravadas (o texto volta ao backend na próxima
+    execução) e contam em "empty", não em "translated".
+    Retorna {"requested", "cached", "translated", "empty", "batches"}.
+    """
+    backend = backend or get_backend()
+    texts = list(dict.fromkeys(t for t in texts if t))
+    hashes = {text_hash(t): t for t in texts}
+
+    with _connect(path) as connection:
+        known = {
+            row[0] for row in connection.execute(
+                "SELECT hash FROM translations WHERE target = ?", (target,)
+            )
+        }
+        missing = [t for h, t in hashes.items() if h not in known]
+
+        batches = translated = 0
+        for batch in _batches(missing):
+            results = backend.translate_batch(batch, target)
+            now = time.time()
+            rows = [
+                (text_hash(src), target, src, dst, backend.name, now)
+                for src, dst in zip(batch, results) if isinstance(dst, str) and dst.strip()
+            ]
+            connection.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)", rows)
+            connection.commit()  # cada lote fica salvo mesmo se o próximo falhar
+            translated += len(rows)
+            batches += 1
+
+    with _lock:
+        _cache.pop((str(path or TRANSLATIONS_PATH), target), None)
+
+    return {
+        "requested": len(texts),
+        "cached": len(texts) - len(missing),
+        "translated": translated,
+        "empty": len(missing) - translated,
+        "batches": batches,
+    }
+
+
+def translate_catalog(targets=tuple(LANGUAGES), backend=None, path=None):
+    """Traduz todas as linhas distintas do catálogo para cada idioma."""
+    texts = catalog_segments()
+    return {target: translate_segments(texts, target, backend, path) for target in targets}
+
+
+# =========================================================
+# LEITURA (somente cache, sem chamadas remotas)
+# =========================================================
+
+def get_translations(target, path=None):
+    """Dicionário hash → tradução do idioma, recarregado só quando o SQLite muda."""
+    path = path or TRANSLATIONS_PATH
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+
+    key = (str(path), target)
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = connection.execute(
+            "SELECT hash, translated FROM translations WHERE target = ?", (target,)
+        ).fetchall()
+    except sqlite3.Error:
+        rows = []
+    finally:
+        connection.close()
+
+    translations = dict(rows)
+    with _lock:
+        _cache[key] = (mtime, translations)
+    return translations
+
+
+def translate_text(text, target, path=None):
+    """
+    Texto traduzido a partir do cache, linha a linha. Linhas sem tradução
+    (ou target = idioma original) ficam no original.
+    """
+    if target in (None, SOURCE_LANGUAGE) or text is None or text != text:
+        return text
+    translations = get_translations(target, path)
+    if not translations:
+        return text
+
+    lines = []
+    for line in str(text).splitlines():
+        stripped = line.strip()
+        lines.append(translations.get(text_hash(stripped), line) if stripped else line)
+    return "\n".join(lines)
+
+
+def translate_record(record, target, fields=TRANSLATABLE_FIELDS, path=None):
+    """Cópia de um registro (dict ou Series) com os campos traduzidos."""
+    record = dict(record)
+    for field in fields:
+        if field in record:
+            record[field] = translate_text(record[field], target, path)
+    return record
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Traduz os textos do catálogo para o cache local.")
+    parser.add_argument("targets", nargs="*", default=list(LANGUAGES), help="idiomas (ex.: pt es)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = translate_catalog(args.targets, get_backend(args.backend))
+    for target, stats in report.items():
+        print(
+            f"{target}: {stats['requested']} textos distintos, {stats['cached']} já no cache, "
+            f"{stats['translated']} traduzidos em {stats['batches']} lotes"
+            + (f", {stats['empty']} sem tradução" if stats["empty"] else "")
+        )
+    print(f"{TRANSLATIONS_PATH} ({time.perf_counter() - start:.2f}s)")
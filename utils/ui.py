@@ -1,18 +1,16 @@
 # utils/ui.py
 import streamlit as st
-from pathlib import Path
+
+from utils import warmup
+from utils.assets import asset_uri, inject_css
+from utils.instrumentation import finish_page, span, start_page
 
 # =========================================================
-# CARREGA O CSS GLOBAL DA PASTA /assets
+# CSS GLOBAL DA PASTA /assets (bundle em memória, utils.assets)
 # =========================================================
 
 def apply_global_css():
-    css_files = ["theme.css", "styles.css", "header.css"]
-    for css in css_files:
-        file_path = Path("assets") / css
-        if file_path.exists():
-            with open(file_path) as f:
-                st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+    inject_css("global")
 
 
 # =========================================================
@@ -23,8 +21,13 @@ def sidebar_logo_and_title(logo_path):
     """
     Insere o logo SIG acima do menu nativo do Streamlit,
     mantendo tudo responsivo e 100% compatível com multipage.
+    Também abre a medição do rerun (utils.instrumentation), fechada por
+    finish_page() no fim da página.
     """
-    apply_global_css()
+    start_page()
+
+    with span("css"):
+        apply_global_css()
 
     with st.sidebar:
         st.markdown(
@@ -35,8 +38,57 @@ def sidebar_logo_and_title(logo_path):
                 padding-top: 12px;
                 padding-bottom: 8px;
             ">
-                <img src="{logo_path}" style="width: 150px;">
+                <img src="{asset_uri(logo_path)}" style="width: 150px;">
             </div>
             """,
             unsafe_allow_html=True
         )
+
+
+# =========================================================
+# IDIOMA DOS TEXTOS DO CATÁLOGO (traduções do cache local)
+# =========================================================
+
+def language_selector():
+    """
+    Seletor de idioma na sidebar, compartilhado entre as páginas.
+    Retorna o código do idioma ("en" = original, "pt", "es").
+    """
+    from utils.translation import LANGUAGES, SOURCE_LANGUAGE
+
+    options = {SOURCE_LANGUAGE: "English (original)", **LANGUAGES}
+    with st.sidebar:
+        return st.selectbox(
+            "Idioma das descrições",
+            list(options),
+            format_func=options.get,
+            key="language",
+        )
+
+
+# =========================================================
+# ESPERA PELOS DADOS DO AQUECIMENTO (utils.warmup)
+# =========================================================
+
+# Espera máxima (s) pelo aquecimento; depois a página carrega sozinha
+WARMUP_WAIT_TIMEOUT = 60
+
+
+def wait_for_data(*steps, message="Carregando dados do catálogo..."):
+    """
+    Garante o aquecimento em segundo plano e, se as etapas pedidas ainda
+    não terminaram, mostra um aviso leve até ficarem prontas. A página já
+    pintou título e logo; os imports pesados vêm depois desta chamada.
+    Se o aquecimento falhar, travar ou morrer, a página segue e os dados
+    são carregados na própria thread (mesmos caches de processo).
+    """
+    warmup.start()
+    if warmup.is_ready(*steps):
+        return
+
+    placeholder = st.empty()
+    with span("warmup_wait"):
+        with placeholder.container():
+            with st.spinner(message):
+                warmup.wait(*steps, timeout=WARMUP_WAIT_TIMEOUT)
+    placeholder.empty()
@@ -0,0 +1,251 @@
+# utils/warmup.py
+"""
+Aquecimento do processo em segundo plano (cold start).
+
+O primeiro acesso a um worker recém-iniciado pagava, na thread da
+página, a importação de pandas/numpy/scikit-learn e a leitura de todos
+os Excel. Aqui isso roda em uma thread própria, disparada pelo
+streamlit_app.py (e por qualquer página, se o usuário cair direto nela):
+  1. importa os módulos pesados (tempo de cada import);
+  2. carrega o catálogo e monta a tabela GGS, o índice de cargos, os
+     índices de busca (BM25 e embeddings) e os índices das páginas.
+Cada etapa tem um evento próprio: a página mostra um aviso leve e espera
+só as etapas de que precisa (wait_for_data em utils.ui). Os eventos são
+liberados também quando uma etapa falha; se a thread morrer ou o prazo
+da página acabar, a página segue e carrega os dados na própria thread.
+
+Ao terminar, o relatório (import e aquecimento por etapa) vai para o
+stderr do servidor e para logs/startup.jsonl. JA_WARMUP=0 desliga o
+aquecimento (as páginas voltam a carregar tudo na própria thread).
+
+Uso:
+    python -m utils.warmup   # aquece em primeiro plano e mostra o relatório
+"""
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+
+from utils.instrumentation import LOG_DIR
+
+STARTUP_LOG_PATH = LOG_DIR / "startup.jsonl"
+
+# Módulos importados pela thread, na ordem (o tempo de cada um exclui o
+# que já foi importado antes)
+IMPORTS = [
+    "numpy",
+    "pandas",
+    "sklearn.feature_extraction.text",
+    "utils.catalog",
+    "utils.ggs_factors",
+    "utils.job_match_engine",
+    "utils.search",
+    "utils.semantic",
+    "utils.similar_roles",
+    "utils.facets",
+    "utils.career_paths",
+    "utils.translation",
+]
+
+
+def _catalog():
+    from utils import catalog
+
+    catalog.load_job_families()
+    catalog.load_job_profiles()
+    catalog.load_level_structure()
+    catalog.load_ggs_factors()
+
+
+def _outcome_table():
+    from utils import ggs_factors
+
+    ggs_factors.get_outcome_table()
+
+
+def _profile_index():
+    from utils import job_match_engine
+
+    job_match_engine.get_profile_index()
+
+
+def _search_index():
+    from utils import search
+
+    search.get_search_index()
+
+
+def _embeddings():
+    from utils import semantic
+
+    semantic.get_embeddings()
+
+
+def _similar_roles():
+    from utils import similar_roles
+
+    similar_roles.get_similar_roles_graph()
+
+
+def _facets():
+    from utils import facets
+
+    facets.get_facet_index()
+
+
+def _career_graph():
+    from utils import career_paths
+
+    career_paths.get_career_graph()
+
+
+# Etapas do aquecimento, na ordem em que rodam: das mais baratas para as
+# mais caras. Embeddings e similar_roles ficam por último: com
+# JA_EMBEDDING_MODEL (sentence-transformers) podem levar minutos, e as
+# páginas que não dependem deles não devem esperar por eles
+STEPS = [
+    ("catalog", _catalog),
+    ("outcome_table", _outcome_table),
+    ("profile_index", _profile_index),
+    ("facets", _facets),
+    ("search_index", _search_index),
+    ("career_graph", _career_graph),
+    ("embeddings", _embeddings),
+    ("similar_roles", _similar_roles),
+]
+
+# Intervalo (s) em que wait() confere se a thread ainda está viva
+POLL_INTERVAL = 0.25
+
+_lock = threading.Lock()
+_thread = None
+_events = {name: threading.Event() for name in ["imports"] + [name for name, _ in STEPS]}
+_report = {"imports": {}, "steps": {}, "errors": {}}
+
+
+def enabled():
+    return os.environ.get("JA_WARMUP", "1").strip().lower() not in ("0", "false", "off")
+
+
+# =========================================================
+# EXECUÇÃO
+# =========================================================
+
+def _timed_import(name):
+    start = time.perf_counter()
+    importlib.import_module(name)
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def run():
+    """
+    Executa o aquecimento inteiro na thread atual e devolve o relatório.
+    Os eventos são liberados mesmo se uma etapa (ou a thread) falhar: a
+    página segue e carrega o que faltar por conta própria.
+    """
+    start = time.perf_counter()
+    _report["started_at"] = time.time()
+
+    try:
+        for name in IMPORTS:
+            try:
+                _report["imports"][name] = _timed_import(name)
+            except Exception as exc:  # noqa: BLE001 - a página importa de novo e mostra o erro
+                _report["errors"][f"import:{name}"] = f"{type(exc).__name__}: {exc}"
+        _events["imports"].set()
+
+        for name, step in STEPS:
+            step_start = time.perf_counter()
+            try:
+                step()
+            except BaseException as exc:  # noqa: BLE001 - idem: a página refaz a etapa
+                _report["errors"][name] = f"{type(exc).__name__}: {exc}"
+                if not isinstance(exc, Exception):
+                    raise
+            finally:
+                _report["steps"][name] = round((time.perf_counter() - step_start) * 1000, 1)
+                _events[name].set()
+    finally:
+        for name, event in _events.items():
+            if not event.is_set():
+                _report["errors"].setdefault(name, "interrompida")
+                event.set()
+        _report["import_ms"] = round(sum(_report["imports"].values()), 1)
+        _report["warmup_ms"] = round(sum(_report["steps"].values()), 1)
+        _report["total_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        _emit(report())
+    return report()
+
+
+def start():
+    """Dispara o aquecimento em segundo plano (uma única vez por processo)."""
+    global _thread
+    if not enabled():
+        return False
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=run, name="ja-warmup", daemon=True)
+            _thread.start()
+    return True
+
+
+def is_ready(*steps):
+    """True quando as etapas (todas, sem argumentos) terminaram."""
+    return all(_events[name].is_set() for name in (steps or _events))
+
+
+def wait(*steps, timeout=None):
+    """
+    Espera as etapas pedidas (todas, sem argumentos). Retorna False se o
+    prazo acabar ou a thread morrer antes; sem aquecimento em andamento
+    (JA_WARMUP=0), retorna na hora. Em qualquer caso a página carrega por
+    conta própria o que não ficou pronto.
+    """
+    if _thread is None:
+        return True
+    deadline = None if timeout is None else time.monotonic() + timeout
+    for name in steps or _events:
+        while not _events[name].wait(POLL_INTERVAL):
+            if not _thread.is_alive():
+                return False
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+    return True
+
+
+# =========================================================
+# RELATÓRIO
+# =========================================================
+
+def report():
+    """Tempos (ms) de import por módulo e de cada etapa, com os erros."""
+    return {
+        "pid": os.getpid(),
+        "ready": is_ready(),
+        **{key: (dict(value) if isinstance(value, dict) else value) for key, value in _report.items()},
+    }
+
+
+def _emit(record):
+    slowest = sorted(record["imports"].items(), key=lambda item: item[1], reverse=True)[:3]
+    imports = ", ".join(f"{name} {ms:.0f}" for name, ms in slowest)
+    steps = ", ".join(f"{name} {ms:.0f}" for name, ms in record["steps"].items())
+    errors = f", erros: {record['errors']}" if record["errors"] else ""
+    print(
+        f"[warmup] imports {record['import_ms']:.0f} ms ({imports}), "
+        f"etapas {record['warmup_ms']:.0f} ms ({steps}), total {record['total_ms']:.0f} ms{errors}",
+        file=sys.stderr,
+    )
+    try:
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+        with open(STARTUP_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError:
+        pass  # log é auxiliar
+
+
+if __name__ == "__main__":
+    result = run()
+    print(json.dumps(result, indent=2, ensure_ascii=False))